@@ -1,5 +1,13 @@
 from django.shortcuts import render
+from ieeesbui import conditional
 
+
+def about_validators(request):
+    # Static page: it only changes with a deployment
+    return conditional.make_etag('about'), None
+
+
+@conditional.conditional_page(about_validators)
 def show_about(request):
     
-    return render(request, 'about.html')
\ No newline at end of file
+    return render(request, 'about.html')
@@ -0,0 +1,52 @@
+import gzip
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+AJAX_HEADERS = {'X-Requested-With': 'XMLHttpRequest'}
+
+# (name, AJAX page fragment, equivalent API request)
+COMPARISONS = (
+    ('first page', '/article', '/api/v1/articles'),
+    ('popular', '/article?sort=popular', '/api/v1/articles?sort=popular'),
+    ('search', '/article?search=robot', '/api/v1/articles?search=robot'),
+    ('cards only', '/article', '/api/v1/articles?fields=slug,title,excerpt,image'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare payload size (raw and gzip) and latency of the article list AJAX '
+        'fragment with the equivalent /api/v1/articles request.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help='Timed requests per URL')
+
+    def handle(self, *args, **options):
+        client = Client()
+        report = {}
+        for name, ajax_path, api_path in COMPARISONS:
+            report[name] = {
+                'ajax': self._measure(client, ajax_path, AJAX_HEADERS, options['requests']),
+                'api': self._measure(client, api_path, {}, options['requests']),
+            }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def _measure(self, client, path, headers, count):
+        body = client.get(path, headers=headers).content
+        samples = []
+        for _ in range(count):
+            started = time.perf_counter()
+            client.get(path, headers=headers)
+            samples.append((time.perf_counter() - started) * 1000)
+        return {
+            'path': path,
+            'bytes': len(body),
+            'gzip_bytes': len(gzip.compress(body)),
+            'mean_ms': round(statistics.mean(samples), 3) if samples else None,
+            'median_ms': round(statistics.median(samples), 3) if samples else None,
+        }
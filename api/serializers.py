@@ -0,0 +1,107 @@
+"""
+Serialization for the read-only JSON API.
+
+Every resource declares its fields as name -> getter; ``?fields=a,b`` picks a
+subset (sparse fieldsets), so only the requested values are computed and sent.
+orjson is used when installed, the standard library encoder otherwise.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def dumps(data):
+    """
+    Encode data as compact JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=DjangoJSONEncoder().default)
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def json_response(data, status=200):
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def parse_fields(request, available, default):
+    """
+    Requested fields of a resource
+    Args:
+        available (dict): field name -> getter
+        default (tuple): fields returned when ?fields is not given
+    Raises:
+        ApiError: an unknown field was requested
+    """
+    raw = request.GET.get('fields', '')
+    if not raw:
+        return list(default)
+    fields = [name for name in (part.strip() for part in raw.split(',')) if name]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise ApiError('Unknown field(s): {}. Available: {}'.format(', '.join(unknown), ', '.join(available)))
+    return fields
+
+
+def serialize(obj, getters, fields):
+    return {name: getters[name](obj) for name in fields}
+
+
+def _category(category):
+    return {'id': category.id, 'name': category.name, 'slug': category.slug}
+
+
+ARTICLE_FIELDS = {
+    'id': lambda a: a.id,
+    'slug': lambda a: a.slug,
+    'title': lambda a: a.title,
+    'excerpt': lambda a: a.card_excerpt,
+    'image': lambda a: a.image or None,
+    'author': lambda a: a.author.get_full_name() or a.author.username,
+    'categories': lambda a: [_category(c) for c in a.categories.all()],
+    'created_at': lambda a: a.created_at,
+    'updated_at': lambda a: a.updated_at,
+    'view_count': lambda a: a.view_count,
+    'reading_time': lambda a: a.reading_time,
+    'is_featured': lambda a: a.is_featured,
+    'url': lambda a: a.get_absolute_url(),
+}
+ARTICLE_DETAIL_FIELDS = dict(ARTICLE_FIELDS, **{
+    'content_html': lambda a: a.content_html,
+    'toc': lambda a: a.toc,
+})
+ARTICLE_DEFAULT_FIELDS = ('id', 'slug', 'title', 'excerpt', 'image', 'author', 'categories', 'created_at', 'url')
+
+CATEGORY_FIELDS = {
+    'id': lambda c: c.id,
+    'name': lambda c: c.name,
+    'slug': lambda c: c.slug,
+    'description': lambda c: c.description,
+}
+CATEGORY_DEFAULT_FIELDS = ('id', 'name', 'slug')
+
+EVENT_FIELDS = {
+    'id': lambda e: e.id,
+    'title': lambda e: e.title,
+    'description': lambda e: e.description,
+    'image_url': lambda e: e.image_url,
+    'date': lambda e: e.date,
+    'time': lambda e: e.time,
+    'location': lambda e: e.location,
+    'is_upcoming': lambda e: e.is_upcoming,
+    'updated_at': lambda e: e.updated_at,
+    'url': lambda e: e.get_absolute_url(),
+}
+EVENT_DEFAULT_FIELDS = ('id', 'title', 'image_url', 'date', 'time', 'location', 'url')
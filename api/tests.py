@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from article.models import Article, Category
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class ApiValidatorTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Robotika', slug='robotika')
+        self.article = Article.objects.create(
+            title='Artikel', author=User.objects.create(username='writer'), excerpt='x', content='x', status='published',
+        )
+        self.article.categories.add(self.category)
+
+    def etag(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_view_count_updates_change_the_etag(self):
+        detail = reverse('api_article_detail', args=[self.article.slug])
+        before = self.etag(detail, fields='title,view_count'), self.etag(reverse('api_article_list'), sort='popular')
+        Article.objects.filter(pk=self.article.pk).update(view_count=F('view_count') + 1)
+        after = self.etag(detail, fields='title,view_count'), self.etag(reverse('api_article_list'), sort='popular')
+        self.assertNotEqual(before[0], after[0])
+        self.assertNotEqual(before[1], after[1])
+
+    def test_category_rename_changes_the_article_etag(self):
+        url = reverse('api_article_list')
+        before = self.etag(url)
+        Category.objects.filter(pk=self.category.pk).update(name='Robot')
+        self.assertNotEqual(self.etag(url), before)
+
+    def test_missing_objects_are_json_404(self):
+        for url in (reverse('api_article_detail', args=['tidak-ada']), reverse('api_event_detail', args=[999])):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {'error': 'Not found'})
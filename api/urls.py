@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('articles', views.article_list, name='api_article_list'),
+    path('articles/<slug:slug>', views.article_detail, name='api_article_detail'),
+    path('categories', views.category_list, name='api_category_list'),
+    path('events', views.event_list, name='api_event_list'),
+    path('events/<int:pk>', views.event_detail, name='api_event_detail'),
+]
@@ -0,0 +1,216 @@
+"""
+Read-only JSON API, version 1.
+
+- Sparse fieldsets: ``?fields=title,slug`` (see api/serializers.py).
+- Cursor pagination: ``?limit=`` and ``?cursor=`` from the previous page's
+  ``next_cursor`` (article.pagination keyset pagination, no COUNT(*)).
+- Responses carry ETag/Last-Modified from the content version of the
+  filtered rows, so revalidation is answered with 304 before any row is
+  fetched, plus a short public max-age for shared caches.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from article import pagination, search
+from article.models import Article, Category
+from event.models import Event
+from ieeesbui import conditional
+
+from .serializers import (
+    ARTICLE_DEFAULT_FIELDS, ARTICLE_DETAIL_FIELDS, ARTICLE_FIELDS, CATEGORY_DEFAULT_FIELDS,
+    CATEGORY_FIELDS, EVENT_DEFAULT_FIELDS, EVENT_FIELDS, ApiError, json_response, parse_fields,
+    serialize,
+)
+
+DEFAULT_LIMIT = 12
+MAX_LIMIT = 50
+
+# sort parameter -> ordering field for events, id is the keyset tiebreaker
+EVENT_SORT_FIELDS = {
+    '': '-date',
+    'recent': '-date',
+    'oldest': 'date',
+}
+
+
+def _cache_control():
+    max_age = getattr(settings, 'API_CACHE_MAX_AGE', 60)
+    return {'public': True, 'max_age': max_age, 'stale_while_revalidate': max_age * 5}
+
+
+def api_view(view):
+    """
+    GET/HEAD only; ApiError becomes a JSON error response
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            response = json_response({'error': 'Method not allowed'}, status=405)
+            response['Allow'] = 'GET, HEAD'
+            return response
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as exc:
+            return json_response({'error': exc.message}, status=exc.status)
+    return wrapper
+
+
+def respond(request, querysets, build, extra=()):
+    """
+    Answer 304 when the filtered rows did not change, otherwise build the payload
+    Args:
+        querysets (list[QuerySet]): rows (with updated_at) the response is built from
+        build (callable): build() -> data to encode
+        extra (tuple): other values the payload depends on
+    """
+    parts, last_modified = conditional.content_version(*querysets)
+    etag = conditional.make_etag('api', request.path, request.GET.urlencode(), *parts, *extra)
+    response = conditional.not_modified(request, etag, last_modified)
+    if response is None:
+        response = json_response(build())
+    return conditional.add_validators(response, etag, last_modified, cache_control=_cache_control())
+
+
+def _limit(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError('limit must be an integer')
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def _page(queryset, sort, cursor, limit, sort_fields=None):
+    try:
+        return pagination.paginate(queryset, sort, cursor, limit, sort_fields)
+    except pagination.InvalidCursor as exc:
+        raise ApiError(str(exc))
+
+
+def _category_version():
+    # Category has no updated_at; the table is tiny, so its rows are the version
+    return list(Category.objects.order_by('id').values_list('id', 'name', 'slug', 'description'))
+
+
+def _article_extra(queryset, fields, sort=''):
+    """
+    Versions of article data that change without touching updated_at
+    Notes:
+        - view_count is written with QuerySet.update() by the view counter and
+          trending_score by the trending rollup; their sums are included when
+          the payload shows or is ordered by them.
+        - Embedded categories change when a category is renamed.
+    """
+    sums = {}
+    if 'view_count' in fields or sort == 'popular':
+        sums['views'] = Sum('view_count')
+    if sort == 'trending':
+        sums['trending'] = Sum('trending_score')
+    extra = sorted(queryset.order_by().aggregate(**sums).items()) if sums else []
+    if 'categories' in fields:
+        extra.append(_category_version())
+    return extra
+
+
+def _filtered_articles(request):
+    queryset = Article.objects.filter(status='published')
+    query = request.GET.get('search', '')
+    if query:
+        queryset = search.search_queryset(queryset, query)
+    category = request.GET.get('category', '')
+    if category:
+        ids = [value for value in category.split(',') if value]
+        if not all(value.isdigit() for value in ids):
+            raise ApiError('category must be a comma separated list of ids')
+        queryset = queryset.filter(categories__id__in=ids).distinct()
+    return queryset
+
+
+@api_view
+def article_list(request):
+    fields = parse_fields(request, ARTICLE_FIELDS, ARTICLE_DEFAULT_FIELDS)
+    sort = request.GET.get('sort', '')
+    if not pagination.supports_sort(sort):
+        raise ApiError('sort must be one of: {}'.format(', '.join(s for s in pagination.SORT_FIELDS if s)))
+    limit = _limit(request)
+    queryset = _filtered_articles(request)
+
+    def build():
+        page = _page(queryset.for_cards(), sort, request.GET.get('cursor', ''), limit)
+        return {
+            'data': [serialize(article, ARTICLE_FIELDS, fields) for article in page.object_list],
+            'next_cursor': page.next_cursor,
+            'has_next': page.has_next,
+        }
+    return respond(request, [queryset], build, _article_extra(queryset, fields, sort))
+
+
+@api_view
+def article_detail(request, slug):
+    fields = parse_fields(request, ARTICLE_DETAIL_FIELDS, ARTICLE_DEFAULT_FIELDS + ('content_html', 'toc'))
+    queryset = Article.objects.filter(status='published', slug=slug)
+
+    def build():
+        article = queryset.select_related('author').defer('content', 'plain_text', 'search_vector').first()
+        if article is None:
+            raise ApiError('Not found', 404)
+        return {'data': serialize(article, ARTICLE_DETAIL_FIELDS, fields)}
+    return respond(request, [queryset], build, _article_extra(queryset, fields))
+
+
+@api_view
+def category_list(request):
+    fields = parse_fields(request, CATEGORY_FIELDS, CATEGORY_DEFAULT_FIELDS)
+
+    def build():
+        return {'data': [serialize(category, CATEGORY_FIELDS, fields) for category in Category.objects.order_by('name')]}
+    return respond(request, [], build, _category_version())
+
+
+def _filtered_events(request):
+    when = request.GET.get('when', '')
+    queryset = Event.objects.all()
+    today = timezone.localdate()
+    if when == 'upcoming':
+        queryset = queryset.filter(date__gte=today)
+    elif when == 'past':
+        queryset = queryset.filter(date__lt=today)
+    elif when:
+        raise ApiError('when must be "upcoming" or "past"')
+    return queryset
+
+
+@api_view
+def event_list(request):
+    fields = parse_fields(request, EVENT_FIELDS, EVENT_DEFAULT_FIELDS)
+    sort = request.GET.get('sort', 'oldest' if request.GET.get('when') == 'upcoming' else '')
+    if sort not in EVENT_SORT_FIELDS:
+        raise ApiError('sort must be one of: recent, oldest')
+    limit = _limit(request)
+    queryset = _filtered_events(request)
+
+    def build():
+        page = _page(queryset, sort, request.GET.get('cursor', ''), limit, EVENT_SORT_FIELDS)
+        return {
+            'data': [serialize(event, EVENT_FIELDS, fields) for event in page.object_list],
+            'next_cursor': page.next_cursor,
+            'has_next': page.has_next,
+        }
+    # The upcoming/past split moves at midnight, so the date is part of the version
+    return respond(request, [queryset], build, [timezone.localdate()])
+
+
+@api_view
+def event_detail(request, pk):
+    fields = parse_fields(request, EVENT_FIELDS, tuple(EVENT_FIELDS))
+    queryset = Event.objects.filter(pk=pk)
+
+    def build():
+        event = queryset.first()
+        if event is None:
+            raise ApiError('Not found', 404)
+        return {'data': serialize(event, EVENT_FIELDS, fields)}
+    # is_upcoming changes at midnight
+    return respond(request, [queryset], build, [timezone.localdate()])
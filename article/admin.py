@@ -1,5 +1,82 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
+from django.db import transaction
+from django.utils import timezone
+
 from article.models import Article, Category
-# Register your models here.
-admin.site.register(Article)
-admin.site.register(Category)
\ No newline at end of file
+from ieeesbui.paginator import EstimatedCountPaginator
+
+from . import search, similarity
+from .signals import invalidate_article_caches
+
+
+@admin.register(Article)
+class ArticleAdmin(admin.ModelAdmin):
+    """
+    Changelist artikel yang tetap cepat untuk tabel besar
+    Notes:
+        - Jumlah baris memakai estimasi planner (ieeesbui/paginator.py) dan
+          show_full_result_count dimatikan, jadi tidak ada COUNT(*) penuh.
+        - author di-JOIN, categories di-prefetch, kolom besar tidak diambil.
+        - Pencarian memakai index full-text (article.search), bukan icontains.
+        - Action publish/feature dijalankan sebagai satu UPDATE, lalu cache yang
+          biasanya di-invalidate oleh signal dibersihkan manual. Publish/unpublish
+          juga memperbarui index artikel terkait (article.similarity) untuk id
+          yang dipilih, karena signal post_save tidak terkirim. Index pencarian
+          tidak bergantung pada status, jadi tidak perlu diperbarui.
+    """
+    list_display = ('title', 'author', 'status', 'is_featured', 'category_names', 'view_count', 'created_at')
+    list_filter = ('status', 'is_featured')
+    list_select_related = ('author',)
+    search_fields = ('title',)
+    search_help_text = 'Full-text search on title, excerpt and content'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    raw_id_fields = ('author',)
+    filter_horizontal = ('categories',)
+    actions = ('publish', 'unpublish', 'feature', 'unfeature')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).for_cards()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search.search_queryset(queryset, search_term), False
+
+    @admin.display(description='Categories')
+    def category_names(self, obj):
+        return ', '.join(category.name for category in obj.categories.all())
+
+    def _bulk_update(self, request, queryset, message, **values):
+        # One UPDATE for the whole selection; updated_at is set by hand because
+        # update() skips auto_now, and it is what the ETags are built from
+        ids = list(queryset.values_list('pk', flat=True)) if 'status' in values else []
+        updated = queryset.order_by().update(updated_at=timezone.now(), **values)
+        invalidate_article_caches()
+        if ids and getattr(settings, 'ARTICLE_RELATED_UPDATE_ON_SAVE', True):
+            transaction.on_commit(lambda: similarity.update_for_articles(ids))
+        self.message_user(request, message.format(updated), messages.SUCCESS)
+
+    @admin.action(description='Publish selected articles')
+    def publish(self, request, queryset):
+        self._bulk_update(request, queryset, '{} article(s) published', status='published')
+
+    @admin.action(description='Unpublish selected articles (back to draft)')
+    def unpublish(self, request, queryset):
+        self._bulk_update(request, queryset, '{} article(s) moved to draft', status='draft')
+
+    @admin.action(description='Feature selected articles')
+    def feature(self, request, queryset):
+        self._bulk_update(request, queryset, '{} article(s) featured', is_featured=True)
+
+    @admin.action(description='Unfeature selected articles')
+    def unfeature(self, request, queryset):
+        self._bulk_update(request, queryset, '{} article(s) unfeatured', is_featured=False)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name',)
+    prepopulated_fields = {'slug': ('name',)}
@@ -0,0 +1,123 @@
+"""
+Jumlah artikel published per kategori (facet count) untuk filter kategori.
+
+- Dengan pencarian: satu query aggregate GROUP BY category_id atas tabel
+  relasi categories, dibatasi artikel yang cocok dengan pencarian.
+- Tanpa pencarian: jumlah disimpan di cache per kategori dan dijaga tetap
+  benar oleh signal Article/categories (lihat article/signals.py) dengan
+  incr/decr, jadi page load biasa tidak menjalankan query COUNT sama sekali.
+  Jika ada key yang hilang (cache kosong, kategori baru) semua jumlah dihitung
+  ulang dengan satu query.
+
+Jumlah di cache hanya benar pada akhirnya (eventually correct), bukan setiap saat:
+
+- cache.incr di DatabaseCache (default tanpa Redis) adalah get lalu set, tidak
+  atomik, jadi dua perubahan yang bersamaan bisa kehilangan satu increment.
+- Signal dijalankan di dalam transaksi; jika transaksinya di-rollback, jumlah
+  di cache sudah terlanjur berubah.
+
+Selisih seperti itu hilang saat key kedaluwarsa dan dihitung ulang, yaitu setelah
+ARTICLE_FACET_CACHE_TIMEOUT, atau lebih cepat di DatabaseCache karena incr
+menyimpan ulang key dengan timeout default cache.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Article, Category
+from . import search
+
+KEY_PREFIX = 'article:facets'
+
+
+def _timeout():
+    return getattr(settings, 'ARTICLE_FACET_CACHE_TIMEOUT', 6 * 60 * 60)
+
+
+def _key(category_id):
+    return f'{KEY_PREFIX}:{category_id}'
+
+
+def count_query(queryset):
+    """
+    Jumlah artikel per kategori dalam satu query aggregate
+    Args:
+        queryset (QuerySet): artikel yang dihitung
+    Returns:
+        dict: category_id -> jumlah artikel
+    """
+    through = Article.categories.through
+    rows = (
+        through.objects
+        .filter(article__in=queryset.order_by().values('pk'))
+        .values('category_id')
+        .annotate(total=Count('article_id'))
+        .order_by()
+    )
+    return {row['category_id']: row['total'] for row in rows}
+
+
+def published_counts(category_ids):
+    """
+    Jumlah artikel published per kategori tanpa filter, dari cache
+    Args:
+        category_ids (list[int]): kategori yang ditampilkan
+    Returns:
+        dict: category_id -> jumlah artikel
+    """
+    keys = {_key(pk): pk for pk in category_ids}
+    cached = cache.get_many(keys)
+    if len(cached) == len(keys):
+        return {keys[key]: value for key, value in cached.items()}
+    counts = count_query(Article.objects.filter(status='published'))
+    cache.set_many({_key(pk): counts.get(pk, 0) for pk in category_ids}, timeout=_timeout())
+    return {pk: counts.get(pk, 0) for pk in category_ids}
+
+
+def category_counts(category_ids, search_query=''):
+    """
+    Jumlah artikel published per kategori, dengan filter pencarian jika ada
+    Notes:
+        - Filter kategori sendiri tidak diterapkan: angka di samping tiap
+          kategori adalah jumlah hasil jika kategori itu dipilih.
+    """
+    if not search_query:
+        return published_counts(category_ids)
+    queryset = search.search_queryset(Article.objects.filter(status='published'), search_query)
+    counts = count_query(queryset)
+    return {pk: counts.get(pk, 0) for pk in category_ids}
+
+
+def adjust(category_ids, delta):
+    """
+    Menambah/mengurangi jumlah cache untuk kategori yang berubah. Key yang
+    tidak ada dibiarkan, akan dihitung ulang saat dibaca. Tidak atomik di
+    DatabaseCache, lihat docstring modul.
+    """
+    for pk in category_ids:
+        try:
+            cache.incr(_key(pk), delta)
+        except ValueError:
+            pass
+
+
+def invalidate(category_ids=None):
+    """
+    Menghapus jumlah di cache, dipanggil setelah operasi bulk yang melewati signal
+    """
+    if category_ids is None:
+        category_ids = Category.objects.values_list('pk', flat=True)
+    cache.delete_many([_key(pk) for pk in category_ids])
+
+
+def annotate_categories(categories, search_query=''):
+    """
+    Menambahkan atribut article_count ke setiap kategori
+    Returns:
+        list[Category]
+    """
+    categories = list(categories)
+    counts = category_counts([category.pk for category in categories], search_query)
+    for category in categories:
+        category.article_count = counts.get(category.pk, 0)
+    return categories
@@ -0,0 +1,162 @@
+"""
+Cache untuk respons AJAX ArticleListView (article_list, active_filters, pagination).
+
+Key dibuat dari parameter search/category/sort/page/view_all yang sudah
+dinormalisasi, jadi request yang sama dari pengunjung berbeda memakai entri
+yang sama. Invalidasi memakai nomor versi: setiap perubahan Article, Category
+atau relasi categories menaikkan versi sehingga semua entri lama tidak
+terpakai lagi (tanpa harus menghapus key satu per satu).
+
+Nomor versi yang sama dipakai sebagai ETag halaman daftar artikel, sehingga
+conditional GET tidak perlu query aggregate. Flush view_count hanya menaikkan
+versi sort=popular (invalidate_views), karena hanya urutan itu yang berubah.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'article:fragments'
+VERSION_KEY = f'{KEY_PREFIX}:version'
+VIEWS_VERSION_KEY = f'{KEY_PREFIX}:version:views'
+HITS_KEY = f'{KEY_PREFIX}:hits'
+MISSES_KEY = f'{KEY_PREFIX}:misses'
+
+VALID_SORTS = {'', 'recent', 'oldest', 'popular', 'trending', 'az', 'za', 'relevance'}
+
+
+def _timeout():
+    return getattr(settings, 'ARTICLE_FRAGMENT_CACHE_TIMEOUT', 300)
+
+
+def normalize_params(params):
+    """
+    Normalisasi parameter GET yang mempengaruhi respons AJAX
+    Args:
+        params (QueryDict): request.GET
+    Returns:
+        dict | None: parameter yang sudah dinormalisasi, atau None jika
+        request tidak perlu di-cache (parameter tidak valid)
+    """
+    category = params.get('category', '')
+    category_ids = [value for value in category.split(',') if value] if category else []
+    if not all(value.isdigit() for value in category_ids):
+        return None
+
+    sort = params.get('sort', '')
+    if sort not in VALID_SORTS:
+        return None
+
+    page = params.get('page', '') or '1'
+    if page.isdigit():
+        page = int(page)
+    elif page != 'last':
+        return None
+
+    return {
+        'search': params.get('search', ''),
+        'category': sorted({int(value) for value in category_ids}),
+        'sort': sort,
+        'page': page,
+        'view_all': params.get('view_all') == 'true',
+        'pagination': 'cursor' if params.get('pagination') == 'cursor' or 'cursor' in params else 'offset',
+        'cursor': params.get('cursor', ''),
+    }
+
+
+def _initial_version():
+    # Mulai dari waktu sekarang, bukan 1: versi yang di-evict dari cache tidak
+    # kembali ke nilai lama sehingga ETag lama tidak dianggap masih valid
+    return time.time_ns() // 1000
+
+
+def version(normalized):
+    """
+    Versi konten untuk parameter yang sudah dinormalisasi
+    Args:
+        normalized (dict | None): hasil normalize_params
+    Returns:
+        str: versi global, ditambah versi view_count untuk sort=popular
+    """
+    current = str(cache.get_or_set(VERSION_KEY, _initial_version, timeout=None))
+    if normalized and normalized['sort'] == 'popular':
+        current += '.' + str(cache.get_or_set(VIEWS_VERSION_KEY, _initial_version, timeout=None))
+    return current
+
+
+def make_key(params):
+    """
+    Membuat cache key dari parameter request
+    Returns:
+        str | None: cache key, atau None jika request tidak bisa di-cache
+    """
+    normalized = normalize_params(params)
+    if normalized is None:
+        return None
+    digest = hashlib.md5(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+    return f'{KEY_PREFIX}:{version(normalized)}:{digest}'
+
+
+def _incr(key):
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def lookup(key):
+    """
+    Mengambil payload JSON dari cache dan mencatat hit/miss
+    """
+    payload = cache.get(key)
+    _incr(HITS_KEY if payload is not None else MISSES_KEY)
+    return payload
+
+
+def store(key, payload):
+    """
+    Menyimpan payload JSON respons AJAX
+    """
+    cache.set(key, payload, timeout=_timeout())
+
+
+def _bump(key):
+    # A new time-based value instead of incr(): one cache write, and
+    # DatabaseCache.incr() would reset the timeout to the default
+    cache.set(key, _initial_version(), timeout=None)
+
+
+def invalidate():
+    """
+    Menaikkan versi cache sehingga semua fragmen lama tidak dipakai lagi
+    """
+    _bump(VERSION_KEY)
+
+
+def invalidate_views():
+    """
+    Menaikkan versi view_count, hanya fragmen sort=popular yang tidak dipakai lagi
+    """
+    _bump(VIEWS_VERSION_KEY)
+
+
+def get_stats():
+    """
+    Returns:
+        dict: jumlah hit, miss, dan hit ratio sejak counter terakhir di-reset
+    """
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
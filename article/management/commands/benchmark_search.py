@@ -0,0 +1,96 @@
+import json
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from article import search
+from article.models import Article
+from article.rendering import render_artifacts
+
+WORDS = (
+    'robotics sensor circuit signal power embedded drone vision network antenna '
+    'satellite battery energy grid machine learning neural data cloud edge '
+    'security protocol wireless spectrum quantum photonics semiconductor chip '
+    'workshop competition seminar student branch volunteer mentoring research '
+    'paper conference journal award project prototype hackathon innovation'
+).split()
+
+QUERIES = ['robot', 'neural network', 'quantum chip', 'workshop', 'satellite antenna', 'hackathon']
+
+
+def _sentence(rng, length):
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def _timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[max(0, int(len(samples) * 0.95) - 1)], 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the indexed article search against the legacy icontains path. '
+        'Seeds articles inside a transaction that is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+        parser.add_argument('--repeat', type=int, default=10, help='Runs per query')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        results = []
+        for size in options['sizes']:
+            results.append(self._run(size, options['repeat'], options['seed']))
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _run(self, size, repeat, seed):
+        rng = random.Random(seed)
+        with transaction.atomic():
+            author, _ = User.objects.get_or_create(username='benchmark-search')
+            batch = []
+            for i in range(size):
+                excerpt = _sentence(rng, 25)
+                content = _sentence(rng, 400)
+                batch.append(Article(
+                    title=_sentence(rng, 6),
+                    slug=f'benchmark-search-{i}',
+                    author=author,
+                    excerpt=excerpt,
+                    content=content,
+                    status='published',
+                    **render_artifacts(content, excerpt),
+                ))
+                if len(batch) >= 2000:
+                    Article.objects.bulk_create(batch)
+                    batch = []
+            if batch:
+                Article.objects.bulk_create(batch)
+            search.rebuild_index(Article)
+
+            base = Article.objects.filter(status='published')
+            report = {'articles': size, 'queries': {}}
+            for query in QUERIES:
+                # First page of results plus the paginator count, as ArticleListView does
+                legacy = lambda: (list(search.legacy_search_queryset(base, query).order_by('-created_at')[:3]),
+                                  search.legacy_search_queryset(base, query).count())
+                indexed = lambda: (list(search.search_queryset(base, query).order_by('-search_rank')[:3]),
+                                   search.search_queryset(base, query).count())
+                report['queries'][query] = {
+                    'icontains': _timed(legacy, repeat),
+                    'indexed': _timed(indexed, repeat),
+                }
+            transaction.set_rollback(True)
+        return report
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from article import similarity
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TF-IDF related articles index for all published articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=256,
+            help='Number of articles scored per matrix multiplication',
+        )
+
+    def handle(self, *args, **options):
+        total = similarity.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Stored {total} related article pairs'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from article import view_counter
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered article view counts to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of article ids read from the cache per batch',
+        )
+
+    def handle(self, *args, **options):
+        flushed = view_counter.flush(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Flushed {flushed} buffered views'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from article import search
+from article.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for all articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to rebuild')
+
+    def handle(self, *args, **options):
+        search.rebuild_index(Article, alias=options['database'])
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from article import search
+from article.models import RENDER_ARTIFACT_FIELDS, Article
+from article.rendering import render_artifacts
+
+
+def render_all(model, batch_size=500, using='default'):
+    """
+    Recompute and store the render artifacts of every article
+    Args:
+        model: the Article model, or its historical version in a migration
+    Returns:
+        int: number of articles updated
+    """
+    manager = model.objects.using(using)
+    batch, total = [], 0
+    for article in manager.only('id', 'content', 'excerpt').order_by('id').iterator(chunk_size=batch_size):
+        for field, value in render_artifacts(article.content, article.excerpt).items():
+            setattr(article, field, value)
+        batch.append(article)
+        if len(batch) >= batch_size:
+            manager.bulk_update(batch, RENDER_ARTIFACT_FIELDS)
+            total += len(batch)
+            batch = []
+    if batch:
+        manager.bulk_update(batch, RENDER_ARTIFACT_FIELDS)
+        total += len(batch)
+    return total
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the stored render artifacts (sanitized HTML, table of contents, '
+        'reading time, plain text, card excerpt) of every article, e.g. after the '
+        'sanitizer changed, and rebuild the search index'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = render_all(Article, options['batch_size'])
+        search.rebuild_index(Article)
+        self.stdout.write(self.style.SUCCESS(f'Rendered artifacts for {total} articles'))
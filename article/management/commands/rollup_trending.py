@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from article import fragment_cache, trending
+from main.views import invalidate_homepage
+
+
+class Command(BaseCommand):
+    help = (
+        'Compact hourly article view buckets into daily ones, prune buckets outside '
+        'the trending window and recompute Article.trending_score. Run it periodically '
+        '(e.g. hourly from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Articles per bulk update')
+
+    def handle(self, *args, **options):
+        result = trending.rollup(batch_size=options['batch_size'])
+        # trending_score is written with bulk updates, which send no signals
+        fragment_cache.invalidate()
+        invalidate_homepage()
+        self.stdout.write(self.style.SUCCESS(
+            'Compacted {compacted} hourly buckets, pruned {pruned} daily buckets, '
+            'scored {scored} articles'.format(**result)
+        ))
@@ -0,0 +1,58 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+GIN_INDEX = 'article_article_search_vector_gin'
+FTS_TABLE = 'article_article_fts'
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {GIN_INDEX} ON article_article USING gin (search_vector)'
+        )
+        schema_editor.execute(
+            "UPDATE article_article SET search_vector = "
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(excerpt, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(content, '')), 'C')"
+        )
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            options = {row[0] for row in cursor.fetchall()}
+        if 'ENABLE_FTS5' not in options:
+            # Without FTS5 the search backend falls back to icontains
+            return
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, excerpt, content, tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) '
+            'SELECT id, title, excerpt, content FROM article_article'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {GIN_INDEX}')
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('article', '0008_alter_article_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
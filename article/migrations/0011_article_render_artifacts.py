@@ -0,0 +1,66 @@
+from django.db import migrations, models
+
+FTS_TABLE = 'article_article_fts'
+
+
+def backfill_render_artifacts(apps, schema_editor):
+    # Same code as manage.py render_article_artifacts (and the same sanitizer,
+    # article/rendering.py), run on the historical model
+    from article.management.commands.render_article_artifacts import render_all
+
+    render_all(apps.get_model('article', 'Article'), using=schema_editor.connection.alias)
+
+    # The search index now covers plain_text instead of the raw HTML
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "UPDATE article_article SET search_vector = "
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(excerpt, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(plain_text, '')), 'C')"
+        )
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            if FTS_TABLE not in connection.introspection.table_names(cursor):
+                return
+        schema_editor.execute(f'DELETE FROM {FTS_TABLE}')
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) '
+            'SELECT id, title, excerpt, plain_text FROM article_article'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('article', '0010_relatedarticle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='card_excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='plain_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='toc',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(backfill_render_artifacts, migrations.RunPython.noop),
+    ]
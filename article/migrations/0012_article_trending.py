@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('article', '0011_article_render_artifacts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', '-trending_score'], name='article_trending_idx'),
+        ),
+        migrations.CreateModel(
+            name='ArticleHourlyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('bucket', models.DateTimeField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='article.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket'], name='article_hourly_views_idx')],
+                'constraints': [models.UniqueConstraint(fields=('article', 'bucket'), name='article_hourly_views_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleDailyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('bucket', models.DateField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='article.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket'], name='article_daily_views_idx')],
+                'constraints': [models.UniqueConstraint(fields=('article', 'bucket'), name='article_daily_views_unique')],
+            },
+        ),
+    ]
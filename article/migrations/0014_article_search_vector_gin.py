@@ -0,0 +1,36 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+# Created with raw SQL by 0009; renamed here so the name fits Django's 30
+# character limit for indexes declared in Meta.indexes
+OLD_NAME = 'article_article_search_vector_gin'
+NEW_NAME = 'article_search_vector_gin'
+
+
+def rename_index(old, new):
+    def rename(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(f'ALTER INDEX IF EXISTS {old} RENAME TO {new}')
+    return rename
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('article', '0013_query_plan_indexes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            # SQLite keeps using the FTS5 table instead of a GIN index
+            database_operations=[
+                migrations.RunPython(rename_index(OLD_NAME, NEW_NAME), rename_index(NEW_NAME, OLD_NAME)),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='article',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='article_search_vector_gin'),
+                ),
+            ],
+        ),
+    ]
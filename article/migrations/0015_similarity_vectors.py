@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('article', '0014_article_search_vector_gin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleVector',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='article.article')),
+                ('weights', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SimilarityVocabulary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idf', models.JSONField(default=dict)),
+                ('documents', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
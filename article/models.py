@@ -1,7 +1,15 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.urls import reverse
 from django.utils.text import slugify
 import uuid
+
+from .rendering import render_artifacts
+
+RENDER_ARTIFACT_FIELDS = ('content_html', 'toc', 'reading_time', 'plain_text', 'card_excerpt')
+
 class Category(models.Model):
     """
     model untuk menyimpan kategori artikel
@@ -56,6 +64,26 @@ def article_image_upload_to(instance, filename):
 
 #     return f"articles/{filename}"
 
+# Columns only needed by the detail page (or not at all when rendering)
+HEAVY_FIELDS = ('content', 'content_html', 'toc', 'plain_text', 'search_vector')
+
+
+class ArticleQuerySet(models.QuerySet):
+    def for_cards(self):
+        """
+        Query plan untuk menampilkan kartu artikel
+        Notes:
+            - author diambil dengan JOIN (select_related).
+            - categories di-prefetch dalam satu query untuk semua artikel,
+              sehingga jumlah query tetap berapapun banyaknya kartu.
+            - Kolom besar yang tidak dipakai kartu (konten, artefak render,
+              vektor pencarian) tidak diambil.
+        """
+        return self.select_related('author').defer(*HEAVY_FIELDS).prefetch_related(
+            models.Prefetch('categories', queryset=Category.objects.order_by('name'))
+        )
+
+
 class Article(models.Model):
     """
     Model untuk menyimpan artikel
@@ -74,8 +102,17 @@ class Article(models.Model):
         status (str): Status artikel ('draft' atau 'published')
         is_featured (bool): Menandai apakah artikel ditampilkan di halaman utama
         view_count (int): Jumlah tampilan artikel
+        search_vector (SearchVectorField): Index full-text (PostgreSQL), diisi otomatis saat disimpan
+        content_html (str): Konten yang sudah disanitasi, siap ditampilkan
+        toc (list): Daftar isi dari heading h2/h3 konten
+        reading_time (int): Estimasi waktu baca dalam menit
+        plain_text (str): Konten tanpa tag HTML untuk pencarian
+        card_excerpt (str): Excerpt yang sudah dipotong untuk kartu artikel
+        trending_score (float): Skor trending dari view terbaru yang meluruh terhadap waktu (article/trending.py)
     Methods:
         __str__(): Mengembalikan judul artikel
+        get_absolute_url(): URL halaman detail artikel
+        primary_category: Kategori pertama artikel untuk ditampilkan di kartu
         save(): Menyimpan artikel ke database
     Notes:
         - Slug dihasilkan secara otomatis berdasarkan judul artikel saat disimpan ataupun bisa juga ditulis secara manual apabila diinginkan.
@@ -84,6 +121,8 @@ class Article(models.Model):
         - Status artikel dapat berupa 'draft' atau 'published'.
         - Artikel dapat memiliki banyak kategori.
         - Artikel dapat ditandai sebagai 'featured' untuk ditampilkan di halaman utama.
+        - Artefak render (content_html, toc, reading_time, plain_text, card_excerpt) dihitung
+          ulang setiap save() dari content dan excerpt (lihat article/rendering.py).
     """
     STATUS_CHOICES = (
         ('draft', 'Draft'),
@@ -103,17 +142,166 @@ class Article(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft')
     is_featured = models.BooleanField(default=False)
     view_count = models.PositiveIntegerField(default=0)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    content_html = models.TextField(blank=True, editable=False)
+    toc = models.JSONField(default=list, blank=True, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)
+    plain_text = models.TextField(blank=True, editable=False)
+    card_excerpt = models.CharField(max_length=100, blank=True, editable=False)
+    trending_score = models.FloatField(default=0, editable=False)
+    
+    objects = ArticleQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Published listings ordered by date, and the featured article lookup
+            models.Index(fields=['status', '-created_at'], name='article_status_created_idx'),
+            models.Index(fields=['is_featured', 'status', '-created_at'], name='article_featured_created_idx'),
+            models.Index(fields=['status', '-trending_score'], name='article_trending_idx'),
+            # Full-text search (article/search.py)
+            GinIndex(fields=['search_vector'], name='article_search_vector_gin'),
+        ]
     
     def __str__(self):
         return self.title
     
+    def get_absolute_url(self):
+        return reverse('article_detail', args=[self.slug])
+    
+    @property
+    def primary_category(self):
+        """
+        Kategori pertama artikel (urut nama), dibaca dari hasil prefetch jika ada
+        """
+        categories = list(self.categories.all())
+        return categories[0] if categories else None
+    
+    def refresh_render_artifacts(self):
+        """
+        Menghitung ulang artefak render dari content dan excerpt
+        """
+        for field, value in render_artifacts(self.content, self.excerpt).items():
+            setattr(self, field, value)
+    
     def save(self, *args, **kwargs):
         """
-        update slug saat menyimpan artikel
+        update slug dan artefak render saat menyimpan artikel lalu perbarui index pencarian
         """
+        from .search import update_index
+
         if not self.slug:
             self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
\ No newline at end of file
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.refresh_render_artifacts()
+        elif {'content', 'excerpt'} & set(update_fields):
+            self.refresh_render_artifacts()
+            kwargs['update_fields'] = set(update_fields) | set(RENDER_ARTIFACT_FIELDS)
+        super().save(*args, **kwargs)
+        update_index(self)
+
+
+class RelatedArticle(models.Model):
+    """
+    Index artikel terkait hasil perhitungan kemiripan konten (lihat article/similarity.py)
+    Attributes:
+        article (Article): Artikel sumber
+        related (Article): Artikel yang mirip dengan artikel sumber
+        score (float): Cosine similarity TF-IDF antara kedua artikel
+    Notes:
+        - Setiap artikel menyimpan paling banyak ARTICLE_RELATED_TOP_K baris.
+        - Index (article, -score) membuat halaman detail cukup melakukan satu lookup.
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='related_to_entries')
+    score = models.FloatField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['article', '-score'], name='article_related_score_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'related'], name='article_related_unique_pair'),
+        ]
+    
+    def __str__(self):
+        return f"{self.article_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class ArticleVector(models.Model):
+    """
+    Vektor TF-IDF sparse satu artikel published (lihat article/similarity.py)
+    Attributes:
+        article (Article): Artikel pemilik vektor
+        weights (dict): term -> bobot TF-IDF, sudah dinormalisasi L2
+    Notes:
+        - Disimpan supaya update satu artikel cukup menghitung vektor artikel
+          itu saja lalu dot product dengan vektor yang sudah ada.
+    """
+    article = models.OneToOneField(Article, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    weights = models.JSONField(default=dict)
+
+
+class SimilarityVocabulary(models.Model):
+    """
+    Vocabulary dan IDF dari rebuild index artikel terkait terakhir (satu baris)
+    Attributes:
+        idf (dict): term -> IDF
+        documents (int): jumlah artikel saat IDF dihitung
+    Notes:
+        - Artikel yang disimpan sesudahnya memakai IDF ini. IDF baru dihitung
+          oleh manage.py build_related_articles.
+    """
+    idf = models.JSONField(default=dict)
+    documents = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{len(self.idf)} terms, {self.documents} documents"
+
+
+class ArticleViewBucket(models.Model):
+    """
+    Jumlah view satu artikel dalam satu rentang waktu (lihat article/trending.py)
+    Attributes:
+        article (Article): Artikel yang dilihat
+        views (int): Jumlah view dalam bucket
+    Notes:
+        - Ditulis oleh flush view_counter, tidak pernah dari request halaman detail.
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='+')
+    views = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        abstract = True
+
+
+class ArticleHourlyViews(ArticleViewBucket):
+    """
+    View per jam, disimpan selama ARTICLE_TRENDING_HOURLY_RETENTION jam lalu digabung ke ArticleDailyViews
+    """
+    bucket = models.DateTimeField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['bucket'], name='article_hourly_views_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'bucket'], name='article_hourly_views_unique'),
+        ]
+
+
+class ArticleDailyViews(ArticleViewBucket):
+    """
+    View per hari, disimpan selama ARTICLE_TRENDING_WINDOW_DAYS hari
+    """
+    bucket = models.DateField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['bucket'], name='article_daily_views_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'bucket'], name='article_daily_views_unique'),
+        ]
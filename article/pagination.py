@@ -0,0 +1,157 @@
+"""
+Keyset (cursor) pagination untuk daftar artikel.
+
+Berbeda dengan Paginator Django yang memakai OFFSET dan COUNT(*), halaman
+berikutnya diambil dengan kondisi WHERE pada kolom sort + id dari item
+terakhir halaman sebelumnya. Biaya tiap halaman sama saja seberapa jauh pun
+user menggulir, dan tidak ada query COUNT.
+"""
+import base64
+import binascii
+import json
+import math
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+# sort parameter -> ordering field, id is always added as tiebreaker
+SORT_FIELDS = {
+    '': '-created_at',
+    'recent': '-created_at',
+    'oldest': 'created_at',
+    'popular': '-view_count',
+    'trending': '-trending_score',
+    'az': 'title',
+    'za': '-title',
+}
+
+# Expected JSON type of the cursor value per sort field
+DATETIME_FIELDS = {'created_at'}
+DATE_FIELDS = {'date'}
+NUMBER_FIELDS = {'view_count', 'trending_score'}
+STRING_FIELDS = {'title'}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorPage:
+    """
+    Satu halaman hasil keyset pagination
+    Attributes:
+        object_list (list): artikel di halaman ini
+        next_cursor (str | None): token untuk halaman berikutnya
+        has_next (bool): apakah masih ada halaman berikutnya
+    """
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.has_next = next_cursor is not None
+
+
+def supports_sort(sort):
+    return sort in SORT_FIELDS
+
+
+def ordering(sort, sort_fields=None):
+    """
+    Urutan untuk parameter sort: kolom sort lalu id sebagai tiebreaker
+    Notes:
+        - Dipakai juga oleh pagination offset di ArticleListView, jadi artikel
+          dengan nilai sort yang sama muncul dalam urutan yang sama di kedua mode.
+    """
+    field = (sort_fields or SORT_FIELDS)[sort]
+    return field, '-id' if field.startswith('-') else 'id'
+
+
+def encode_cursor(sort, value, pk):
+    """
+    Membuat token cursor yang opaque dari nilai kolom sort dan id item terakhir
+    """
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, pk], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _is_number(value, types):
+    # bool is a subclass of int but never a valid cursor value; values outside
+    # bigint (or NaN/inf) would fail in the database instead of here
+    if not isinstance(value, types) or isinstance(value, bool):
+        return False
+    return math.isfinite(value) and abs(value) < 2 ** 63
+
+
+def decode_cursor(token, sort, sort_fields=None):
+    """
+    Membaca token cursor
+    Args:
+        token (str): token dari encode_cursor
+        sort (str): parameter sort yang diminta
+        sort_fields (dict): mapping sort -> field, default SORT_FIELDS
+    Returns:
+        tuple: (nilai kolom sort, id)
+    Raises:
+        InvalidCursor: token rusak, dibuat untuk sort yang berbeda, atau tipe
+            nilainya tidak sesuai kolom sort (angka, teks, tanggal)
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        token_sort, value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor('Malformed cursor')
+    if token_sort != sort or not _is_number(pk, int):
+        raise InvalidCursor('Cursor does not match the requested sort')
+
+    field = (sort_fields or SORT_FIELDS)[sort].lstrip('-')
+    if field in NUMBER_FIELDS:
+        if not _is_number(value, (int, float)):
+            raise InvalidCursor('Malformed cursor')
+    elif field in STRING_FIELDS:
+        if not isinstance(value, str):
+            raise InvalidCursor('Malformed cursor')
+    elif field in DATETIME_FIELDS or field in DATE_FIELDS:
+        parse = parse_datetime if field in DATETIME_FIELDS else parse_date
+        try:
+            value = parse(value) if isinstance(value, str) else None
+        except ValueError:
+            value = None
+        if value is None:
+            raise InvalidCursor('Malformed cursor')
+    return value, pk
+
+
+def paginate(queryset, sort, cursor, page_size, sort_fields=None):
+    """
+    Mengambil satu halaman artikel dengan keyset pagination
+    Args:
+        queryset (QuerySet): queryset artikel yang sudah difilter
+        sort (str): parameter sort (harus ada di SORT_FIELDS)
+        cursor (str): token cursor dari halaman sebelumnya, kosong untuk halaman pertama
+        page_size (int): jumlah artikel per halaman
+        sort_fields (dict): mapping sort -> field untuk model lain (mis. event), default SORT_FIELDS
+    Returns:
+        CursorPage: halaman artikel dan cursor berikutnya
+    Notes:
+        - Mengambil page_size + 1 baris untuk mengetahui apakah ada halaman berikutnya.
+    """
+    sort_field, tiebreaker = ordering(sort, sort_fields)
+    descending = sort_field.startswith('-')
+    field = sort_field.lstrip('-')
+    queryset = queryset.order_by(sort_field, tiebreaker)
+
+    if cursor:
+        value, pk = decode_cursor(cursor, sort, sort_fields)
+        lookup = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'id__{lookup}': pk})
+        )
+
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(sort, getattr(last, field), last.pk)
+    return CursorPage(items, next_cursor)
@@ -0,0 +1,237 @@
+"""
+Artefak render artikel yang dihitung sekali saat Article.save().
+
+Dari konten mentah (HTML dari admin) dihasilkan:
+
+- content_html: HTML yang sudah disanitasi dan dinormalisasi (allowlist tag
+  dan atribut, heading diberi id, gambar lazy-load),
+- toc: daftar heading h2/h3 untuk daftar isi,
+- reading_time: estimasi waktu baca dalam menit,
+- plain_text: teks tanpa tag untuk index pencarian dan artikel terkait,
+- card_excerpt: excerpt yang sudah dipotong untuk kartu artikel.
+
+Template detail dan daftar artikel cukup menampilkan string yang sudah jadi.
+"""
+import math
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.utils.html import linebreaks
+from django.utils.text import Truncator, slugify
+
+WORDS_PER_MINUTE = 200
+CARD_EXCERPT_LENGTH = 100
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'figcaption', 'figure',
+    'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'iframe', 'img', 'li', 'ol', 'p', 'pre',
+    's', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead',
+    'tr', 'u', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Tags whose content is dropped together with the tag
+DROP_CONTENT_TAGS = {'script', 'style', 'noscript', 'template', 'object', 'embed'}
+# The page title is the only h1, so headings in the body start at h2
+RENAMED_TAGS = {'h1': 'h2'}
+TOC_TAGS = {'h2', 'h3'}
+# Open elements closed implicitly by a new sibling, e.g. <li>a<li>b
+IMPLIED_END_TAGS = {
+    'li': {'li'},
+    'p': {'p'},
+    'td': {'td', 'th'},
+    'th': {'td', 'th'},
+    'tr': {'tr', 'td', 'th'},
+}
+BLOCK_TAGS = {
+    'blockquote', 'br', 'div', 'figcaption', 'figure', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'li', 'p', 'pre', 'td', 'th', 'tr',
+}
+
+ALLOWED_ATTRIBUTES = {
+    '*': {'class', 'title'},
+    'a': {'href'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'iframe': {'src', 'width', 'height', 'allowfullscreen'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'ol': {'start'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_C0_CONTROL_OR_SPACE = ''.join(chr(code) for code in range(0x21))
+_TAB_OR_NEWLINE = {ord('\t'): None, ord('\n'): None, ord('\r'): None}
+_CONTROL_RE = re.compile(r'[\x00-\x1f\x7f]')
+
+
+def _safe_url(value, tag):
+    # Browsers strip leading/trailing C0 controls and spaces and drop tabs and
+    # newlines anywhere ("java\tscript:"), so those cannot hide the scheme.
+    # Any other control character left in the URL is rejected.
+    value = value.strip(_C0_CONTROL_OR_SPACE).strip().translate(_TAB_OR_NEWLINE)
+    if _CONTROL_RE.search(value):
+        return None
+    scheme = urlsplit(value).scheme.lower()
+    if tag == 'iframe':
+        # Embeds only from https sources
+        return value if scheme == 'https' else None
+    return value if scheme in ALLOWED_SCHEMES else None
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.text = []
+        self.stack = []
+        self.drop_depth = 0
+        self.toc = []
+        self.heading = None
+        self.heading_ids = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.drop_depth += 1
+            return
+        if self.drop_depth:
+            return
+        tag = RENAMED_TAGS.get(tag, tag)
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in ALLOWED_TAGS:
+            return
+
+        allowed = ALLOWED_ATTRIBUTES['*'] | ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = []
+        for name, value in attrs:
+            if name not in allowed:
+                continue
+            if value is None:
+                rendered.append(name)
+                continue
+            if name in URL_ATTRIBUTES:
+                value = _safe_url(value, tag)
+                if value is None:
+                    continue
+            rendered.append(f'{name}="{escape(value)}"')
+        if tag == 'img':
+            rendered += ['loading="lazy"', 'decoding="async"']
+        elif tag == 'a' and any(name == 'href' for name, _ in attrs):
+            rendered.append('rel="noopener nofollow"')
+        elif tag == 'iframe':
+            rendered.append('loading="lazy"')
+
+        while self.stack and self.stack[-1] in IMPLIED_END_TAGS.get(tag, ()):
+            self.output.append(f'</{self.stack.pop()}>')
+        if tag in TOC_TAGS and self.heading is None:
+            # The id depends on the heading text, so the start tag is filled in at the end tag
+            self.heading = {'tag': tag, 'index': len(self.output), 'attrs': rendered, 'text': []}
+        self.output.append(f'<{tag}{"".join(" " + item for item in rendered)}>')
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.drop_depth = max(self.drop_depth - 1, 0)
+            return
+        if self.drop_depth:
+            return
+        tag = RENAMED_TAGS.get(tag, tag)
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in self.stack:
+            return
+        # Close anything left open inside this element
+        while self.stack:
+            current = self.stack.pop()
+            self.output.append(f'</{current}>')
+            if self.heading and current == self.heading['tag']:
+                self._finish_heading()
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        self.output.append(escape(data, quote=False))
+        self.text.append(data)
+        if self.heading:
+            self.heading['text'].append(data)
+
+    def _finish_heading(self):
+        heading, self.heading = self.heading, None
+        title = _WHITESPACE_RE.sub(' ', ''.join(heading['text'])).strip()
+        base = slugify(title) or 'section'
+        anchor, suffix = base, 2
+        while anchor in self.heading_ids:
+            anchor = f'{base}-{suffix}'
+            suffix += 1
+        self.heading_ids.add(anchor)
+        attrs = [f'id="{anchor}"'] + heading['attrs']
+        self.output[heading['index']] = f'<{heading["tag"]} {" ".join(attrs)}>'
+        if title:
+            self.toc.append({'level': int(heading['tag'][1]), 'id': anchor, 'title': title})
+
+    def close(self):
+        super().close()
+        while self.stack:
+            current = self.stack.pop()
+            self.output.append(f'</{current}>')
+            if self.heading and current == self.heading['tag']:
+                self._finish_heading()
+
+
+def sanitize_html(content):
+    """
+    Sanitasi dan normalisasi HTML konten artikel
+    Args:
+        content (str): konten mentah dari admin
+    Returns:
+        tuple[str, list[dict], str]: HTML bersih, daftar isi, dan teks polos
+    Notes:
+        - Konten tanpa tag HTML sama sekali diperlakukan sebagai teks biasa:
+          paragraf dipisah baris kosong, baris baru menjadi <br>.
+    """
+    content = (content or '').replace('\r\n', '\n')
+    if '<' not in content:
+        content = linebreaks(content)
+    parser = _Sanitizer()
+    parser.feed(content)
+    parser.close()
+    html = ''.join(parser.output).strip()
+    plain_text = _WHITESPACE_RE.sub(' ', ''.join(parser.text)).strip()
+    return html, parser.toc, plain_text
+
+
+def reading_time(plain_text):
+    """
+    Estimasi waktu baca dalam menit (minimal 1 untuk konten yang tidak kosong)
+    """
+    words = len(plain_text.split())
+    return max(1, math.ceil(words / WORDS_PER_MINUTE)) if words else 0
+
+
+def card_excerpt(excerpt):
+    """
+    Excerpt untuk kartu artikel, sama dengan filter truncatechars:100
+    """
+    return Truncator(excerpt or '').chars(CARD_EXCERPT_LENGTH)
+
+
+def render_artifacts(content, excerpt):
+    """
+    Menghitung semua artefak render dari konten dan excerpt artikel
+    Returns:
+        dict: nilai untuk field content_html, toc, reading_time, plain_text dan card_excerpt
+    """
+    html, toc, plain_text = sanitize_html(content)
+    return {
+        'content_html': html,
+        'toc': toc,
+        'reading_time': reading_time(plain_text),
+        'plain_text': plain_text,
+        'card_excerpt': card_excerpt(excerpt),
+    }
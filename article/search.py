@@ -0,0 +1,206 @@
+"""
+Backend full-text search untuk artikel.
+
+- PostgreSQL: kolom Article.search_vector (tsvector) dengan GIN index,
+  diperbarui setiap Article.save().
+- SQLite: tabel virtual FTS5 (article_article_fts) sebagai fallback untuk
+  development dan test lokal.
+- Database lain: fallback ke icontains seperti sebelumnya.
+
+Semua backend mengisi anotasi ``search_rank`` (semakin besar semakin relevan)
+yang dipakai oleh sort=relevance di ArticleListView.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = 'simple'
+FTS_TABLE = 'article_article_fts'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(query):
+    """
+    Memecah query pencarian menjadi token kata (huruf kecil)
+    Args:
+        query (str): query dari parameter search
+    Returns:
+        list[str]: token yang aman dipakai di tsquery maupun FTS5 MATCH
+    """
+    return _TOKEN_RE.findall(query.lower())
+
+
+def build_search_vector():
+    """
+    Ekspresi tsvector untuk artikel: judul (A), excerpt (B), konten (C)
+    Konten diambil dari plain_text supaya tag dan atribut HTML tidak ikut terindex.
+    """
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('excerpt', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('plain_text', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def _vendor(alias):
+    return connections[alias].vendor
+
+
+# (alias, database name) -> whether the FTS5 table exists
+_fts_tables = {}
+
+
+def sqlite_fts_available(alias='default'):
+    """
+    Cek apakah tabel FTS5 sudah dibuat oleh migrasi (SQLite tanpa FTS5 tidak punya tabelnya)
+    Notes:
+        - Hasilnya disimpan per alias dan nama database, jadi introspeksi
+          tabel hanya dijalankan sekali per proses, bukan setiap pencarian
+          atau setiap Article.save().
+    """
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        return False
+    key = (alias, connection.settings_dict['NAME'])
+    if key not in _fts_tables:
+        with connection.cursor() as cursor:
+            _fts_tables[key] = FTS_TABLE in connection.introspection.table_names(cursor)
+    return _fts_tables[key]
+
+
+def search_queryset(queryset, query):
+    """
+    Memfilter queryset artikel berdasarkan query pencarian
+    Args:
+        queryset (QuerySet): queryset Article yang akan difilter
+        query (str): query pencarian dari user
+    Returns:
+        QuerySet: artikel yang cocok, dianotasi dengan search_rank
+    Notes:
+        - Setiap token dicocokkan sebagai prefix (cocok untuk pencarian per ketukan dari article-ajax.js).
+        - Semua token harus muncul (AND).
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    vendor = _vendor(queryset.db)
+    if vendor == 'postgresql':
+        search_query = SearchQuery(
+            ' & '.join(f'{token}:*' for token in tokens),
+            search_type='raw',
+            config=SEARCH_CONFIG,
+        )
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query)
+        )
+
+    if vendor == 'sqlite' and sqlite_fts_available(queryset.db):
+        match = ' '.join('"{}"*'.format(token) for token in tokens)
+        table = queryset.model._meta.db_table
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(
+            # bm25() returns lower-is-better scores; negate it so higher means more relevant
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, 10.0, 4.0, 1.0) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    return legacy_search_queryset(queryset, query).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
+
+
+def legacy_search_queryset(queryset, query):
+    """
+    Pencarian lama dengan icontains (sequential scan), dipakai sebagai fallback dan pembanding di benchmark
+    """
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(plain_text__icontains=query) |
+        Q(excerpt__icontains=query)
+    )
+
+
+def update_index(article):
+    """
+    Memperbarui index pencarian untuk satu artikel, dipanggil dari Article.save()
+    Args:
+        article (Article): artikel yang baru disimpan
+    """
+    manager = type(article)._base_manager
+    alias = article._state.db or 'default'
+    vendor = _vendor(alias)
+    if vendor == 'postgresql':
+        manager.using(alias).filter(pk=article.pk).update(search_vector=build_search_vector())
+    elif vendor == 'sqlite' and sqlite_fts_available(alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [article.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) VALUES (%s, %s, %s, %s)',
+                [article.pk, article.title, article.excerpt, article.plain_text],
+            )
+
+
+def remove_from_index(article):
+    """
+    Menghapus artikel dari index FTS5 (di PostgreSQL vektor ikut terhapus bersama barisnya)
+    """
+    alias = article._state.db or 'default'
+    if sqlite_fts_available(alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [article.pk])
+
+
+def update_index_for(model, pks, alias='default'):
+    """
+    Memperbarui index pencarian untuk sekumpulan artikel sekaligus (setelah bulk_create/bulk_update)
+    Args:
+        model: model Article
+        pks (list[int]): id artikel
+        alias (str): alias database
+    """
+    pks = list(pks)
+    if not pks:
+        return
+    vendor = _vendor(alias)
+    if vendor == 'postgresql':
+        model._base_manager.using(alias).filter(pk__in=pks).update(search_vector=build_search_vector())
+    elif vendor == 'sqlite' and sqlite_fts_available(alias):
+        table = model._meta.db_table
+        placeholders = ', '.join(['%s'] * len(pks))
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', pks)
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) '
+                f'SELECT id, title, excerpt, plain_text FROM {table} WHERE id IN ({placeholders})',
+                pks,
+            )
+
+
+def rebuild_index(model, alias='default'):
+    """
+    Membangun ulang seluruh index pencarian (backfill atau setelah bulk insert)
+    Args:
+        model: model Article
+        alias (str): alias database
+    """
+    vendor = _vendor(alias)
+    if vendor == 'postgresql':
+        model._base_manager.using(alias).update(search_vector=build_search_vector())
+    elif vendor == 'sqlite' and sqlite_fts_available(alias):
+        table = model._meta.db_table
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) '
+                f'SELECT id, title, excerpt, plain_text FROM {table}'
+            )
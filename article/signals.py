@@ -0,0 +1,134 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.core.signals import request_finished
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Article, Category
+from . import facets, fragment_cache, search, similarity, view_counter
+
+logger = logging.getLogger(__name__)
+
+
+def invalidate_article_caches():
+    """
+    Drop every cache the Article signals below would have dropped. For bulk
+    writes (QuerySet.update, bulk_create, bulk_update) that send no signals.
+    """
+    from main.views import invalidate_homepage
+
+    fragment_cache.invalidate()
+    facets.invalidate()
+    invalidate_homepage()
+
+
+@receiver(post_delete, sender=Article)
+def remove_article_from_search_index(sender, instance, **kwargs):
+    search.remove_from_index(instance)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_fragment_cache(sender, **kwargs):
+    fragment_cache.invalidate()
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+def invalidate_fragment_cache_on_categories_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        fragment_cache.invalidate()
+
+
+@receiver(post_save, sender=Article)
+def update_related_articles(sender, instance, raw=False, **kwargs):
+    if raw or not getattr(settings, 'ARTICLE_RELATED_UPDATE_ON_SAVE', True):
+        return
+    transaction.on_commit(lambda: similarity.update_for_article(instance.pk))
+
+
+@receiver(pre_delete, sender=Article)
+def refill_related_articles_on_delete(sender, instance, **kwargs):
+    # Lists that pointed at the deleted article lose a row to the cascade
+    if not getattr(settings, 'ARTICLE_RELATED_UPDATE_ON_SAVE', True):
+        return
+    holders = similarity.lists_containing(instance.pk)
+    if holders:
+        transaction.on_commit(lambda: similarity.refill(holders))
+
+
+@receiver(request_finished)
+def flush_view_counts(sender, **kwargs):
+    # Runs after the response was sent, off the article detail request path
+    try:
+        view_counter.flush_if_due()
+    except Exception:
+        logger.exception('Could not flush buffered article views')
+
+
+# Facet counts (article/facets.py): only published articles are counted, so the
+# cached counts change when an article enters or leaves the published state,
+# when a published article's categories change, and when one is deleted.
+
+@receiver(pre_save, sender=Article)
+def remember_published_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not instance.pk or (update_fields is not None and 'status' not in update_fields):
+        instance._was_published = None
+        return
+    instance._was_published = Article.objects.filter(pk=instance.pk, status='published').exists()
+
+
+@receiver(post_save, sender=Article)
+def update_facets_on_status_change(sender, instance, created, raw=False, **kwargs):
+    was_published = getattr(instance, '_was_published', None)
+    if raw or created or was_published is None:
+        return
+    is_published = instance.status == 'published'
+    if is_published != was_published:
+        facets.adjust(instance.categories.values_list('pk', flat=True), 1 if is_published else -1)
+
+
+@receiver(pre_delete, sender=Article)
+def remember_facets_before_delete(sender, instance, **kwargs):
+    instance._facet_categories = (
+        list(instance.categories.values_list('pk', flat=True)) if instance.status == 'published' else []
+    )
+
+
+@receiver(post_delete, sender=Article)
+def update_facets_on_delete(sender, instance, **kwargs):
+    facets.adjust(getattr(instance, '_facet_categories', []), -1)
+
+
+@receiver(post_delete, sender=Category)
+def drop_category_facet(sender, instance, **kwargs):
+    facets.invalidate([instance.pk])
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+def update_facets_on_categories_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # pk_set is not given for clear, so remember the rows that are about to go
+        if reverse:
+            instance._facet_cleared = {instance.pk: instance.articles.filter(status='published').count()}
+        elif instance.status == 'published':
+            instance._facet_cleared = {pk: 1 for pk in instance.categories.values_list('pk', flat=True)}
+        else:
+            instance._facet_cleared = {}
+        return
+    if action == 'post_clear':
+        for pk, count in getattr(instance, '_facet_cleared', {}).items():
+            facets.adjust([pk], -count)
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+    delta = 1 if action == 'post_add' else -1
+    if reverse:
+        # category.articles.add(...): pk_set holds article ids
+        published = Article.objects.filter(pk__in=pk_set, status='published').count()
+        facets.adjust([instance.pk], delta * published)
+    elif instance.status == 'published':
+        facets.adjust(pk_set, delta)
@@ -0,0 +1,345 @@
+"""
+Index "artikel terkait" berbasis kemiripan konten (TF-IDF + cosine similarity).
+
+- rebuild() (manage.py build_related_articles) menghitung IDF dari semua artikel
+  published, menyimpan IDF (SimilarityVocabulary) dan vektor sparse tiap artikel
+  (ArticleVector), lalu top-k tetangga tiap artikel dengan perkalian matriks NumPy.
+- update_for_article() dipanggil setelah satu artikel disimpan: hanya vektor
+  artikel itu yang dihitung (dengan IDF tersimpan), lalu dot product dengan
+  vektor yang sudah ada. Tidak ada rebuild corpus di jalur simpan.
+
+Top-k tetangga disimpan di tabel RelatedArticle. Halaman detail cukup membaca
+tabel tersebut dengan satu query ber-index, tanpa join kategori dan distinct di
+setiap request.
+"""
+import heapq
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import Article, ArticleVector, RelatedArticle, SimilarityVocabulary
+
+_TOKEN_RE = re.compile(r'[^\W\d_]{3,}', re.UNICODE)
+
+STOP_WORDS = frozenset((
+    # English
+    'the and for with that this from are was were have has will can into about '
+    'their there which also been more than they them what when where who how our '
+    'your you its not but all any new one two'
+    # Indonesian
+    ' yang dan untuk dengan dari pada ini itu dalam akan juga tidak ada atau '
+    'karena sebagai oleh kami kita mereka para serta telah sudah bisa dapat lebih '
+    'saat agar bagi hingga tersebut'
+).split())
+
+
+def _top_k():
+    return getattr(settings, 'ARTICLE_RELATED_TOP_K', 6)
+
+
+def _max_features():
+    return getattr(settings, 'ARTICLE_RELATED_MAX_FEATURES', 4096)
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def _document_tokens(title, excerpt, plain_text):
+    # Title words count twice so they weigh more than body text
+    return tokenize(f'{title} {title} {excerpt} {plain_text}')
+
+
+def load_corpus(batch_size=500):
+    """
+    Membaca semua artikel published sebagai daftar token
+    Returns:
+        tuple[list[int], list[list[str]]]: id artikel dan token per artikel
+    """
+    ids, documents = [], []
+    rows = (
+        Article.objects.filter(status='published')
+        .order_by('id')
+        .values_list('id', 'title', 'excerpt', 'plain_text')
+        .iterator(chunk_size=batch_size)
+    )
+    for article_id, title, excerpt, plain_text in rows:
+        ids.append(article_id)
+        documents.append(_document_tokens(title, excerpt, plain_text))
+    return ids, documents
+
+
+def fit(documents):
+    """
+    Menghitung IDF untuk vocabulary corpus
+    Args:
+        documents (list[list[str]]): token per dokumen
+    Returns:
+        dict: term -> IDF
+    Notes:
+        - Vocabulary dibatasi ARTICLE_RELATED_MAX_FEATURES term dengan document frequency tertinggi.
+        - IDF memakai smoothing seperti scikit-learn.
+    """
+    n_docs = len(documents)
+    document_frequency = Counter()
+    for tokens in documents:
+        document_frequency.update(set(tokens))
+
+    # Terms in (almost) every document carry no signal for similarity
+    max_df = n_docs * 0.8 if n_docs > 10 else n_docs
+    candidates = [(df, term) for term, df in document_frequency.items() if df <= max_df]
+    candidates.sort(key=lambda item: (-item[0], item[1]))
+    return {term: math.log((1 + n_docs) / (1 + df)) + 1 for df, term in candidates[:_max_features()]}
+
+
+def vectorize(tokens, idf):
+    """
+    Vektor TF-IDF sparse satu dokumen (dinormalisasi L2)
+    Args:
+        tokens (list[str]): token dokumen
+        idf (dict): term -> IDF dari fit()
+    Returns:
+        dict: term -> bobot, kosong jika tidak ada term di vocabulary
+    Notes:
+        - TF memakai skala sublinear (1 + log tf).
+    """
+    counts = Counter(token for token in tokens if token in idf)
+    weights = {term: (1 + math.log(count)) * idf[term] for term, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return {}
+    return {term: round(weight / norm, 6) for term, weight in weights.items()}
+
+
+def dot(a, b):
+    """
+    Cosine similarity dua vektor sparse yang sudah dinormalisasi
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def build_matrix(vectors, vocabulary):
+    """
+    Matriks padat dari vektor sparse, untuk perkalian per blok di rebuild()
+    Returns:
+        numpy.ndarray: matriks float32 berukuran (jumlah dokumen, jumlah term)
+    """
+    columns = {term: index for index, term in enumerate(vocabulary)}
+    matrix = np.zeros((len(vectors), len(columns)), dtype=np.float32)
+    for row, weights in enumerate(vectors):
+        if weights:
+            matrix[row, [columns[term] for term in weights]] = list(weights.values())
+    return matrix
+
+
+def _top_neighbours(scores, k):
+    """
+    Mengembalikan index top-k (skor > 0) dari satu baris skor, urut menurun
+    """
+    k = min(k, len(scores))
+    if k == 0:
+        return []
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    candidates = candidates[np.argsort(-scores[candidates])]
+    return [index for index in candidates if scores[index] > 0]
+
+
+def rebuild(batch_size=256):
+    """
+    Membangun ulang IDF, vektor semua artikel dan seluruh tabel RelatedArticle
+    Args:
+        batch_size (int): jumlah baris matriks yang dikalikan per batch
+    Returns:
+        int: jumlah pasangan artikel terkait yang disimpan
+    """
+    ids, documents = load_corpus()
+    idf = fit(documents)
+    vectors = [vectorize(tokens, idf) for tokens in documents]
+    rows = []
+    if len(ids) > 1:
+        matrix = build_matrix(vectors, list(idf))
+        k = _top_k()
+        for start in range(0, len(ids), batch_size):
+            block = matrix[start:start + batch_size] @ matrix.T
+            # An article is not related to itself
+            block[np.arange(block.shape[0]), np.arange(start, start + block.shape[0])] = 0
+            for offset, scores in enumerate(block):
+                article_id = ids[start + offset]
+                for index in _top_neighbours(scores, k):
+                    rows.append(RelatedArticle(article_id=article_id, related_id=ids[index], score=float(scores[index])))
+
+    with transaction.atomic():
+        SimilarityVocabulary.objects.all().delete()
+        SimilarityVocabulary.objects.create(idf=idf, documents=len(ids))
+        ArticleVector.objects.all().delete()
+        ArticleVector.objects.bulk_create(
+            [ArticleVector(article_id=article_id, weights=weights) for article_id, weights in zip(ids, vectors)],
+            batch_size=1000,
+        )
+        RelatedArticle.objects.all().delete()
+        RelatedArticle.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _stored_vectors(batch_size=500):
+    return ArticleVector.objects.values_list('article_id', 'weights').iterator(chunk_size=batch_size)
+
+
+def _trim(article_ids, k):
+    """
+    Membuang tetangga di luar top-k untuk artikel-artikel ini dengan satu query DELETE
+    """
+    ranked = (
+        RelatedArticle.objects.filter(article_id__in=article_ids)
+        .annotate(rank=Window(RowNumber(), partition_by=F('article_id'), order_by=[F('score').desc(), F('id')]))
+        .filter(rank__gt=k)
+    )
+    RelatedArticle.objects.filter(pk__in=ranked.values('pk')).delete()
+
+
+def refill(article_ids):
+    """
+    Menghitung ulang daftar tetangga beberapa artikel dari vektor tersimpan
+    Args:
+        article_ids (iterable[int]): artikel yang daftarnya kehilangan tetangga
+    Notes:
+        - Semua vektor dibaca sekali untuk seluruh artikel sekaligus.
+    """
+    k = _top_k()
+    sources = dict(ArticleVector.objects.filter(pk__in=list(article_ids)).values_list('article_id', 'weights'))
+    if not sources:
+        return
+    best = {source_id: [] for source_id in sources}
+    for other_id, weights in _stored_vectors():
+        for source_id, vector in sources.items():
+            if other_id == source_id:
+                continue
+            score = dot(vector, weights)
+            if score <= 0:
+                continue
+            heap = best[source_id]
+            if len(heap) < k:
+                heapq.heappush(heap, (score, other_id))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, other_id))
+
+    with transaction.atomic():
+        RelatedArticle.objects.filter(article_id__in=list(sources)).delete()
+        RelatedArticle.objects.bulk_create([
+            RelatedArticle(article_id=source_id, related_id=other_id, score=score)
+            for source_id, heap in best.items()
+            for score, other_id in heap
+        ])
+
+
+def lists_containing(article_id):
+    """
+    Artikel yang saat ini punya article_id di daftar tetangganya
+    """
+    return set(RelatedArticle.objects.filter(related_id=article_id).values_list('article_id', flat=True))
+
+
+def update_for_article(article_id):
+    """
+    Menghitung ulang tetangga satu artikel setelah disimpan
+    Args:
+        article_id (int): id artikel yang berubah
+    Notes:
+        - Sama dengan update_for_articles([article_id]).
+    """
+    update_for_articles([article_id])
+
+
+def update_for_articles(article_ids):
+    """
+    Menghitung ulang tetangga beberapa artikel yang berubah (disimpan, atau
+    status-nya diubah lewat action admin dengan QuerySet.update())
+    Args:
+        article_ids (iterable[int]): id artikel yang berubah
+    Notes:
+        - Hanya vektor artikel-artikel ini yang dihitung, dengan IDF dari rebuild
+          terakhir. Jika belum pernah ada rebuild, rebuild() dijalankan sekali.
+        - Artikel yang tidak published lagi kehilangan vektor dan daftar tetangganya.
+        - Baris milik artikel-artikel ini dan baris yang menunjuk ke mereka dihapus
+          lalu dihitung ulang. Vektor tersimpan dibaca sekali untuk semuanya.
+        - Artikel lain mendapat artikel ini sebagai tetangga jika skornya masuk top-k mereka;
+          kelebihannya dibuang dengan satu query (_trim).
+        - Artikel yang sebelumnya punya salah satu artikel ini sebagai tetangga
+          dihitung ulang (refill) supaya tetap punya k tetangga.
+    """
+    article_ids = set(article_ids)
+    if not article_ids:
+        return
+    vocabulary = SimilarityVocabulary.objects.first()
+    if vocabulary is None:
+        rebuild()
+        return
+    k = _top_k()
+    documents = {
+        pk: document
+        for pk, *document in Article.objects.filter(pk__in=article_ids, status='published')
+        .values_list('pk', 'title', 'excerpt', 'plain_text')
+    }
+
+    with transaction.atomic():
+        holders = set(
+            RelatedArticle.objects.filter(related_id__in=article_ids).values_list('article_id', flat=True)
+        ) - article_ids
+        RelatedArticle.objects.filter(Q(article_id__in=article_ids) | Q(related_id__in=article_ids)).delete()
+        ArticleVector.objects.filter(pk__in=article_ids - set(documents)).delete()
+        if not documents:
+            refill(holders)
+            return
+
+        vectors = {pk: vectorize(_document_tokens(*document), vocabulary.idf) for pk, document in documents.items()}
+        ArticleVector.objects.bulk_create(
+            [ArticleVector(article_id=pk, weights=vector) for pk, vector in vectors.items()],
+            update_conflicts=True, unique_fields=['article'], update_fields=['weights'],
+        )
+        # Own top-k per changed article, and the best changed articles per other article
+        own = {pk: [] for pk in vectors}
+        candidates = {}
+        for other_id, weights in _stored_vectors():
+            for pk, vector in vectors.items():
+                if other_id == pk:
+                    continue
+                score = dot(vector, weights)
+                if score <= 0:
+                    continue
+                for heap, item in ((own[pk], (score, other_id)), (candidates.setdefault(other_id, []), (score, pk))):
+                    if len(heap) < k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+
+        rows = [
+            RelatedArticle(article_id=pk, related_id=other_id, score=score)
+            for pk, heap in own.items()
+            for score, other_id in heap
+        ]
+        current = {
+            entry['article_id']: entry
+            for entry in RelatedArticle.objects.values('article_id').annotate(total=Count('id'), lowest=Min('score')).order_by()
+        }
+        joined = set()
+        for other_id, heap in candidates.items():
+            # Holders are recomputed by refill below, changed articles already have their list
+            if other_id in article_ids or other_id in holders:
+                continue
+            entry = current.get(other_id)
+            for score, pk in heap:
+                if entry is None or entry['total'] < k or score > entry['lowest']:
+                    rows.append(RelatedArticle(article_id=other_id, related_id=pk, score=score))
+                    joined.add(other_id)
+        RelatedArticle.objects.bulk_create(rows, batch_size=1000)
+        if joined:
+            _trim(joined, k)
+        refill(holders)
@@ -1,3 +1,551 @@
-from django.test import TestCase
+import base64
+import json
+import threading
+import tracemalloc
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import facets, pagination, similarity, view_counter
+from .models import Article, ArticleHourlyViews, Category, RelatedArticle
+from .rendering import render_artifacts, sanitize_html
+from .views import SITE_FREEZE_ENVIRON, ArticleListView
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def run_threads(count, target):
+    errors = []
+
+    def run(index):
+        try:
+            target(index)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class ViewCounterTests(TransactionTestCase):
+    """
+    Concurrent views must all end up in view_count and the trending buckets
+    """
+    THREADS = 8
+    VIEWS_PER_THREAD = 40
+
+    def setUp(self):
+        cache.clear()
+        # Views left over from other tests, in this thread and in the process buffer
+        if hasattr(view_counter._request, 'views'):
+            del view_counter._request.views
+        with view_counter._local_lock:
+            view_counter._local_views.clear()
+        author = User.objects.create(username='writer')
+        self.articles = [
+            Article.objects.create(title=f'Artikel {i}', author=author, excerpt='x', content='x', status='published')
+            for i in range(3)
+        ]
+
+    def assertViews(self, article, expected):
+        article.refresh_from_db()
+        self.assertEqual(article.view_count, expected)
+        bucketed = ArticleHourlyViews.objects.filter(article=article).aggregate(total=Sum('views'))['total']
+        self.assertEqual(bucketed or 0, expected)
+
+    @override_settings(ARTICLE_VIEW_COUNT_BUFFER=False, ARTICLE_VIEW_COUNT_FLUSH_INTERVAL=3600)
+    def test_concurrent_requests_without_buffer(self):
+        article = self.articles[0]
+        total = self.THREADS * self.VIEWS_PER_THREAD
+
+        def request(index):
+            for _ in range(self.VIEWS_PER_THREAD):
+                view_counter.record_view(article.pk)
+                view_counter.flush_if_due()
+
+        self.assertEqual(run_threads(self.THREADS, request), [])
+        # Kept in the process until the interval is over
+        self.assertViews(article, 0)
+        self.assertEqual(view_counter.pending_views(article.pk), total)
+        self.assertEqual(view_counter.flush_local(), total)
+        self.assertViews(article, total)
+
+    @override_settings(ARTICLE_VIEW_COUNT_BUFFER=False, ARTICLE_VIEW_COUNT_FLUSH_INTERVAL=3600)
+    def test_views_within_the_flush_interval_run_no_queries(self):
+        view_counter.flush_local()
+        with self.assertNumQueries(0):
+            for article in self.articles * 10:
+                view_counter.record_view(article.pk)
+                view_counter.flush_if_due()
+        with override_settings(ARTICLE_VIEW_COUNT_FLUSH_INTERVAL=0):
+            view_counter.record_view(self.articles[0].pk)
+            view_counter.flush_if_due()
+        self.assertViews(self.articles[0], 11)
+        self.assertViews(self.articles[1], 10)
+
+    @override_settings(ARTICLE_VIEW_COUNT_BUFFER=True, CACHES=LOCAL_CACHE)
+    def test_concurrent_views_and_flushes_with_buffer(self):
+        cache.clear()
+        first, second = self.articles[0], self.articles[1]
+
+        def request(index):
+            for _ in range(self.VIEWS_PER_THREAD):
+                view_counter.record_view(first.pk if index % 2 else second.pk)
+                if index == 0:
+                    # Flushes racing with record_view must not lose or double count views
+                    view_counter.flush()
+
+        self.assertEqual(run_threads(self.THREADS, request), [])
+        view_counter.flush()
+        half = self.THREADS // 2 * self.VIEWS_PER_THREAD
+        self.assertViews(first, half)
+        self.assertViews(second, half)
+        self.assertViews(self.articles[2], 0)
+        self.assertEqual(view_counter.pending_views(first.pk), 0)
+
+    @override_settings(ARTICLE_VIEW_COUNT_BUFFER=True, CACHES=LOCAL_CACHE)
+    def test_flush_reads_only_dirty_articles(self):
+        cache.clear()
+        view_counter.record_view(self.articles[1].pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(view_counter.flush(), 1)
+        self.assertFalse([q['sql'] for q in queries if q['sql'].startswith('SELECT')])
+        # Nothing left in the dirty log: a second flush does no database work
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(view_counter.flush(), 0)
+        self.assertEqual(len(queries), 0)
+        self.assertViews(self.articles[1], 1)
+
+
+@override_settings(ARTICLE_RELATED_TOP_K=2, ARTICLE_RELATED_UPDATE_ON_SAVE=False)
+class RelatedArticlesTests(TransactionTestCase):
+    TOPICS = {
+        'robot': 'robot sensor motor arduino',
+        'jaringan': 'jaringan router protokol internet',
+        'daya': 'listrik daya transformator generator',
+    }
+
+    def setUp(self):
+        author = User.objects.create(username='writer')
+        self.articles = {
+            f'{topic}-{i}': Article.objects.create(
+                title=f'{topic} {i}', author=author, excerpt=words, content=f'{words} catatan{i}', status='published',
+            )
+            for topic, words in self.TOPICS.items()
+            for i in range(3)
+        }
+        similarity.rebuild()
+
+    def related(self, key):
+        return set(
+            RelatedArticle.objects.filter(article=self.articles[key])
+            .values_list('related__slug', flat=True)
+        )
+
+    def test_update_scores_only_the_saved_article(self):
+        article = self.articles['daya-0']
+        article.excerpt = article.content = self.TOPICS['robot']
+        article.save()
+        with CaptureQueriesContext(connection) as queries:
+            similarity.update_for_article(article.pk)
+        # Stored vectors are reused: only the saved article itself is read from article_article
+        corpus_reads = [
+            q['sql'] for q in queries
+            if '"article_article"."plain_text"' in q['sql']
+            and '"article_article"."id" =' not in q['sql'] and '"article_article"."id" IN' not in q['sql']
+        ]
+        self.assertEqual(corpus_reads, [])
+        self.assertEqual(len(self.related('daya-0')), 2)
+        self.assertLessEqual(self.related('daya-0'), {'robot-0', 'robot-1', 'robot-2'})
+        for key in self.articles:
+            self.assertLessEqual(len(self.related(key)), 2)
+
+    def test_lists_that_lose_an_article_are_refilled(self):
+        holders = similarity.lists_containing(self.articles['jaringan-0'].pk)
+        self.assertTrue(holders)
+        self.articles['jaringan-0'].status = 'draft'
+        self.articles['jaringan-0'].save()
+        similarity.update_for_article(self.articles['jaringan-0'].pk)
+        self.assertEqual(self.related('jaringan-0'), set())
+        for pk in holders:
+            self.assertEqual(RelatedArticle.objects.filter(article_id=pk).count(), 2)
+            self.assertFalse(RelatedArticle.objects.filter(article_id=pk, related=self.articles['jaringan-0']).exists())
+
+    @override_settings(ARTICLE_RELATED_UPDATE_ON_SAVE=True)
+    def test_admin_publish_actions_update_the_index(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'x'))
+        keys = ['jaringan-0', 'jaringan-1']
+        changed = [self.articles[key] for key in keys]
+        holders = set().union(*(similarity.lists_containing(article.pk) for article in changed)) - {a.pk for a in changed}
+        self.assertTrue(holders)
+
+        def run(action):
+            response = self.client.post(
+                reverse('admin:article_article_changelist'),
+                {'action': action, '_selected_action': [article.pk for article in changed]},
+            )
+            self.assertEqual(response.status_code, 302)
+
+        run('unpublish')
+        for key, article in zip(keys, changed):
+            self.assertEqual(self.related(key), set())
+            self.assertFalse(RelatedArticle.objects.filter(related=article).exists())
+        for pk in holders:
+            self.assertEqual(RelatedArticle.objects.filter(article_id=pk).count(), 2)
+
+        run('publish')
+        self.assertEqual(self.related('jaringan-0'), {'jaringan-1', 'jaringan-2'})
+        self.assertIn('jaringan-0', self.related('jaringan-2'))
+
+
+@override_settings(CACHES=LOCAL_CACHE, ARTICLE_RELATED_UPDATE_ON_SAVE=False)
+class FacetCountTests(TestCase):
+    """
+    The cached counts kept up to date by the signals match a fresh aggregate
+    after every kind of change
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create(username='writer')
+        self.categories = [Category.objects.create(name=f'Kategori {i}', slug=f'kategori-{i}') for i in range(3)]
+        self.articles = []
+        for i in range(6):
+            article = Article.objects.create(
+                title=f'Artikel {i}', author=self.author, excerpt='x', content='x',
+                status='published' if i % 3 else 'draft',
+            )
+            article.categories.set(self.categories[:i % 3 + 1])
+            self.articles.append(article)
+        self.category_ids = [category.pk for category in self.categories]
+        facets.published_counts(self.category_ids)
+
+    def assertCountsMatch(self):
+        maintained = {pk: cache.get(facets._key(pk)) for pk in self.category_ids}
+        self.assertNotIn(None, maintained.values(), 'counts were dropped instead of maintained')
+        fresh = facets.count_query(Article.objects.filter(status='published'))
+        self.assertEqual(maintained, {pk: fresh.get(pk, 0) for pk in self.category_ids})
+
+    def test_status_change(self):
+        published, draft = self.articles[1], self.articles[0]
+        published.status = 'draft'
+        published.save()
+        self.assertCountsMatch()
+        draft.status = 'published'
+        draft.save()
+        self.assertCountsMatch()
+        draft.title = 'Judul baru'
+        draft.save(update_fields=['title'])
+        self.assertCountsMatch()
+
+    def test_categories_add_remove_and_clear(self):
+        article, category = self.articles[1], self.categories[2]
+        article.categories.add(category)
+        self.assertCountsMatch()
+        article.categories.remove(self.categories[0])
+        self.assertCountsMatch()
+        article.categories.clear()
+        self.assertCountsMatch()
+        self.articles[0].categories.add(category)  # draft: no change
+        self.assertCountsMatch()
+
+    def test_reverse_categories_add_remove_and_clear(self):
+        category = self.categories[2]
+        category.articles.add(self.articles[0], self.articles[1], self.articles[4])
+        self.assertCountsMatch()
+        category.articles.remove(self.articles[1], self.articles[3])
+        self.assertCountsMatch()
+        category.articles.clear()
+        self.assertCountsMatch()
+
+    def test_delete(self):
+        self.articles[5].delete()
+        self.articles[3].delete()  # draft
+        self.assertCountsMatch()
+
+    def test_admin_bulk_actions_drop_the_counts(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'x'))
+        for action in ('unpublish', 'publish', 'unfeature'):
+            facets.published_counts(self.category_ids)
+            response = self.client.post(
+                reverse('admin:article_article_changelist'),
+                {'action': action, '_selected_action': [article.pk for article in self.articles[:4]]},
+            )
+            self.assertEqual(response.status_code, 302)
+            # Bulk updates send no signals: invalidate_article_caches() drops the counts
+            self.assertEqual(cache.get_many([facets._key(pk) for pk in self.category_ids]), {})
+            fresh = facets.count_query(Article.objects.filter(status='published'))
+            self.assertEqual(
+                facets.published_counts(self.category_ids), {pk: fresh.get(pk, 0) for pk in self.category_ids},
+            )
+
+
+class CursorTests(SimpleTestCase):
+    def token(self, *parts):
+        raw = json.dumps(list(parts)).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def test_round_trip(self):
+        token = pagination.encode_cursor('popular', 12, 7)
+        self.assertEqual(pagination.decode_cursor(token, 'popular'), (12, 7))
+
+    def test_value_type_must_match_the_sort_field(self):
+        invalid = [
+            ('popular', 'banyak', 1),
+            ('popular', [1], 1),
+            ('trending', {'score': 1}, 1),
+            ('trending', True, 1),
+            ('az', 12, 1),
+            ('az', ['a'], 1),
+            ('recent', 12, 1),
+            ('popular', 12, '1'),
+            ('popular', 12, 2 ** 70),
+        ]
+        for sort, value, pk in invalid:
+            with self.subTest(sort=sort, value=value, pk=pk):
+                with self.assertRaises(pagination.InvalidCursor):
+                    pagination.decode_cursor(self.token(sort, value, pk), sort)
+        with self.assertRaises(pagination.InvalidCursor):
+            pagination.decode_cursor(self.token({'a': 1, 'b': 2, 'c': 3}), 'popular')
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class SortOrderTests(TestCase):
+    def test_offset_and_cursor_pages_break_ties_the_same_way(self):
+        author = User.objects.create(username='writer')
+        now = timezone.now()
+        for i in range(8):
+            article = Article.objects.create(
+                title=f'Artikel {i}', author=author, excerpt='x', content='x', status='published',
+                trending_score=2.0 if i % 4 == 0 else 1.0,
+            )
+            # Newer ids get older dates, so created_at and id disagree on ties
+            Article.objects.filter(pk=article.pk).update(created_at=now - timedelta(hours=i))
+
+        offset = []
+        for page in range(1, 4):
+            response = self.client.get(reverse('articles'), {'sort': 'trending', 'page': page})
+            offset += [article.pk for article in response.context['articles']]
+
+        cursor, params = [], {'sort': 'trending', 'pagination': 'cursor'}
+        while True:
+            page = self.client.get(reverse('articles'), params).context['cursor_page']
+            cursor += [article.pk for article in page.object_list]
+            if not page.has_next:
+                break
+            params['cursor'] = page.next_cursor
+
+        self.assertEqual(len(offset), 8)
+        self.assertEqual(offset, cursor)
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class ArticleListQueryCountTests(TestCase):
+    """
+    The article list runs the same number of queries whatever the number of
+    cards: categories, authors and image derivatives are loaded per page
+    """
+
+    def setUp(self):
+        self.author = User.objects.create(username='writer')
+        self.categories = [Category.objects.create(name=f'Kategori {i}', slug=f'kategori-{i}') for i in range(3)]
+
+    def add_articles(self, count):
+        start = Article.objects.count()
+        for i in range(start, start + count):
+            article = Article.objects.create(
+                title=f'Artikel {i}', author=self.author, excerpt='x', content='x', status='published',
+                image=f'https://example.com/artikel-{i}.jpg', is_featured=i == 0,
+            )
+            article.categories.set(self.categories[:i % 3 + 1])
+
+    def cards(self, params, headers=None):
+        # Cold cache, so facet counts and fragment versions are read from the database every time
+        cache.clear()
+        response = self.client.get(reverse('articles'), params, headers=headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return content.count(b'article-card ')
+
+    def assertConstant(self, params, headers=None):
+        self.add_articles(5)
+        with CaptureQueriesContext(connection) as queries:
+            small = self.cards(params, headers)
+        self.add_articles(5)
+        with self.assertNumQueries(len(queries)):
+            self.assertEqual(self.cards(params, headers), small + 5)
+
+    @mock.patch.object(ArticleListView, 'paginate_by', 20)
+    def test_page(self):
+        self.assertConstant({})
+
+    @mock.patch.object(ArticleListView, 'paginate_by', 20)
+    def test_ajax_page(self):
+        self.assertConstant({'sort': 'popular'}, {'x-requested-with': 'XMLHttpRequest'})
+
+    def test_view_all_stream(self):
+        self.assertConstant({'view_all': 'true'})
+
+
+class ViewAllStreamingTests(TestCase):
+    """
+    view_all=true must hold about one chunk of articles in memory, so the
+    peak while streaming stays flat when the archive grows
+    """
+    EXCERPT = 'kata ' * 800  # ~4 KB per article that a buffered response would keep
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='writer')
+
+    def add_articles(self, count):
+        start = Article.objects.count()
+        Article.objects.bulk_create([
+            Article(
+                title=f'Artikel {i}', slug=f'artikel-{i}', author=self.author, status='published',
+                excerpt=self.EXCERPT, content='isi', **render_artifacts('isi', self.EXCERPT),
+            )
+            for i in range(start, start + count)
+        ])
+
+    def peak_memory(self, headers):
+        # The first request warms up template loading, the second is measured
+        for _ in range(2):
+            response = self.client.get(reverse('articles'), {'view_all': 'true'}, headers=headers)
+            self.assertTrue(response.streaming)
+            parts = 0
+            tracemalloc.start()
+            try:
+                for _ in response.streaming_content:
+                    parts += 1
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        return parts, peak
+
+    def assertMemoryCeiling(self, headers):
+        self.add_articles(500)
+        small_parts, small_peak = self.peak_memory(headers)
+        self.add_articles(1500)
+        parts, peak = self.peak_memory(headers)
+
+        self.assertGreater(parts, small_parts)
+        # Buffering would need the whole archive (2000 x 4 KB) and grow 4x
+        self.assertLess(peak, 2000 * len(self.EXCERPT) / 2)
+        self.assertLess(peak, small_peak * 2)
+
+    def test_ndjson_stream_memory_ceiling(self):
+        self.assertMemoryCeiling({'x-requested-with': 'XMLHttpRequest'})
+
+    def test_html_stream_memory_ceiling(self):
+        self.assertMemoryCeiling({})
+
+
+@override_settings(CACHES=LOCAL_CACHE, ARTICLE_VIEW_COUNT_BUFFER=False)
+class ArticleListValidatorTests(TestCase):
+    """
+    The list ETag comes from the fragment cache version, so a revalidation
+    answers 304 without querying the articles
+    """
+
+    def setUp(self):
+        cache.clear()
+        author = User.objects.create(username='writer')
+        self.article = Article.objects.create(
+            title='Artikel', author=author, excerpt='x', content='x', status='published',
+        )
+
+    def etag(self, **params):
+        return self.client.get(reverse('articles'), params)['ETag']
+
+    def test_revalidation_runs_no_queries(self):
+        etag = self.etag()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('articles'), headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_view_flush_changes_only_the_popular_etag(self):
+        recent, popular = self.etag(sort='recent'), self.etag(sort='popular')
+        view_counter.record_view(self.article.pk)
+        view_counter.flush_if_due()
+        view_counter.flush_local()
+        self.assertEqual(self.etag(sort='recent'), recent)
+        self.assertNotEqual(self.etag(sort='popular'), popular)
+
+    def test_article_save_changes_the_etag(self):
+        etag = self.etag()
+        self.article.title = 'Judul baru'
+        self.article.save()
+        self.assertNotEqual(self.etag(), etag)
+
+
+@override_settings(CACHES=LOCAL_CACHE, ARTICLE_VIEW_COUNT_BUFFER=False)
+class SiteFreezeViewTests(TestCase):
+    def test_only_the_freeze_client_skips_the_view_count(self):
+        article = Article.objects.create(
+            title='Artikel', author=User.objects.create(username='writer'), excerpt='x', content='x', status='published',
+        )
+        url = article.get_absolute_url()
+        self.client.get(url, headers={'X-Site-Freeze': '1'})
+        self.client.get(url, **{SITE_FREEZE_ENVIRON: True})
+        view_counter.flush_local()
+        article.refresh_from_db()
+        self.assertEqual(article.view_count, 1)
+
+
+@override_settings(CACHES=LOCAL_CACHE, ARTICLE_VIEW_COUNT_BUFFER=False, ARTICLE_VIEW_COUNT_FLUSH_INTERVAL=0)
+class ArticleDetailValidatorTests(TestCase):
+    def setUp(self):
+        self.article = Article.objects.create(
+            title='Artikel', author=User.objects.create(username='writer'), excerpt='x', content='x', status='published',
+        )
+        self.url = self.article.get_absolute_url()
+
+    def test_flushed_views_do_not_change_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.view_count, 1)
+        response = self.client.get(self.url, headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_content_change_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.article.content = 'Isi baru'
+        self.article.save()
+        response = self.client.get(self.url, headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 200)
+
+
+class SanitizeUrlTests(SimpleTestCase):
+    def test_control_characters_cannot_hide_the_scheme(self):
+        hrefs = [
+            'java\tscript:alert(1)',
+            'java\nscript:alert(1)',
+            'jav&#x09;ascript:alert(1)',
+            '\x01javascript:alert(1)',
+            ' \x00 javascript:alert(1)',
+            'javascript\x0b:alert(1)',
+            ' javascript:alert(1)',
+        ]
+        for href in hrefs:
+            with self.subTest(href=href):
+                html, _, _ = sanitize_html(f'<a href="{href}">x</a>')
+                self.assertNotIn('href', html)
+
+    def test_safe_urls_are_kept(self):
+        html, _, _ = sanitize_html('<a href=" https://example.com/a b ">x</a><img src="/media/a.jpg">')
+        self.assertIn('href="https://example.com/a b"', html)
+        self.assertIn('src="/media/a.jpg"', html)
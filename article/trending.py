@@ -0,0 +1,147 @@
+"""
+Skor trending artikel dari view yang dikelompokkan per jam dan per hari.
+
+- Flush view_counter menambahkan view ke bucket jam berjalan
+  (ArticleHourlyViews), jadi halaman detail tetap hanya menulis ke cache.
+- rollup() (manage.py rollup_trending, dijalankan berkala) menggabungkan
+  bucket jam yang lebih tua dari ARTICLE_TRENDING_HOURLY_RETENTION jam ke
+  bucket harian, menghapus bucket harian di luar ARTICLE_TRENDING_WINDOW_DAYS,
+  lalu menghitung skor:
+
+      trending_score = sum(views * 0.5 ** (umur_jam / half_life))
+
+  dan menyimpannya di kolom Article.trending_score yang ber-index, sehingga
+  sort=trending dan blok trending di homepage cukup ORDER BY kolom tersebut.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Article, ArticleDailyViews, ArticleHourlyViews
+
+
+def _half_life_hours():
+    return getattr(settings, 'ARTICLE_TRENDING_HALF_LIFE_HOURS', 24)
+
+
+def _hourly_retention():
+    return getattr(settings, 'ARTICLE_TRENDING_HOURLY_RETENTION', 48)
+
+
+def _window_days():
+    return getattr(settings, 'ARTICLE_TRENDING_WINDOW_DAYS', 14)
+
+
+def _add_views(model, bucket, deltas):
+    """
+    Menambah view ke bucket yang sama untuk banyak artikel
+    Args:
+        model: ArticleHourlyViews atau ArticleDailyViews
+        bucket (datetime | date): awal bucket
+        deltas (dict): article_id -> jumlah view
+    """
+    # Missing rows are inserted empty first, so two writers adding to the same
+    # new bucket both end up in the UPDATE below instead of colliding on insert
+    model.objects.bulk_create(
+        [model(article_id=article_id, bucket=bucket, views=0) for article_id in deltas],
+        ignore_conflicts=True,
+    )
+    # Group by delta so each distinct increment is a single UPDATE
+    ids_by_delta = defaultdict(list)
+    for article_id, delta in deltas.items():
+        ids_by_delta[delta].append(article_id)
+    for delta, ids in ids_by_delta.items():
+        model.objects.filter(bucket=bucket, article_id__in=ids).update(views=F('views') + delta)
+
+
+def record_views(deltas, now=None):
+    """
+    Menambah view hasil flush ke bucket jam berjalan
+    Args:
+        deltas (dict): article_id -> jumlah view
+    Notes:
+        - Dipanggil di dalam transaksi flush view_counter. Penulis yang
+          bersamaan aman: bucket baru dibuat dengan ignore_conflicts lalu
+          ditambah dengan UPDATE F().
+    """
+    now = now or timezone.now()
+    _add_views(ArticleHourlyViews, now.replace(minute=0, second=0, microsecond=0), deltas)
+
+
+def compact(now):
+    """
+    Menggabungkan bucket jam yang sudah lewat masa simpan ke bucket harian
+    Returns:
+        int: jumlah baris bucket jam yang digabung
+    """
+    cutoff = (now - timedelta(hours=_hourly_retention())).replace(minute=0, second=0, microsecond=0)
+    old = ArticleHourlyViews.objects.filter(bucket__lt=cutoff)
+    by_day = defaultdict(dict)
+    rows = (
+        old.annotate(day=TruncDate('bucket'))
+        .values('day', 'article_id')
+        .annotate(total=Sum('views'))
+        .order_by()
+    )
+    for row in rows:
+        by_day[row['day']][row['article_id']] = row['total']
+    for day, deltas in by_day.items():
+        _add_views(ArticleDailyViews, day, deltas)
+    compacted, _ = old.delete()
+    return compacted
+
+
+def scores(now):
+    """
+    Skor trending per artikel dari bucket jam dan bucket harian
+    Returns:
+        dict: article_id -> skor
+    """
+    half_life = _half_life_hours()
+    result = defaultdict(float)
+
+    def add(article_id, views, start, hours):
+        # Age is taken from the middle of the bucket
+        age = max((now - start).total_seconds() / 3600 - hours / 2, 0)
+        result[article_id] += views * 0.5 ** (age / half_life)
+
+    hourly = ArticleHourlyViews.objects.values_list('article_id', 'bucket', 'views')
+    for article_id, bucket, views in hourly.iterator(chunk_size=2000):
+        add(article_id, views, bucket, 1)
+
+    tz = timezone.get_current_timezone()
+    daily = ArticleDailyViews.objects.values_list('article_id', 'bucket', 'views')
+    for article_id, bucket, views in daily.iterator(chunk_size=2000):
+        add(article_id, views, timezone.make_aware(datetime.combine(bucket, time.min), tz), 24)
+    return result
+
+
+def rollup(now=None, batch_size=500):
+    """
+    Menjalankan satu putaran rollup dan menulis trending_score
+    Returns:
+        dict: jumlah bucket yang digabung/dihapus dan artikel yang diberi skor
+    Notes:
+        - trending_score ditulis dengan bulk_update/update(), jadi updated_at
+          tidak berubah. Cache yang membaca skor di-invalidate oleh pemanggil.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        compacted = compact(now)
+        window_start = timezone.localdate(now) - timedelta(days=_window_days())
+        pruned, _ = ArticleDailyViews.objects.filter(bucket__lt=window_start).delete()
+
+        new_scores = scores(now)
+        # Articles without recent views drop to zero, the rest are overwritten below
+        Article.objects.filter(trending_score__gt=0).update(trending_score=0)
+        articles = [
+            Article(pk=article_id, trending_score=round(score, 4))
+            for article_id, score in new_scores.items()
+        ]
+        Article.objects.bulk_update(articles, ['trending_score'], batch_size=batch_size)
+    return {'compacted': compacted, 'pruned': pruned, 'scored': len(articles)}
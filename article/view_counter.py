@@ -0,0 +1,274 @@
+"""
+Write-behind counter untuk view_count artikel.
+
+Setiap kunjungan ke halaman detail hanya menambah counter di cache, lalu
+counter-counter tersebut di-flush secara berkala ke database dalam batch
+menggunakan UPDATE atomik dengan F(). Dengan begitu updated_at tidak ikut
+berubah dan tidak ada increment yang hilang ketika ada request paralel.
+Flush yang sama menambahkan view ke bucket per jam untuk skor trending
+(article/trending.py).
+
+Flush dijalankan setelah respons selesai dikirim (signal request_finished),
+bukan di dalam view, sehingga halaman detail tidak pernah menunggu query tulis.
+
+- Buffer cache hanya dipakai jika ARTICLE_VIEW_COUNT_BUFFER aktif, yaitu saat
+  cache bersama dengan incr/decr atomik (Redis) tersedia. Tanpa itu (cache
+  database, incr tidak atomik) view dikumpulkan di memori proses dan ditulis
+  paling sering sekali per interval oleh proses tersebut. View yang belum
+  di-flush hilang jika proses berhenti sebelum interval berikutnya; batasnya
+  satu interval view per proses.
+- Id artikel yang counter-nya berubah dari 0 dicatat di log dirty
+  (KEY_PREFIX:dirty:<n>), sehingga flush hanya membaca artikel yang memang
+  punya view, bukan seluruh tabel.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .models import Article
+from . import fragment_cache, trending
+
+KEY_PREFIX = 'article:views'
+FLUSH_LOCK_KEY = f'{KEY_PREFIX}:flush-lock'
+DIRTY_SEQ_KEY = f'{KEY_PREFIX}:dirty-seq'
+DIRTY_CURSOR_KEY = f'{KEY_PREFIX}:dirty-cursor'
+DIRTY_GAP_KEY = f'{KEY_PREFIX}:dirty-gap'
+# Held while a flush runs, so a flush_view_counts run and a request flush never
+# decrement the same counters twice
+FLUSH_RUNNING_KEY = f'{KEY_PREFIX}:flush-running'
+FLUSH_RUNNING_TIMEOUT = 300
+
+# Views recorded by the current request, read by flush_if_due()
+_request = Local()
+
+# Views of this process waiting for the next interval flush, without buffering
+_local_lock = threading.Lock()
+_local_views = Counter()
+_local_flushed_at = time.monotonic()
+
+
+def _counter_key(article_id):
+    return f'{KEY_PREFIX}:{article_id}'
+
+
+def _dirty_key(seq):
+    return f'{KEY_PREFIX}:dirty:{seq}'
+
+
+def _flush_interval():
+    return getattr(settings, 'ARTICLE_VIEW_COUNT_FLUSH_INTERVAL', 60)
+
+
+def buffering():
+    return getattr(settings, 'ARTICLE_VIEW_COUNT_BUFFER', False)
+
+
+def _incr(key, delta=1):
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Key sempat di-evict di antara add() dan incr()
+        cache.set(key, delta, timeout=None)
+        return delta
+
+
+def _mark_dirty(article_id):
+    """
+    Mencatat id artikel di log dirty supaya dibaca oleh flush berikutnya
+    """
+    cache.set(_dirty_key(_incr(DIRTY_SEQ_KEY)), article_id, timeout=None)
+
+
+def record_view(article_id):
+    """
+    Menambah satu view untuk artikel tanpa menulis ke database
+    Args:
+        article_id (int): id artikel yang dilihat
+    Notes:
+        - Counter disimpan di cache dan ditambah dengan cache.incr yang atomik.
+          Increment pertama setelah counter kosong mencatat id di log dirty.
+        - Flush ke database dijalankan setelah respons selesai (flush_if_due),
+          paling sering sekali per ARTICLE_VIEW_COUNT_FLUSH_INTERVAL detik.
+        - Tanpa buffer, view disimpan di request dan ditulis oleh flush_if_due.
+    """
+    views = getattr(_request, 'views', None)
+    if views is None:
+        views = _request.views = Counter()
+    views[article_id] += 1
+    if buffering() and _incr(_counter_key(article_id)) == 1:
+        _mark_dirty(article_id)
+
+
+def flush_if_due():
+    """
+    Flush jika request ini mencatat view. Dipanggil dari signal request_finished.
+    Notes:
+        - Dengan buffer, hanya request yang mendapat lock interval flush yang
+          menjalankan flush.
+        - Tanpa buffer, view request ini ditambahkan ke buffer proses yang
+          ditulis dengan UPDATE F() setelah interval flush lewat.
+    """
+    views = getattr(_request, 'views', None)
+    if views is None:
+        return
+    del _request.views
+    if not buffering():
+        with _local_lock:
+            _local_views.update(views)
+            due = time.monotonic() - _local_flushed_at >= _flush_interval()
+        if due:
+            flush_local()
+    elif cache.add(FLUSH_LOCK_KEY, 1, timeout=_flush_interval()):
+        flush()
+
+
+def pending_views(article_id):
+    """
+    Mengembalikan jumlah view yang belum di-flush ke database
+    Args:
+        article_id (int): id artikel
+    Returns:
+        int: jumlah view yang masih ada di buffer
+    """
+    if not buffering():
+        with _local_lock:
+            return _local_views[article_id] + getattr(_request, 'views', {}).get(article_id, 0)
+    return cache.get(_counter_key(article_id), 0)
+
+
+def flush_local():
+    """
+    Menulis view yang terkumpul di buffer proses ini (mode tanpa buffer cache)
+    Returns:
+        int: total view yang ditulis ke database
+    """
+    global _local_flushed_at
+    with _local_lock:
+        deltas = dict(_local_views)
+        _local_views.clear()
+        _local_flushed_at = time.monotonic()
+    try:
+        _write(deltas)
+    except Exception:
+        # Put the views back so the next flush can retry them
+        with _local_lock:
+            _local_views.update(deltas)
+        raise
+    return sum(deltas.values())
+
+
+def _dirty_ids(batch_size):
+    """
+    Membaca log dirty dari cursor terakhir
+    Returns:
+        tuple: (set id artikel, cursor lama, nomor urut terakhir yang selesai dibaca)
+    Notes:
+        - Slot yang belum terisi (record_view sudah incr nomor urut tapi belum
+          set id) menahan cursor, jadi slot itu dan sesudahnya dibaca lagi oleh
+          flush berikutnya. Slot yang tetap kosong di flush berikutnya dilewati.
+    """
+    cursor = cache.get(DIRTY_CURSOR_KEY, 0)
+    last = cache.get(DIRTY_SEQ_KEY, 0)
+    found = {}
+    for start in range(cursor + 1, last + 1, batch_size):
+        found.update(cache.get_many([_dirty_key(seq) for seq in range(start, min(start + batch_size, last + 1))]))
+
+    done, gap = cursor, cache.get(DIRTY_GAP_KEY)
+    for seq in range(cursor + 1, last + 1):
+        if _dirty_key(seq) not in found and seq != gap:
+            cache.set(DIRTY_GAP_KEY, seq, timeout=None)
+            break
+        done = seq
+    return set(found.values()), cursor, done
+
+
+def flush(batch_size=500):
+    """
+    Menulis semua view yang masih di buffer ke database
+    Args:
+        batch_size (int): jumlah id artikel yang dibaca dari cache per batch
+    Returns:
+        int: total view yang ditulis ke database
+    Notes:
+        - Hanya artikel di log dirty yang dibaca.
+        - Flush yang sedang berjalan di proses lain membuat flush ini dilewati (0).
+        - Counter dikurangi dengan cache.decr sebesar nilai yang dibaca, jadi
+          increment yang masuk selama flush tetap tersimpan untuk flush berikutnya
+          (artikelnya dicatat lagi di log dirty).
+        - Artikel dengan delta yang sama di-update dengan satu query UPDATE.
+        - Memakai QuerySet.update() sehingga updated_at tidak berubah.
+        - View yang sama ditambahkan ke bucket jam berjalan untuk skor trending.
+    """
+    if not cache.add(FLUSH_RUNNING_KEY, 1, timeout=FLUSH_RUNNING_TIMEOUT):
+        return 0
+    try:
+        article_ids, cursor, done = _dirty_ids(batch_size)
+        cache.set(DIRTY_CURSOR_KEY, done, timeout=None)
+        cache.delete_many([_dirty_key(seq) for seq in range(cursor + 1, done + 1)])
+
+        article_ids = sorted(article_ids)
+        flushed = 0
+        for start in range(0, len(article_ids), batch_size):
+            flushed += _flush_batch(article_ids[start:start + batch_size])
+        return flushed
+    finally:
+        cache.delete(FLUSH_RUNNING_KEY)
+
+
+def _flush_batch(article_ids):
+    keys = {_counter_key(article_id): article_id for article_id in article_ids}
+    counts = cache.get_many(keys.keys())
+
+    deltas = {}
+    for key, count in counts.items():
+        if not count:
+            continue
+        try:
+            remaining = cache.decr(key, count)
+        except ValueError:
+            continue
+        deltas[keys[key]] = count
+        if remaining:
+            # Views recorded since get_many() did not mark the article dirty again
+            _mark_dirty(keys[key])
+
+    try:
+        _write(deltas)
+    except Exception:
+        # Put the views back so the next flush can retry them
+        for article_id, delta in deltas.items():
+            _incr(_counter_key(article_id), delta)
+            _mark_dirty(article_id)
+        raise
+
+    return sum(deltas.values())
+
+
+def _write(deltas):
+    """
+    Menambahkan view ke view_count dan bucket trending dalam satu transaksi
+    Args:
+        deltas (dict): article_id -> jumlah view
+    """
+    deltas = {article_id: delta for article_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    # Group by delta so each distinct increment is a single UPDATE
+    ids_by_delta = defaultdict(list)
+    for article_id, delta in deltas.items():
+        ids_by_delta[delta].append(article_id)
+
+    with transaction.atomic():
+        for delta, ids in ids_by_delta.items():
+            Article.objects.filter(id__in=ids).update(view_count=F('view_count') + delta)
+        trending.record_views(deltas)
+    # Urutan sort=popular berubah tanpa menyentuh updated_at
+    fragment_cache.invalidate_views()
@@ -1,9 +1,33 @@
+import json
+
 from django.views.generic import ListView, DetailView
-from django.db.models import Q
-from django.http import JsonResponse
+from django.core.exceptions import BadRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 from .models import Article, Category
+from . import facets, fragment_cache, pagination, search, view_counter
 from django.template.defaulttags import register
+from ieeesbui import conditional
+from main import images
+
+# WSGI environ key set by the test Client of manage.py freeze_site. It is not
+# an HTTP header (those arrive as HTTP_*), so a visitor cannot send it.
+SITE_FREEZE_ENVIRON = 'ieeesbui.site_freeze'
+
+ARTICLES_STREAM_MARKER = '<!-- articles-stream -->'
+
+def release(articles):
+    """
+    Putuskan referensi siklik artikel <-> hasil prefetch setelah chunk dirender
+    Notes:
+        - Queryset hasil prefetch menyimpan artikel sumbernya (known related
+          objects), jadi tanpa ini satu chunk baru dibebaskan oleh garbage
+          collector siklik dan memori stream tumbuh seiring jumlah artikel.
+    """
+    for article in articles:
+        article.__dict__.pop('_prefetched_objects_cache', None)
+
 
 class ArticleListView(ListView):
     """
@@ -28,11 +52,18 @@ class ArticleListView(ListView):
         - Kategori yang ditampilkan diambil dari model Category.
         - Artikel unggulan diambil dari model Article dengan atribut is_featured=True.
         - Mendukung respons AJAX untuk pembaruan dinamis.
+        - Respons AJAX di-cache per kombinasi parameter (lihat article/fragment_cache.py).
+        - Selain pagination nomor halaman, tersedia keyset pagination (pagination=cursor&cursor=...)
+          untuk sort recent/oldest/popular/az/za.
+        - view_all=true dikirim sebagai streaming response (NDJSON untuk AJAX, HTML chunked untuk page load).
+        - Mendukung conditional GET: ETag/Last-Modified dari max(updated_at) queryset yang
+          difilter, sehingga revisit tanpa perubahan dijawab 304 sebelum query dan render.
     """
     model = Article
     template_name = 'article.html'
     context_object_name = 'articles'
     paginate_by = 3  # Show 3 articles per page
+    stream_chunk_size = 50  # Articles rendered per chunk when view_all=true
     
     def get_paginate_by(self, queryset):
         """
@@ -42,8 +73,23 @@ class ArticleListView(ListView):
         view_all = self.request.GET.get('view_all') == 'true'
         if view_all:
             return None  # Disable pagination
+        if self.is_cursor_mode():
+            return None  # Keyset pagination is applied in get_context_data
         return self.paginate_by
     
+    def is_cursor_mode(self):
+        """
+        Keyset pagination dipakai jika request mengirim pagination=cursor atau cursor,
+        dan sort yang diminta didukung oleh article.pagination
+        """
+        params = self.request.GET
+        wants_cursor = params.get('pagination') == 'cursor' or 'cursor' in params
+        return (
+            wants_cursor
+            and params.get('view_all') != 'true'
+            and pagination.supports_sort(params.get('sort', ''))
+        )
+    
     def get_queryset(self):
         """
         Mengambil daftar artikel berdasarkan filter dan sorting
@@ -57,17 +103,15 @@ class ArticleListView(ListView):
             - Filter dan sorting diterapkan berdasarkan parameter GET dari request.
             - Artikel dapat difilter berdasarkan kategori dan pencarian.
             - Artikel dapat diurutkan berdasarkan tanggal terbaru, tanggal terlama, popularitas, atau abjad (A-Z atau Z-A).
+            - sort=trending memakai trending_score yang ber-index (dihitung oleh manage.py rollup_trending).
+            - Pencarian memakai index full-text (article.search); sort=relevance mengurutkan berdasarkan search_rank.
         """
-        queryset = Article.objects.filter(status='published').order_by('-created_at')
+        queryset = Article.objects.filter(status='published').for_cards().order_by('-created_at')
         
         # Apply search filter
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(content__icontains=search_query) |
-                Q(excerpt__icontains=search_query)
-            )
+            queryset = search.search_queryset(queryset, search_query)
         
         # Apply category filter
         category_filter = self.request.GET.get('category', '')
@@ -75,21 +119,21 @@ class ArticleListView(ListView):
             category_ids = category_filter.split(',')
             queryset = queryset.filter(categories__id__in=category_ids).distinct()
         
-        # Apply sorting
+        # Apply sorting, with the same id tiebreaker as cursor mode (article.pagination)
         sort_by = self.request.GET.get('sort', '')
-        if sort_by == 'recent':
-            queryset = queryset.order_by('-created_at')
-        elif sort_by == 'oldest':
-            queryset = queryset.order_by('created_at')
-        elif sort_by == 'popular':
-            queryset = queryset.order_by('-view_count')
-        elif sort_by == 'az':
-            queryset = queryset.order_by('title')
-        elif sort_by == 'za':
-            queryset = queryset.order_by('-title')
+        if sort_by == 'relevance' and search_query:
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        elif pagination.supports_sort(sort_by):
+            queryset = queryset.order_by(*pagination.ordering(sort_by))
         
         return queryset
     
+    def get_selected_category_objects(self):
+        selected_categories = self.request.GET.get('category', '').split(',') if self.request.GET.get('category') else []
+        if selected_categories and selected_categories[0]:  # Check if not empty string
+            return Category.objects.filter(id__in=selected_categories)
+        return []
+    
     def get_context_data(self, **kwargs):
         """
         get_context_data untuk menambahkan kategori dan artikel unggulan ke konteks
@@ -103,34 +147,205 @@ class ArticleListView(ListView):
             - Kategori yang dipilih ditandai dalam UI.
             - Artikel terkait ditampilkan berdasarkan kategori yang sama.
             - Kategori yang dipilih ditampilkan dalam konteks untuk menandai kategori yang sedang aktif.
+            - Setiap kategori membawa article_count (article/facets.py): dari cache jika tanpa
+              pencarian, atau satu query aggregate yang mengikuti pencarian.
             - Artikel terkait ditampilkan berdasarkan kategori yang sama.
             - Artikel unggulan ditampilkan di bagian atas daftar artikel.
         """
         context = super().get_context_data(**kwargs)
         
-        # Add categories to context
-        context['categories'] = Category.objects.all()
+        # Keyset pagination: no OFFSET and no COUNT(*)
+        if self.is_cursor_mode():
+            try:
+                page = pagination.paginate(
+                    context['articles'],
+                    self.request.GET.get('sort', ''),
+                    self.request.GET.get('cursor', ''),
+                    self.paginate_by,
+                )
+            except pagination.InvalidCursor as exc:
+                raise BadRequest(str(exc))
+            context['articles'] = context['object_list'] = page.object_list
+            context['cursor_page'] = page
+        
+        # Add categories to context, with the number of published articles matching the search
+        context['categories'] = facets.annotate_categories(
+            Category.objects.all(), self.request.GET.get('search', '')
+        )
         
         # Add featured article
-        featured_articles = Article.objects.filter(is_featured=True, status='published').order_by('-created_at')
-        if featured_articles.exists():
-            context['featured_article'] = featured_articles.first()
+        featured_article = Article.objects.filter(is_featured=True, status='published').for_cards().order_by('-created_at').first()
+        if featured_article:
+            context['featured_article'] = featured_article
         
         # Get selected categories for highlighting in the UI
         selected_categories = self.request.GET.get('category', '').split(',') if self.request.GET.get('category') else []
         context['selected_categories'] = selected_categories
         
         # Get category objects for display in active filters
-        if selected_categories and selected_categories[0]:  # Check if not empty string
-            context['selected_category_objects'] = Category.objects.filter(id__in=selected_categories)
-        else:
-            context['selected_category_objects'] = []
+        context['selected_category_objects'] = self.get_selected_category_objects()
         
         # Add view_all parameter to context
         context['view_all'] = self.request.GET.get('view_all') == 'true'
         
+        # Image derivatives of every card on the page in one query (view_all streams per chunk)
+        if not context['view_all']:
+            context['image_derivatives'] = images.lookup_many(article.image for article in context['articles'])
+        
         return context
     
+    def is_ajax(self):
+        return self.request.headers.get('X-Requested-With') == 'XMLHttpRequest' or self.request.GET.get('ajax') == 'true'
+    
+    def get_validators(self):
+        """
+        Validator untuk conditional GET
+        Returns:
+            tuple: (etag, None)
+        Notes:
+            - ETag dibuat dari versi fragment cache (lihat fragment_cache.version)
+              dan parameter yang sudah dinormalisasi, tanpa query ke tabel artikel.
+              Versi itu naik pada setiap perubahan Article, Category, relasi
+              kategori dan rollup trending; untuk sort=popular juga setiap flush
+              view_count.
+            - Parameter yang tidak valid tidak di-cache, jadi ETag-nya memakai
+              query string mentah dan versi global.
+        """
+        normalized = fragment_cache.normalize_params(self.request.GET)
+        etag = conditional.make_etag(
+            'articles',
+            self.is_ajax(),
+            fragment_cache.version(normalized),
+            json.dumps(normalized, sort_keys=True) if normalized else self.request.GET.urlencode(),
+        )
+        return etag, None
+    
+    def get(self, request, *args, **kwargs):
+        """
+        Jawab 304 jika validator cocok, lalu untuk request AJAX coba ambil
+        respons dari fragment cache dulu sebelum menjalankan query dan render
+        partial template. Mode view_all selalu dikirim sebagai streaming response.
+        """
+        etag, last_modified = self.get_validators()
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is None:
+            response = self.get_response(request, *args, **kwargs)
+        # HTML and JSON share the URL: caches must key on X-Requested-With
+        return conditional.add_validators(response, etag, last_modified, vary=('X-Requested-With',))
+    
+    def get_response(self, request, *args, **kwargs):
+        if request.GET.get('view_all') == 'true':
+            return self.stream_response()
+        
+        self.fragment_cache_key = fragment_cache.make_key(request.GET) if self.is_ajax() else None
+        if self.fragment_cache_key:
+            payload = fragment_cache.lookup(self.fragment_cache_key)
+            if payload is not None:
+                response = JsonResponse(payload)
+                response['X-Fragment-Cache'] = 'HIT'
+                return response
+        return super().get(request, *args, **kwargs)
+    
+    def has_search_or_filter(self):
+        return bool(
+            self.request.GET.get('search') or 
+            self.request.GET.get('category') or 
+            self.request.GET.get('sort') or
+            self.request.GET.get('view_all') == 'true'
+        )
+    
+    def iter_article_chunks(self, queryset):
+        """
+        Render kartu artikel per chunk dari queryset.iterator()
+        Args:
+            queryset (QuerySet): artikel yang akan dirender
+        Yields:
+            str: HTML kartu untuk satu chunk
+        Notes:
+            - Hanya satu chunk artikel yang ada di memori pada satu waktu.
+            - Prefetch categories dijalankan per chunk oleh iterator().
+        """
+        chunk = []
+        rendered_any = False
+        self.streamed_count = 0
+        for article in queryset.iterator(chunk_size=self.stream_chunk_size):
+            self.streamed_count += 1
+            chunk.append(article)
+            if len(chunk) >= self.stream_chunk_size:
+                yield self.render_chunk(chunk)
+                rendered_any = True
+                release(chunk)
+                chunk = []
+        if chunk or not rendered_any:
+            # An empty list renders the "No Articles Found" message
+            yield self.render_chunk(chunk)
+    
+    def render_chunk(self, chunk):
+        """
+        Render kartu artikel satu chunk, dengan data image derivative seluruh chunk dari satu query
+        """
+        return render_to_string(
+            'partials/article_list.html',
+            {'articles': chunk, 'image_derivatives': images.lookup_many(article.image for article in chunk)},
+            request=self.request,
+        )
+    
+    def stream_response(self):
+        """
+        Streaming response untuk view_all=true
+        Returns:
+            StreamingHttpResponse: NDJSON untuk AJAX, HTML chunked untuk page load biasa
+        Notes:
+            - NDJSON: baris pertama bertipe "meta" (active filters), lalu baris "articles"
+              per chunk, dan baris terakhir bertipe "end" berisi total artikel.
+            - HTML: template article.html dirender dengan penanda di #articlesContainer,
+              lalu kartu artikel dikirim per chunk di posisi penanda tersebut.
+        """
+        self.object_list = self.get_queryset()
+        
+        if self.is_ajax():
+            selected_category_objects = self.get_selected_category_objects()
+            
+            def ndjson():
+                active_filters_html = render_to_string(
+                    'partials/active_filters.html',
+                    {
+                        'request': self.request,
+                        'selected_category_objects': selected_category_objects,
+                        'view_all': True,
+                    },
+                    request=self.request
+                )
+                yield json.dumps({
+                    'type': 'meta',
+                    'active_filters_html': active_filters_html,
+                    'pagination_html': '',
+                    'has_search_or_filter': True,
+                    'view_all': True,
+                }) + '\n'
+                for articles_html in self.iter_article_chunks(self.object_list):
+                    yield json.dumps({'type': 'articles', 'articles_html': articles_html}) + '\n'
+                yield json.dumps({'type': 'end', 'total_articles': self.streamed_count}) + '\n'
+            
+            response = StreamingHttpResponse(ndjson(), content_type='application/x-ndjson')
+        else:
+            context = self.get_context_data()
+            context['has_search_or_filter'] = True
+            context['articles_stream_marker'] = mark_safe(ARTICLES_STREAM_MARKER)
+            page = render_to_string(self.template_name, context, request=self.request)
+            head, tail = page.split(ARTICLES_STREAM_MARKER, 1)
+            
+            def html():
+                yield head
+                yield from self.iter_article_chunks(self.object_list)
+                yield tail
+            
+            response = StreamingHttpResponse(html(), content_type='text/html; charset=utf-8')
+        
+        # Ask reverse proxies not to buffer the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    
     def render_to_response(self, context, **response_kwargs):
         """
         Override render_to_response to handle AJAX requests
@@ -140,21 +355,18 @@ class ArticleListView(ListView):
         Returns:
             HttpResponse or JsonResponse: Rendered template or JSON data
         """
-        is_ajax_request = self.request.headers.get('X-Requested-With') == 'XMLHttpRequest' or self.request.GET.get('ajax') == 'true'
-        
-        if is_ajax_request:
+        if self.is_ajax():
             # Determine if there's any search or filter applied
-            has_search_or_filter = bool(
-                self.request.GET.get('search') or 
-                self.request.GET.get('category') or 
-                self.request.GET.get('sort') or
-                self.request.GET.get('view_all') == 'true'
-            )
+            has_search_or_filter = self.has_search_or_filter()
             
             # Render partial templates to strings
             articles_html = render_to_string(
                 'partials/article_list.html',
-                {'articles': context['articles'], 'page_obj': context.get('page_obj')},
+                {
+                    'articles': context['articles'],
+                    'page_obj': context.get('page_obj'),
+                    'image_derivatives': context.get('image_derivatives'),
+                },
                 request=self.request
             )
             
@@ -168,8 +380,8 @@ class ArticleListView(ListView):
                 request=self.request
             )
             
-             # Only render pagination if not in view_all mode
-            if self.request.GET.get('view_all') == 'true':
+             # Only render pagination if not in view_all or cursor mode
+            if self.request.GET.get('view_all') == 'true' or 'cursor_page' in context:
                 pagination_html = ''
             else:
                 pagination_html = render_to_string(
@@ -183,8 +395,7 @@ class ArticleListView(ListView):
                     request=self.request
                 )
             
-            # Return JSON response
-            return JsonResponse({
+            payload = {
                 'articles_html': articles_html,
                 'active_filters_html': active_filters_html,
                 'pagination_html': pagination_html,
@@ -192,43 +403,94 @@ class ArticleListView(ListView):
                 'total_articles': context.get('paginator').count if context.get('paginator') else len(context['articles']),
                 'current_page': context.get('page_obj').number if context.get('page_obj') else 1,
                 'total_pages': context.get('paginator').num_pages if context.get('paginator') else 1,
-                'view_all': self.request.GET.get('view_all') == 'true'
-            })
+                'view_all': self.request.GET.get('view_all') == 'true',
+                'pagination_mode': 'offset',
+                'category_counts': {category.pk: category.article_count for category in context['categories']},
+            }
+            if 'cursor_page' in context:
+                # Cursor mode never counts the full result set
+                payload.update({
+                    'pagination_mode': 'cursor',
+                    'next_cursor': context['cursor_page'].next_cursor,
+                    'has_next': context['cursor_page'].has_next,
+                    'total_articles': None,
+                    'current_page': None,
+                    'total_pages': None,
+                })
+            if self.fragment_cache_key:
+                fragment_cache.store(self.fragment_cache_key, payload)
+            
+            # Return JSON response
+            response = JsonResponse(payload)
+            if self.fragment_cache_key:
+                response['X-Fragment-Cache'] = 'MISS'
+            return response
         
         # For non-AJAX requests, check if we need to set an initial state for the featured article
         # This ensures the featured article is hidden on initial page load if there's a search query
-        context['has_search_or_filter'] = bool(
-            self.request.GET.get('search') or 
-            self.request.GET.get('category') or 
-            self.request.GET.get('sort') or
-            self.request.GET.get('view_all') == 'true'
-        )
+        context['has_search_or_filter'] = self.has_search_or_filter()
         
         # Regular response for non-AJAX requests
         return super().render_to_response(context, **response_kwargs)
 
 
 class ArticleDetailView(DetailView):
+    """
+    view untuk menampilkan detail artikel
+    Notes:
+        - view_count tidak langsung ditulis ke database, tapi dicatat lewat
+          view_counter dan di-flush secara berkala.
+        - Artikel hanya diambil sekali per request (self.object).
+        - Artikel terkait dibaca dari index RelatedArticle (article/similarity.py),
+          dengan fallback ke artikel berkategori sama jika index belum ada.
+        - ETag/Last-Modified dari pk, updated_at dan hasil render konten (bukan
+          view_count); view tetap dicatat walaupun responsnya 304.
+    """
     model = Article
     template_name = 'article_detail.html'
     context_object_name = 'article'
     slug_url_kwarg = 'slug'
     
-    def get_object(self):
-        obj = super().get_object()
-        # Increment view count
-        obj.view_count += 1
-        obj.save()
-        return obj
+    def get_queryset(self):
+        # The page shows content_html; raw content, plain text and the search vector are not needed
+        return Article.objects.select_related('author').defer('content', 'plain_text', 'search_vector')
+    
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        # Record the view in the write-behind counter instead of saving the row.
+        # Static exports (manage.py freeze_site) are not visits.
+        if not request.META.get(SITE_FREEZE_ENVIRON):
+            view_counter.record_view(self.object.pk)
+        
+        # Content fields only: with view_count in the ETag every flushed view
+        # would turn the next revalidation into a full render. A 304 may show
+        # a view count that is behind by the views since the browser's copy.
+        last_modified = self.object.updated_at
+        etag = conditional.make_etag(
+            'article', self.object.pk, last_modified, self.object.content_html, self.object.toc,
+        )
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is None:
+            self.object.view_count += view_counter.pending_views(self.object.pk)
+            context = self.get_context_data(object=self.object)
+            response = self.render_to_response(context)
+        return conditional.add_validators(response, etag, last_modified)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Add related articles
-        article = self.get_object()
-        related_articles = Article.objects.filter(
-            categories__in=article.categories.all(),
-            status='published'
-        ).exclude(id=article.id).distinct()[:3]
+        article = self.object
+        related_articles = list(
+            Article.objects.filter(related_to_entries__article=article, status='published')
+            .for_cards()
+            .order_by('-related_to_entries__score')[:3]
+        )
+        if not related_articles:
+            # Article not in the similarity index yet: fall back to category overlap
+            related_articles = Article.objects.filter(
+                categories__in=article.categories.all(),
+                status='published'
+            ).exclude(id=article.id).distinct().for_cards()[:3]
         context['related_articles'] = related_articles
         return context
 
@@ -1,34 +1,18 @@
 from django.shortcuts import render
 from django.views.generic import ListView, DetailView
 from article.models import Article, Category
+from article.views import ArticleDetailView as BaseArticleDetailView
 from django.template.defaulttags import register
 
 # def show_article_details(request):
     # return render(request, 'articleDetails.html')
 
-class ArticleDetailView(DetailView):
-    model = Article
+class ArticleDetailView(BaseArticleDetailView):
+    """
+    Detail artikel dengan template articleDetails.html.
+    Pencatatan view dan artikel terkait memakai implementasi di article.views.
+    """
     template_name = 'articleDetails.html'
-    context_object_name = 'article'
-    slug_url_kwarg = 'slug'
-    
-    def get_object(self):
-        obj = super().get_object()
-        # Increment view count
-        obj.view_count += 1
-        obj.save()
-        return obj
-    
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        # Add related articles
-        article = self.get_object()
-        related_articles = Article.objects.filter(
-            categories__in=article.categories.all(),
-            status='published'
-        ).exclude(id=article.id).distinct()[:3]
-        context['related_articles'] = related_articles
-        return context
 
 # Custom template filter for URL parameters
 @register.simple_tag
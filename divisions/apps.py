@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class DivisionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'divisions' 
\ No newline at end of file
+    name = 'divisions'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Activity, Division, Leader, Project
+from .views import invalidate_divisions_page
+
+
+@receiver(post_save, sender=Division)
+@receiver(post_delete, sender=Division)
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Leader)
+@receiver(post_delete, sender=Leader)
+def invalidate_divisions_cache(sender, **kwargs):
+    invalidate_divisions_page()
@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import Activity, Division, Leader, Project
+from .views import DIVISIONS_VERSION_KEY, grouped_divisions
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class DivisionsPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def add_divisions(self, count):
+        start = Division.objects.count()
+        for i in range(start, start + count):
+            division = Division.objects.create(
+                id_name=f'divisi-{i}', name=f'Divisi {i}', icon_class='fa', color='#000', description='-',
+            )
+            for j in range(2):
+                Activity.objects.create(division=division, description=f'Kegiatan {j}')
+                Project.objects.create(division=division, title=f'Proyek {j}', description='-')
+                Leader.objects.create(division=division, name=f'Ketua {j}', position='Ketua')
+
+    def test_grouped_divisions_query_count_is_constant(self):
+        for count in (3, 9):
+            self.add_divisions(count)
+            with self.assertNumQueries(4):
+                divisions = list(grouped_divisions())
+                children = sum(
+                    len(d.activity_list) + len(d.project_list) + len(d.leader_list) for d in divisions
+                )
+            self.assertEqual(children, Division.objects.count() * 6)
+
+    def test_page_query_count_does_not_grow_with_divisions(self):
+        self.add_divisions(3)
+        with self.assertNumQueries(0):
+            small = self.client.get(reverse('divisions:divisions_page'))
+        self.add_divisions(9)  # the signals drop the cached page
+        with self.assertNumQueries(0):
+            large = self.client.get(reverse('divisions:divisions_page'))
+        # The page markup is hand-written: admin rows do not change it
+        self.assertEqual(small.content, large.content)
+
+    def test_edit_after_version_eviction_is_not_served_stale(self):
+        self.client.get(reverse('divisions:divisions_page'))
+        version = cache.get(DIVISIONS_VERSION_KEY)
+        self.add_divisions(1)
+        cache.delete(DIVISIONS_VERSION_KEY)
+        self.client.get(reverse('divisions:divisions_page'))
+        self.assertNotEqual(cache.get(DIVISIONS_VERSION_KEY), version)
@@ -1,14 +1,62 @@
-from django.shortcuts import render
-from .models import Division, Project, Leader
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from ieeesbui import conditional
+from .models import Division, Activity, Project, Leader
+
+DIVISIONS_CACHE_PREFIX = 'divisions:page'
+DIVISIONS_VERSION_KEY = f'{DIVISIONS_CACHE_PREFIX}:version'
+
+
+def invalidate_divisions_page():
+    """
+    Drop the cached divisions page by bumping the cache version
+    """
+    # A new time-based value with no expiry: incr() on the database cache is a
+    # get+set that would give the key the default timeout, and a version that
+    # expired and restarted from a constant could hit a stale cached page
+    cache.set(DIVISIONS_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def grouped_divisions():
+    """
+    Every division with its activities, projects and leaders attached as
+    lists (activity_list, project_list, leader_list).
+    Four queries in total when evaluated, however many divisions there are.
+    The queryset is lazy: the page markup is hand-written today, so nothing
+    is queried unless the template iterates over it.
+    """
+    return Division.objects.order_by('name').prefetch_related(
+        Prefetch('activities', queryset=Activity.objects.order_by('id'), to_attr='activity_list'),
+        Prefetch('projects', queryset=Project.objects.order_by('title'), to_attr='project_list'),
+        Prefetch('leaders', queryset=Leader.objects.order_by('id'), to_attr='leader_list'),
+    )
+
 
 def divisions_page(request):
     """
     View for displaying the IEEE SBUI divisions page
+    The rendered page is cached until a division, activity, project or
+    leader changes (see divisions/signals.py).
     """
-    context = {
-        'divisions': Division.objects.all().prefetch_related('activities'),
-        'projects': Project.objects.all().select_related('division'),
-        'leaders': Leader.objects.all().select_related('division'),
-    }
-    
-    return render(request, 'divisions.html', context) 
\ No newline at end of file
+    version = cache.get_or_set(DIVISIONS_VERSION_KEY, time.time_ns, timeout=None)
+    key = f'{DIVISIONS_CACHE_PREFIX}:{version}'
+
+    content = cache.get(key)
+    if content is None:
+        content = render_to_string('divisions.html', {
+            'divisions': grouped_divisions(),
+        }, request=request)
+        cache.set(key, content, timeout=getattr(settings, 'DIVISIONS_CACHE_TIMEOUT', 60 * 60))
+
+    # The rendered page is already cached, so the ETag is simply its digest
+    etag = conditional.make_etag('divisions', hashlib.md5(content.encode()).hexdigest())
+    response = conditional.not_modified(request, etag)
+    if response is None:
+        response = HttpResponse(content)
+    return conditional.add_validators(response, etag)
@@ -10,9 +10,13 @@ class Event(models.Model):
     time = models.TimeField()
     location = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['date', 'time']
+        indexes = [
+            models.Index(fields=['date', 'time'], name='event_date_time_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -23,4 +27,4 @@ class Event(models.Model):
     @property
     def is_upcoming(self):
         """Automatically determine if this is an upcoming event based on date"""
-        return self.date >= timezone.now().date()
\ No newline at end of file
+        return self.date >= timezone.localdate()
\ No newline at end of file
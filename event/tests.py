@@ -1,3 +1,70 @@
-from django.test import TestCase
+import time as clock
+from datetime import date, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import Event
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+TODAY = date(2026, 3, 10)
+IMAGE = 'https://example.com/event.jpg'
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class EventListTests(TestCase):
+    """
+    The events page runs a fixed number of queries and renders one archive
+    page, however much history has accumulated
+    """
+
+    def setUp(self):
+        patcher = mock.patch('django.utils.timezone.localdate', return_value=TODAY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+
+    def add_events(self, past, upcoming):
+        start = Event.objects.count()
+        Event.objects.bulk_create([
+            Event(
+                title=f'Event {start + i}', description='-', image_url=IMAGE,
+                date=TODAY + timedelta(days=i - past + (1 if i >= past else 0)), time=time(10, 0), location='Depok',
+            )
+            for i in range(past + upcoming)
+        ])
+
+    def get(self):
+        started = clock.perf_counter()
+        # content version, archive page count, upcoming + page (one UNION, or
+        # two queries where the backend cannot slice inside UNION), image
+        # derivatives of every card, archive months
+        queries = 5 if connection.features.supports_slicing_ordering_in_compound else 6
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse('event_list'))
+        return response, clock.perf_counter() - started
+
+    def test_upcoming_and_past_are_partitioned(self):
+        self.add_events(past=12, upcoming=3)
+        response, _ = self.get()
+        upcoming = response.context['upcoming_events']
+        past = response.context['past_events']
+        self.assertEqual(len(upcoming), 3)
+        self.assertTrue(all(event.date >= TODAY for event in upcoming))
+        self.assertEqual(upcoming, sorted(upcoming, key=lambda event: event.date))
+        self.assertEqual(len(past), 9)
+        self.assertTrue(all(event.date < TODAY for event in past))
+        self.assertEqual(past, sorted(past, key=lambda event: event.date, reverse=True))
+        self.assertEqual(response.context['paginator'].num_pages, 2)
+
+    def test_query_count_and_render_time_do_not_grow_with_history(self):
+        self.add_events(past=20, upcoming=3)
+        self.get()  # warm up template loading
+        _, small = self.get()
+        self.add_events(past=10000, upcoming=0)
+        response, large = self.get()
+        self.assertEqual(len(response.context['past_events']), 9)
+        self.assertLess(large, max(small * 5, 0.5))
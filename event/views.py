@@ -1,21 +1,98 @@
 from django.shortcuts import render
+from django.db import connection
+from django.utils.decorators import method_decorator
 from django.views.generic import ListView, DetailView
 from django.utils import timezone
+from ieeesbui import conditional
+from main import images
 from .models import Event
 
+
+def event_list_validators(request):
+    """
+    ETag/Last-Modified for the event list: the version of the events table,
+    the local date (events move from upcoming to past at midnight) and the
+    archive/page parameters
+    """
+    parts, last_modified = conditional.content_version(Event.objects.all())
+    etag = conditional.make_etag('events', timezone.localdate(), request.GET.urlencode(), *parts)
+    return etag, last_modified
+
+
+def event_detail_validators(request, pk):
+    updated_at = Event.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    return conditional.make_etag('event', pk, updated_at, timezone.localdate()), updated_at
+
+
+@method_decorator(conditional.conditional_page(event_list_validators), name='get')
 class EventListView(ListView):
-    model = Event
+    """
+    Upcoming events plus a paginated, browsable archive of past events.
+
+    The ListView queryset is the past-events archive (optionally narrowed to
+    ?year=&month=), so pagination bounds the page no matter how much history
+    accumulates. Upcoming events and the archive page are read with a single
+    query where the database allows a LIMIT inside UNION (PostgreSQL).
+    """
     template_name = 'event_list.html'
-    context_object_name = 'events'
+    context_object_name = 'past_events'
+    paginate_by = 9
+    
+    def get_archive_filter(self):
+        """Return (year, month) from the query string, ignoring invalid values"""
+        try:
+            year = int(self.request.GET.get('year', ''))
+        except ValueError:
+            return None, None
+        try:
+            month = int(self.request.GET.get('month', ''))
+        except ValueError:
+            month = None
+        if month is not None and not 1 <= month <= 12:
+            month = None
+        return year, month
+    
+    def get_queryset(self):
+        self.today = timezone.localdate()
+        queryset = Event.objects.filter(date__lt=self.today)
+        year, month = self.get_archive_filter()
+        if year:
+            queryset = queryset.filter(date__year=year)
+            if month:
+                queryset = queryset.filter(date__month=month)
+        return queryset.order_by('-date', '-time')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        today = timezone.now().date()
-        context['upcoming_events'] = Event.objects.filter(date__gte=today).order_by('date', 'time')
-        context['past_events'] = Event.objects.filter(date__lt=today).order_by('-date', 'time')
+        page = context['page_obj']
+        upcoming = Event.objects.filter(date__gte=self.today)
+        if connection.features.supports_slicing_ordering_in_compound:
+            # Upcoming events and the current archive page come back from one
+            # UNION ALL query and are split on the date here
+            rows = list(upcoming.order_by().union(page.object_list, all=True))
+            context['upcoming_events'] = sorted(
+                (event for event in rows if event.date >= self.today), key=lambda event: (event.date, event.time)
+            )
+            page.object_list = sorted(
+                (event for event in rows if event.date < self.today), key=lambda event: (event.date, event.time), reverse=True
+            )
+        else:
+            # SQLite cannot LIMIT a part of a compound statement
+            context['upcoming_events'] = list(upcoming.order_by('date', 'time'))
+            page.object_list = list(page.object_list)
+        context['past_events'] = context['object_list'] = page.object_list
+        context['image_derivatives'] = images.lookup_many(
+            event.image_url for event in context['upcoming_events'] + page.object_list
+        )
+        # One row per month that has past events, served by the (date, time) index
+        context['archive_months'] = Event.objects.filter(date__lt=self.today).dates('date', 'month', order='DESC')
+        year, month = self.get_archive_filter()
+        context['archive_year'] = year
+        context['archive_month'] = month
         return context
 
+@method_decorator(conditional.conditional_page(event_detail_validators), name='get')
 class EventDetailView(DetailView):
     model = Event
     template_name = 'event_detail.html'
-    context_object_name = 'event'
\ No newline at end of file
+    context_object_name = 'event'
@@ -0,0 +1,101 @@
+"""
+Conditional GET (ETag / Last-Modified) helpers shared by the page views.
+
+A view computes cheap validators first (an aggregate over ``updated_at`` or
+a single row lookup), answers ``If-None-Match``/``If-Modified-Since`` with a
+304 straight away, and only runs the expensive queries and template
+rendering when the client's copy is stale.
+
+Every ETag is salted with the deployed commit (VERCEL_GIT_COMMIT_SHA, or
+the DEPLOY_VERSION setting) because templates and static asset URLs change
+between deployments without any row being modified.
+"""
+import hashlib
+import os
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def deploy_version():
+    return os.getenv('VERCEL_GIT_COMMIT_SHA') or getattr(settings, 'DEPLOY_VERSION', '')
+
+
+def make_etag(*parts):
+    """
+    Build a quoted ETag from the deploy version and the given parts
+    """
+    raw = '|'.join(str(part) for part in (deploy_version(),) + parts)
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def content_version(*querysets):
+    """
+    Version of one or more querysets of models with an ``updated_at`` field
+    Returns:
+        tuple: (list of ETag parts, latest updated_at or None)
+    Notes:
+        - One aggregate query per queryset. The row count is part of the
+          version so deletions are noticed as well.
+        - Sliced querysets (e.g. one sitemap shard) are aggregated as a subquery.
+    """
+    parts, latest = [], None
+    for queryset in querysets:
+        if not queryset.query.is_sliced:
+            queryset = queryset.order_by()
+        result = queryset.aggregate(latest=Max('updated_at'), total=Count('pk'))
+        parts += [result['latest'], result['total']]
+        if result['latest'] and (latest is None or result['latest'] > latest):
+            latest = result['latest']
+    return parts, latest
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Returns:
+        HttpResponse | None: a 304 (or 412) response when the request's
+        preconditions match the validators, otherwise None
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def add_validators(response, etag, last_modified=None, vary=(), cache_control=None):
+    """
+    Attach ETag/Last-Modified to a successful response. Unless other
+    Cache-Control directives are given, browsers are asked to revalidate on
+    every visit, which is cheap thanks to the 304 short-circuit.
+    """
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response.headers.setdefault('ETag', etag)
+        if last_modified:
+            response.headers.setdefault('Last-Modified', http_date(last_modified.timestamp()))
+        patch_cache_control(response, **(cache_control or {'no_cache': True}))
+    if vary:
+        patch_vary_headers(response, vary)
+    return response
+
+
+def conditional_page(validators, vary=(), cache_control=None):
+    """
+    Decorator for views whose validators can be computed from the request
+    Args:
+        validators (callable): validators(request, *args, **kwargs) -> (etag, last_modified)
+        vary (tuple): extra request headers the response varies on
+        cache_control (dict): Cache-Control directives, default no-cache
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            etag, last_modified = validators(request, *args, **kwargs)
+            response = not_modified(request, etag, last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return add_validators(response, etag, last_modified, vary, cache_control)
+        return wrapper
+    return decorator
@@ -0,0 +1,19 @@
+"""
+PostgreSQL backend that records how long opening a connection takes.
+
+With a pool configured, get_new_connection() checks a connection out of
+the pool, so the recorded time is the (much shorter) checkout time.
+"""
+import time
+
+from django.db.backends.postgresql import base
+
+from . import stats
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        started = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        stats.record_connect(time.perf_counter() - started)
+        return connection
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import stats
+
+
+class ConnectionStatsMiddleware:
+    """
+    Adds an X-DB-Connections header to every response:
+
+        X-DB-Connections: opened=0; reused=1; connect=0.0ms
+
+    ``opened`` counts connections (or pool checkouts) made while handling
+    the request, ``reused`` the connections that were already open and
+    served it without a new handshake.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, 'DATABASE_CONNECTION_STATS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats.reset()
+        response = self.get_response(request)
+        current = stats.current()
+        open_now = sum(1 for connection in connections.all(initialized_only=True) if connection.connection is not None)
+        reused = max(open_now - current['opened'], 0)
+        response['X-DB-Connections'] = 'opened={}; reused={}; connect={:.1f}ms'.format(
+            current['opened'], reused, current['connect_time'] * 1000
+        )
+        return response
@@ -0,0 +1,35 @@
+"""
+Connection setup counters, kept per request (per thread/task, like Django's
+own connection handler) and for the lifetime of the process.
+"""
+from asgiref.local import Local
+
+_request = Local()
+_totals = {'opened': 0, 'connect_time': 0.0}
+
+
+def reset():
+    _request.opened = 0
+    _request.connect_time = 0.0
+
+
+def record_connect(seconds):
+    _request.opened = getattr(_request, 'opened', 0) + 1
+    _request.connect_time = getattr(_request, 'connect_time', 0.0) + seconds
+    _totals['opened'] += 1
+    _totals['connect_time'] += seconds
+
+
+def current():
+    """
+    Returns:
+        dict: connections opened and seconds spent connecting since reset()
+    """
+    return {
+        'opened': getattr(_request, 'opened', 0),
+        'connect_time': getattr(_request, 'connect_time', 0.0),
+    }
+
+
+def totals():
+    return dict(_totals)
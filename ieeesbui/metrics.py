@@ -0,0 +1,204 @@
+"""
+Per-request performance instrumentation.
+
+When PERFORMANCE_METRICS is enabled, PerformanceMetricsMiddleware measures
+for every request:
+
+- database query count and time (connection.execute_wrapper),
+- template render time (outermost Template.render calls only, so included
+  templates are not counted twice),
+- view time and total time,
+
+emits them as a Server-Timing header and adds them to per-route histograms
+served in Prometheus text format by ``metrics_view`` (protected by
+METRICS_TOKEN). Histograms live in process memory, so each worker reports its
+own series. The body of a StreamingHttpResponse is produced after the
+middleware returns and is not included.
+
+When disabled the middleware raises MiddlewareNotUsed and Template.render is
+left untouched, so there is no per-request cost.
+"""
+import hmac
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_request = Local()
+
+
+def enabled():
+    return getattr(settings, 'PERFORMANCE_METRICS', False)
+
+
+class Histogram:
+    """
+    Cumulative Prometheus-style histogram keyed by route
+    """
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, value):
+        with self._lock:
+            series = self._series.get(route)
+            if series is None:
+                series = self._series[route] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def exposition(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for route, series in sorted(self._series.items()):
+                label = _escape(route)
+                for bound, count in zip(self.buckets, series['counts']):
+                    lines.append(f'{self.name}_bucket{{route="{label}",le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{route="{label}",le="+Inf"}} {series["count"]}')
+                lines.append(f'{self.name}_sum{{route="{label}"}} {series["sum"]:.6f}')
+                lines.append(f'{self.name}_count{{route="{label}"}} {series["count"]}')
+        return lines
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUEST_SECONDS = Histogram('http_request_duration_seconds', 'Total time spent handling the request.')
+VIEW_SECONDS = Histogram('http_view_duration_seconds', 'Time spent in the view, including template rendering.')
+DB_SECONDS = Histogram('http_request_db_seconds', 'Time spent in database queries per request.')
+TEMPLATE_SECONDS = Histogram('http_request_template_seconds', 'Time spent rendering templates per request.')
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries per request.',
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+HISTOGRAMS = (REQUEST_SECONDS, VIEW_SECONDS, DB_SECONDS, TEMPLATE_SECONDS, DB_QUERIES)
+
+
+def _query_timer(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        _request.db_time += time.perf_counter() - started
+        _request.db_queries += 1
+
+
+_template_render_patched = False
+
+
+def _patch_template_render():
+    """
+    Wrap Template.render once so the outermost render of each request is timed
+    """
+    global _template_render_patched
+    if _template_render_patched:
+        return
+    from django.template.base import Template
+
+    original = Template.render
+
+    def render(self, context):
+        if not getattr(_request, 'active', False) or _request.template_depth:
+            return original(self, context)
+        _request.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            _request.template_time += time.perf_counter() - started
+            _request.template_depth -= 1
+
+    Template.render = render
+    _template_render_patched = True
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match.route or 'unresolved'
+
+
+class PerformanceMetricsMiddleware:
+    def __init__(self, get_response):
+        if not enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _patch_template_render()
+
+    def __call__(self, request):
+        _request.active = True
+        _request.db_time = 0.0
+        _request.db_queries = 0
+        _request.template_time = 0.0
+        _request.template_depth = 0
+        _request.view_started = None
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_query_timer))
+                response = self.get_response(request)
+        finally:
+            _request.active = False
+        finished = time.perf_counter()
+        total = finished - started
+        view = finished - _request.view_started if _request.view_started else 0.0
+
+        route = route_name(request)
+        REQUEST_SECONDS.observe(route, total)
+        VIEW_SECONDS.observe(route, view)
+        DB_SECONDS.observe(route, _request.db_time)
+        TEMPLATE_SECONDS.observe(route, _request.template_time)
+        DB_QUERIES.observe(route, _request.db_queries)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={_request.db_time * 1000:.1f};desc="{_request.db_queries} queries"',
+            f'tpl;dur={_request.template_time * 1000:.1f}',
+            f'view;dur={view * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _request.view_started = time.perf_counter()
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the per-route histograms.
+    Requires ``Authorization: Bearer <METRICS_TOKEN>``; answers 404 when
+    metrics are disabled or no token is configured.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not enabled() or not token:
+        raise Http404
+    supplied = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+        response = HttpResponse('Unauthorized', status=401, content_type='text/plain')
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.exposition())
+    response = HttpResponse('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
+    response['Cache-Control'] = 'no-store'
+    return response
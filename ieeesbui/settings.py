@@ -37,12 +37,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'divisions',
     'main',
     'about',
     'event',
     'article',
     'articleDetails',
+    'api',
     'tailwind',
     'theme',
     'django_browser_reload',
@@ -54,6 +56,8 @@ TAILWIND_APP_NAME = 'theme'
 NPM_BIN_PATH = r"C:\Program Files\nodejs\npm.cmd"
 
 MIDDLEWARE = [
+    'ieeesbui.metrics.PerformanceMetricsMiddleware',
+    'ieeesbui.db.middleware.ConnectionStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -94,22 +98,151 @@ import os
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
+from django.core.exceptions import ImproperlyConfigured
+
 load_dotenv()
 
 # Replace the DATABASES section of your settings.py with this
 tmpPostgres = urlparse(os.getenv("DATABASE_URL"))
 
+# Connection management (DATABASE_CONNECTION_MODE):
+#   none       - a new connection for every request (Django's default, used
+#                unless another mode is chosen)
+#   persistent - keep connections open for DATABASE_CONN_MAX_AGE seconds and
+#                check them before reuse
+#   pool       - psycopg 3 connection pool (needs psycopg[pool] instead of
+#                psycopg2); Django requires CONN_MAX_AGE = 0 with a pool
+#   pgbouncer  - persistent connections to PgBouncer in transaction mode;
+#                server-side cursors are disabled because they cannot span
+#                transactions there
+DATABASE_CONNECTION_MODE = os.getenv('DATABASE_CONNECTION_MODE', 'none')
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # PostgreSQL backend that times connection setup (ieeesbui/db)
+        'ENGINE': 'ieeesbui.db',
         'NAME': tmpPostgres.path.replace('/', ''),
         'USER': tmpPostgres.username,
         'PASSWORD': tmpPostgres.password,
         'HOST': tmpPostgres.hostname,
-        'PORT': 5432,
+        'PORT': tmpPostgres.port or 5432,
+        'CONN_MAX_AGE': 0,
     }
 }
 
+if DATABASE_CONNECTION_MODE in ('persistent', 'pgbouncer'):
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DATABASE_CONN_MAX_AGE', 60))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    if DATABASE_CONNECTION_MODE == 'pgbouncer':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+elif DATABASE_CONNECTION_MODE == 'pool':
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured(
+            'DATABASE_CONNECTION_MODE=pool needs psycopg 3 and its pool: '
+            'pip install "psycopg[pool]" (psycopg2 has no pool support)'
+        )
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', 1)),
+            'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', 4)),
+            'timeout': int(os.getenv('DATABASE_POOL_TIMEOUT', 10)),
+        },
+    }
+elif DATABASE_CONNECTION_MODE != 'none':
+    raise ImproperlyConfigured(
+        f'Unknown DATABASE_CONNECTION_MODE {DATABASE_CONNECTION_MODE!r}: '
+        'use none, persistent, pool or pgbouncer'
+    )
+
+# Per-request X-DB-Connections header (opened/reused connections and time
+# spent connecting), see ieeesbui/db/middleware.py. Off unless enabled.
+DATABASE_CONNECTION_STATS = os.getenv('DATABASE_CONNECTION_STATS', 'false') == 'true'
+
+# Shared cache for page fragments, cached pages, facet counts and the view
+# count buffer. Every worker and every serverless instance has to see the same
+# entries (and the same invalidation versions), so it is Redis when REDIS_URL
+# is set and the database cache table otherwise (created by migration
+# main/0002_cache_table). Never a per-process LocMemCache.
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'ieeesbui',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
+# Article view counts are buffered and written to the database at most once
+# per interval (seconds), per process without buffering. See article/view_counter.py
+ARTICLE_VIEW_COUNT_FLUSH_INTERVAL = int(os.getenv('ARTICLE_VIEW_COUNT_FLUSH_INTERVAL', 60))
+# Buffering needs atomic incr/decr shared by every worker, i.e. Redis. Without
+# it each process keeps its views in memory until its next interval flush.
+ARTICLE_VIEW_COUNT_BUFFER = os.getenv('ARTICLE_VIEW_COUNT_BUFFER', 'true' if REDIS_URL else 'false') == 'true'
+
+# Lifetime (seconds) of cached AJAX fragments of the article list.
+# Entries are also invalidated whenever an article or category changes.
+ARTICLE_FRAGMENT_CACHE_TIMEOUT = int(os.getenv('ARTICLE_FRAGMENT_CACHE_TIMEOUT', 300))
+
+# Trending articles (article/trending.py): views are kept per hour for
+# ARTICLE_TRENDING_HOURLY_RETENTION hours, then per day for
+# ARTICLE_TRENDING_WINDOW_DAYS days. A view loses half its weight every
+# ARTICLE_TRENDING_HALF_LIFE_HOURS hours. Scores are refreshed by
+# `manage.py rollup_trending`
+ARTICLE_TRENDING_HALF_LIFE_HOURS = int(os.getenv('ARTICLE_TRENDING_HALF_LIFE_HOURS', 24))
+ARTICLE_TRENDING_HOURLY_RETENTION = 48
+ARTICLE_TRENDING_WINDOW_DAYS = 14
+
+# Upper bound (seconds) for the cached per-category article counts of the
+# category filter. They are kept up to date by signals in between, and the
+# timeout bounds any drift from writes that bypass signals (article/facets.py)
+ARTICLE_FACET_CACHE_TIMEOUT = int(os.getenv('ARTICLE_FACET_CACHE_TIMEOUT', 6 * 60 * 60))
+
+# Content-similarity index for "related articles" (article/similarity.py)
+ARTICLE_RELATED_TOP_K = 6
+ARTICLE_RELATED_MAX_FEATURES = 4096
+ARTICLE_RELATED_UPDATE_ON_SAVE = True
+
+# Upper bound (seconds) for the cached homepage; it normally expires at the
+# next local midnight or the start of the next upcoming event
+HOMEPAGE_CACHE_MAX_TIMEOUT = 6 * 60 * 60
+
+# Upper bound (seconds) for the cached divisions page; it is also dropped
+# whenever a division, activity, project or leader is saved or deleted
+DIVISIONS_CACHE_TIMEOUT = 60 * 60
+
+# Sitemap shards and feeds (main/sitemaps.py, main/feeds.py). Rendered
+# artifacts are cached per content version, see main/syndication.py
+SITEMAP_SHARD_SIZE = 5000
+FEED_ITEMS = 20
+SYNDICATION_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Admin changelists use planner estimates instead of COUNT(*) once a result
+# is at least this large (ieeesbui/paginator.py, PostgreSQL only)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+
+# Read-only JSON API (api app): seconds shared caches may serve a response
+# before revalidating it with the ETag
+API_CACHE_MAX_AGE = int(os.getenv('API_CACHE_MAX_AGE', '60'))
+
+# Server-Timing headers and per-route histograms (ieeesbui/metrics.py).
+# The Prometheus endpoint /metrics requires "Authorization: Bearer <METRICS_TOKEN>".
+PERFORMANCE_METRICS = os.getenv('PERFORMANCE_METRICS', 'false') == 'true'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Salt for the ETags of page views (ieeesbui/conditional.py). On Vercel the
+# deployed commit (VERCEL_GIT_COMMIT_SHA) is used instead.
+DEPLOY_VERSION = os.getenv('DEPLOY_VERSION', '')
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -150,8 +283,29 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
-# MEDIA_URL = '/media/'
-# MEDIA_ROOT = BASE_DIR / "mediafiles"
+# collectstatic: hashed names, gzip/brotli variants, WOFF2 font subsets and
+# pruning of unreferenced fonts (see ieeesbui/storage.py). Vercel runs no
+# build step, so STATIC_ROOT is committed with its staticfiles.json manifest:
+# run collectstatic after changing anything under static/
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "ieeesbui.storage.StaticAssetStorage",
+    },
+}
+STATIC_PRUNE_UNREFERENCED = ('fonts/',)
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / "mediafiles"
+
+# Responsive image derivatives (main/images.py). `manage.py
+# build_image_derivatives` writes them to static/<IMAGE_DERIVATIVES_DIR> so
+# collectstatic and WhiteNoise serve them; media files are only served with
+# DEBUG on and the deployed filesystem is read-only
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 960, 1280)
+IMAGE_DERIVATIVES_DIR = 'derivatives'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
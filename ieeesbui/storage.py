@@ -0,0 +1,159 @@
+"""
+Static files storage used by collectstatic.
+
+On top of WhiteNoise's CompressedManifestStaticFilesStorage (hashed file
+names plus gzip/brotli variants, served with far-future immutable caching)
+this storage:
+
+- converts the .otf/.ttf fonts referenced by templates to subsetted WOFF2
+  before hashing, so the WOFF2 files get hashed and compressed as well;
+- prunes files under STATIC_PRUNE_UNREFERENCED prefixes (by default the font
+  directory) that neither a template nor a collected stylesheet references.
+
+The manifest is strict: a name missing from staticfiles.json raises instead
+of silently serving an unhashed path. The collected tree, including the
+manifest, is committed (Vercel runs no build step), so run collectstatic
+after changing anything under static/.
+"""
+import io
+import posixpath
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+STATIC_TAG_RE = re.compile(r'{%\s*static\s+["\']([^"\']+)["\']\s*%}')
+CSS_URL_RE = re.compile(r'url\(\s*["\']?([^"\')]+?)["\']?\s*\)')
+
+FONT_EXTENSIONS = ('.otf', '.ttf')
+
+# Latin, Latin-1 supplement and common punctuation/symbols
+DEFAULT_FONT_SUBSET_UNICODES = (
+    'U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, '
+    'U+2000-206F, U+2074, U+20AC, U+2122, U+2191, U+2193, U+2212, U+2215, U+FEFF, U+FFFD'
+)
+
+
+def template_files():
+    """
+    Yield every HTML template of the project
+    """
+    directories = [Path(d) for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+    directories += list(Path(settings.BASE_DIR).glob('*/templates'))
+    for directory in directories:
+        yield from directory.rglob('*.html')
+
+
+def resolve_css_url(url, base=''):
+    """
+    Static path a CSS url() points to, or None for data:, remote and non-static URLs
+    Args:
+        url (str): value inside url(...)
+        base (str): static path of the stylesheet, relative URLs are resolved against it
+    """
+    url = url.split('#', 1)[0].split('?', 1)[0].strip()
+    if not url or url.startswith(('data:', 'http:', 'https:', '//', '{')):
+        return None
+    if url.startswith(settings.STATIC_URL):
+        return url[len(settings.STATIC_URL):]
+    if url.startswith('/'):
+        return None
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), url))
+
+
+def template_static_references():
+    """
+    Static paths referenced with {% static %} or a literal /static/ url() in project templates
+    """
+    references = set()
+    for template in template_files():
+        text = template.read_text(encoding='utf-8')
+        references.update(STATIC_TAG_RE.findall(text))
+        references.update(filter(None, (resolve_css_url(url) for url in CSS_URL_RE.findall(text))))
+    return references
+
+
+def stylesheet_references(paths):
+    """
+    Static paths referenced with url() by the stylesheets being collected
+    Args:
+        paths (dict): collectstatic paths, name -> (storage, path)
+    """
+    references = set()
+    for name, (storage, path) in paths.items():
+        if not name.endswith('.css'):
+            continue
+        with storage.open(path) as fh:
+            text = fh.read().decode('utf-8', 'replace')
+        references.update(filter(None, (resolve_css_url(url, name) for url in CSS_URL_RE.findall(text))))
+    return references
+
+
+def woff2_name(name):
+    return str(Path(name).with_suffix('.woff2'))
+
+
+def subset_font_to_woff2(data, unicodes):
+    """
+    Subset a font to the given unicode ranges and encode it as WOFF2
+    Args:
+        data (bytes): original .otf/.ttf file
+        unicodes (str): comma separated unicode ranges, e.g. "U+0000-00FF, U+20AC"
+    Returns:
+        bytes: WOFF2 font
+    """
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+
+    font = TTFont(io.BytesIO(data))
+    subsetter = subset.Subsetter(options=options)
+    subsetter.populate(unicodes=subset.parse_unicodes(unicodes))
+    subsetter.subset(font)
+    font.flavor = 'woff2'
+
+    output = io.BytesIO()
+    font.save(output)
+    return output.getvalue()
+
+
+class StaticAssetStorage(CompressedManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = dict(paths)
+            references = template_static_references() | stylesheet_references(paths)
+            self.prune_unreferenced(paths, references)
+            self.convert_fonts(paths, references)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def prune_unreferenced(self, paths, references):
+        prefixes = tuple(getattr(settings, 'STATIC_PRUNE_UNREFERENCED', ('fonts/',)))
+        if not prefixes:
+            return
+        for name in list(paths):
+            if name.startswith(prefixes) and name not in references and woff2_name(name) not in references:
+                del paths[name]
+                if self.exists(name):
+                    self.delete(name)
+
+    def convert_fonts(self, paths, references):
+        unicodes = getattr(settings, 'STATIC_FONT_SUBSET_UNICODES', DEFAULT_FONT_SUBSET_UNICODES)
+        for name in list(paths):
+            if not name.lower().endswith(FONT_EXTENSIONS):
+                continue
+            target = woff2_name(name)
+            if target in paths:
+                continue
+            with self.open(name) as fh:
+                data = subset_font_to_woff2(fh.read(), unicodes)
+            if self.exists(target):
+                self.delete(target)
+            self.save(target, ContentFile(data))
+            paths[target] = (self, target)
@@ -18,19 +18,21 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('', include('main.urls')),
     path('about', include('about.urls')),
     path('divisions', include('divisions.urls')),
     path('event', include('event.urls')),
     path('article', include('article.urls')),
     path('articleDetails',include('articleDetails.urls')),
+    path('api/v1/', include('api.urls')),
     path("__reload__/", include("django_browser_reload.urls")),
 ]
 
 # Tambahkan konfigurasi untuk file media jika dalam mode debug
-# if settings.DEBUG:
-# if settings.DEBUG is False:
-    # urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# (static() hanya menambahkan URL saat DEBUG=True)
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
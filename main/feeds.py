@@ -0,0 +1,82 @@
+"""
+RSS and Atom feeds of the latest articles and events.
+"""
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+
+from article.models import Article
+from event.models import Event
+
+
+def feed_size():
+    return getattr(settings, 'FEED_ITEMS', 20)
+
+
+class LatestArticlesFeed(Feed):
+    title = 'IEEE SBUI Articles'
+    description = 'The latest articles from IEEE Student Branch Universitas Indonesia.'
+
+    def link(self):
+        return reverse('articles')
+
+    def items(self):
+        return (
+            Article.objects.filter(status='published')
+            .select_related('author')
+            .only('title', 'slug', 'card_excerpt', 'created_at', 'updated_at',
+                  'author__username', 'author__first_name', 'author__last_name')
+            .order_by('-created_at')[:feed_size()]
+        )
+
+    def item_title(self, article):
+        return article.title
+
+    def item_description(self, article):
+        return article.card_excerpt
+
+    def item_author_name(self, article):
+        return article.author.get_full_name() or article.author.username
+
+    def item_pubdate(self, article):
+        return article.created_at
+
+    def item_updateddate(self, article):
+        return article.updated_at
+
+
+class LatestArticlesAtomFeed(LatestArticlesFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestArticlesFeed.description
+
+
+class EventsFeed(Feed):
+    title = 'IEEE SBUI Events'
+    description = 'Upcoming and recent events of IEEE Student Branch Universitas Indonesia.'
+
+    def link(self):
+        return reverse('event_list')
+
+    def items(self):
+        return Event.objects.defer('description').order_by('-date', '-time')[:feed_size()]
+
+    def item_title(self, event):
+        return f'{event.title} ({event.date:%d %b %Y})'
+
+    def item_description(self, event):
+        return f'{event.date:%A, %d %B %Y} {event.time:%H:%M} at {event.location}'
+
+    def item_pubdate(self, event):
+        return timezone.make_aware(datetime.combine(event.date, event.time))
+
+    def item_updateddate(self, event):
+        return event.updated_at
+
+
+class EventsAtomFeed(EventsFeed):
+    feed_type = Atom1Feed
+    subtitle = EventsFeed.description
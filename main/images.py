@@ -0,0 +1,237 @@
+"""
+Image derivative pipeline for article, event, project and leader images.
+
+Each source image (remote URL, static file or uploaded media file) is
+resized with Pillow into a few widths and encoded as WebP, AVIF (when the
+installed Pillow supports it) and a JPEG fallback. The variants and the
+intrinsic dimensions of the original are stored in ResponsiveImage so the
+``responsive_image`` template tag can emit srcset/sizes/width/height
+without touching the files at request time.
+
+Derivatives are written into the static tree (IMAGE_DERIVATIVES_DIR under
+the first STATICFILES_DIRS entry) by ``manage.py build_image_derivatives``,
+so collectstatic hashes them and WhiteNoise serves them like any other
+static file. Media files are not served in production and the deployed
+filesystem is read-only, so nothing is generated at request or save time.
+"""
+import hashlib
+import io
+import re
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from PIL import Image, ImageOps, features
+
+from .models import ResponsiveImage
+
+CACHE_PREFIX = 'responsive-image'
+DOWNLOAD_TIMEOUT = 15
+
+# Picks literal sources out of templates: {% responsive_image "https://..." %}
+TEMPLATE_SOURCE_RE = re.compile(r'{%\s*responsive_image\s+["\']([^"\']+)["\']')
+
+
+class ImageSourceError(Exception):
+    pass
+
+
+def derivative_widths():
+    return getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (320, 640, 960, 1280))
+
+
+def derivatives_dir():
+    return getattr(settings, 'IMAGE_DERIVATIVES_DIR', 'derivatives')
+
+
+def derivative_storage():
+    """
+    Storage rooted at the derivatives directory inside the static source tree
+    """
+    return FileSystemStorage(location=Path(settings.STATICFILES_DIRS[0]) / derivatives_dir())
+
+
+def derivative_formats():
+    """
+    Formats generated for every width, best compression first
+    """
+    formats = []
+    if features.check('avif'):
+        formats.append('avif')
+    formats.extend(['webp', 'jpeg'])
+    return formats
+
+
+def source_digest(source):
+    return hashlib.sha1(source.encode()).hexdigest()[:20]
+
+
+def cache_key(source):
+    return f'{CACHE_PREFIX}:{source_digest(source)}'
+
+
+def read_source(source):
+    """
+    Return the raw bytes of an image source
+    """
+    if source.startswith(('http://', 'https://')):
+        try:
+            response = requests.get(source, timeout=DOWNLOAD_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            raise ImageSourceError(f'Could not download {source}: {exc}')
+        return response.content
+
+    if source.startswith(settings.STATIC_URL):
+        path = finders.find(source[len(settings.STATIC_URL):])
+        if not path:
+            raise ImageSourceError(f'Static file not found: {source}')
+        return Path(path).read_bytes()
+
+    media_url = getattr(settings, 'MEDIA_URL', '') or ''
+    name = source[len(media_url):] if media_url and source.startswith(media_url) else source
+    if not default_storage.exists(name):
+        raise ImageSourceError(f'Media file not found: {source}')
+    with default_storage.open(name) as fh:
+        return fh.read()
+
+
+def _encode(image, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'jpeg':
+        image.convert('RGB').save(buffer, 'JPEG', quality=80, optimize=True, progressive=True)
+    elif fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=78, method=6)
+    else:
+        image.save(buffer, 'AVIF', quality=60)
+    return buffer.getvalue()
+
+
+def generate(source, force=False):
+    """
+    Create (or refresh) the derivatives of one source image
+    Returns:
+        ResponsiveImage: the stored record
+    """
+    if not force:
+        existing = ResponsiveImage.objects.filter(source=source).first()
+        if existing and is_current(existing.variants):
+            return existing
+
+    with Image.open(io.BytesIO(read_source(source))) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGBA' if 'A' in original.getbands() else 'RGB')
+        width, height = original.size
+
+        configured = sorted(derivative_widths())
+        widths = [w for w in configured if w < width]
+        if not widths or width <= configured[-1]:
+            # Small originals are kept at their own width instead of being upscaled
+            widths.append(width)
+        storage = derivative_storage()
+        digest = source_digest(source)
+
+        variants = []
+        for target_width in widths:
+            target_height = round(height * target_width / width)
+            resized = original if target_width == width else original.resize(
+                (target_width, target_height), Image.LANCZOS
+            )
+            for fmt in derivative_formats():
+                extension = 'jpg' if fmt == 'jpeg' else fmt
+                name = f'{digest}/{target_width}.{extension}'
+                if storage.exists(name):
+                    storage.delete(name)
+                storage.save(name, ContentFile(_encode(resized, fmt)))
+                variants.append({
+                    'format': fmt,
+                    'width': target_width,
+                    # Resolved with staticfiles_storage.url() when rendering
+                    'path': f'{derivatives_dir()}/{name}',
+                })
+
+    record, _ = ResponsiveImage.objects.update_or_create(
+        source=source,
+        defaults={'width': width, 'height': height, 'variants': variants},
+    )
+    cache.delete(cache_key(source))
+    return record
+
+
+def is_current(variants):
+    # Records written before derivatives moved to the static tree carry media
+    # URLs that are not served in production; they count as not generated
+    return bool(variants) and all('path' in variant for variant in variants)
+
+
+def _data(record):
+    if record is None or not is_current(record.variants):
+        return {}
+    return {'width': record.width, 'height': record.height, 'variants': record.variants}
+
+
+def lookup(source):
+    """
+    Stored derivative data for a source, cached for templates rendered without
+    a page-level lookup_many() result
+    Returns:
+        dict | None: {'width', 'height', 'variants'} or None when not generated yet
+    """
+    key = cache_key(source)
+    data = cache.get(key)
+    if data is None:
+        # Cache misses as well, as an empty dict
+        data = _data(ResponsiveImage.objects.filter(source=source).first())
+        cache.set(key, data, timeout=getattr(settings, 'IMAGE_DERIVATIVE_CACHE_TIMEOUT', 3600))
+    return data or None
+
+
+def lookup_many(sources):
+    """
+    Derivative data for every image of a page in one query
+    Args:
+        sources (iterable[str]): image URLs, empty values are ignored
+    Returns:
+        dict: source -> {'width', 'height', 'variants'} or None when not generated yet
+    Notes:
+        - Views pass the result to the template as ``image_derivatives`` and
+          {% responsive_image %} reads it instead of calling lookup() per image.
+          One indexed query per page is cheaper than a cache round trip per
+          card on the database cache.
+    """
+    sources = {source for source in sources if source}
+    if not sources:
+        return {}
+    records = {record.source: record for record in ResponsiveImage.objects.filter(source__in=sources)}
+    return {source: _data(records.get(source)) or None for source in sources}
+
+
+def model_sources():
+    """
+    Yield the image source of every article, event, project and leader
+    """
+    from article.models import Article
+    from divisions.models import Leader, Project
+    from event.models import Event
+
+    yield from Article.objects.exclude(image__isnull=True).exclude(image='').values_list('image', flat=True).iterator()
+    yield from Event.objects.exclude(image_url='').values_list('image_url', flat=True).iterator()
+    for model in (Project, Leader):
+        for image in model.objects.exclude(image='').exclude(image__isnull=True).only('image').iterator():
+            yield image.image.url
+
+
+def template_sources():
+    """
+    Yield literal sources passed to {% responsive_image %} in project templates
+    """
+    directories = [Path(d) for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+    directories += [p for p in Path(settings.BASE_DIR).glob('*/templates')]
+    for directory in directories:
+        for template in directory.rglob('*.html'):
+            yield from TEMPLATE_SOURCE_RE.findall(template.read_text(encoding='utf-8'))
@@ -0,0 +1,361 @@
+import json
+import random
+import re
+from collections import OrderedDict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, migrations, models
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+from django.test import Client
+
+from article.models import Article
+from main.management.commands.benchmark_routes import build_routes
+
+MIN_SEEDED_ARTICLES = 1000
+
+
+# A column compared in a plan filter or WHERE clause: status = ..., (date < ...),
+# "article_article"."status" = %s. Names right after a quote or a cast (::date)
+# are literals and types, not columns.
+COMPARISON_RE = re.compile(r'(?<![\w\'":])"?(\w+)"?\)*(?:::[a-z ]+?)?\)*\s*(=|<=|>=|<>|!=|<|>)(?!=)')
+SORT_KEY_RE = re.compile(r'^"?(\w+)"?(?: (ASC|DESC))?(?: NULLS (?:FIRST|LAST))?$', re.IGNORECASE)
+RANGE_OPERATORS = {'<', '<=', '>', '>='}
+
+
+def _unqualify(text, table):
+    """
+    Drop the table prefix from this table's column references; references to
+    other tables in a join become a placeholder that matches no column
+    """
+    text = re.sub(rf'"?{re.escape(table)}"?\."?(\w+)"?', r'\1', text)
+    return re.sub(r'"?\w+"?\."?\w+"?', '?', text)
+
+
+def _sql_clause(sql, keyword, ends):
+    match = re.search(rf'\b{keyword}\b(.*?)(?:\b(?:{"|".join(ends)})\b|$)', sql, re.IGNORECASE | re.DOTALL)
+    return match.group(1).strip() if match else None
+
+
+def _first_relation(node):
+    if node.get('Relation Name'):
+        return node['Relation Name']
+    for child in node.get('Plans', ()):
+        relation = _first_relation(child)
+        if relation:
+            return relation
+    return None
+
+
+def walk_postgres_plan(node, flags, row_threshold):
+    """
+    Collect flags from an EXPLAIN (ANALYZE, FORMAT JSON) plan tree
+    """
+    node_type = node.get('Node Type', '')
+    relation = node.get('Relation Name')
+    rows = node.get('Actual Rows', node.get('Plan Rows', 0)) * node.get('Actual Loops', 1)
+    if node_type == 'Seq Scan':
+        flags.append({'flag': 'seq_scan', 'table': relation, 'rows': rows, 'filter': node.get('Filter')})
+    elif node_type in ('Sort', 'Incremental Sort'):
+        # A sort has no relation of its own: attribute it to the table it reads from
+        flags.append({'flag': 'sort', 'table': _first_relation(node), 'rows': rows, 'sort_key': node.get('Sort Key')})
+    if rows >= row_threshold and node_type != 'Seq Scan':
+        flags.append({'flag': 'large_rows', 'node': node_type, 'table': relation, 'rows': rows})
+    for child in node.get('Plans', ()):
+        walk_postgres_plan(child, flags, row_threshold)
+    return flags
+
+
+def explain_postgres(cursor, sql, params, row_threshold):
+    cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}', params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]
+    flags = walk_postgres_plan(plan['Plan'], [], row_threshold)
+    return {'plan': plan, 'execution_ms': plan.get('Execution Time'), 'flags': flags}
+
+
+def explain_sqlite(cursor, sql, params, row_threshold):
+    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+    details = [row[3] for row in cursor.fetchall()]
+    # The SQLite plan names no columns: filters and sort keys come from the statement
+    where = _sql_clause(sql, 'WHERE', ('GROUP BY', 'ORDER BY', 'LIMIT'))
+    order_by = _sql_clause(sql, 'ORDER BY', ('LIMIT', 'OFFSET'))
+    sort_key = [key.strip() for key in order_by.split(',')] if order_by else None
+    flags, last_table = [], None
+    for detail in details:
+        words = detail.split()
+        if words[0] in ('SCAN', 'SEARCH') and len(words) > 1:
+            last_table = words[1]
+        if words[0] == 'SCAN' and 'INDEX' not in detail:
+            flags.append({'flag': 'seq_scan', 'table': last_table, 'detail': detail, 'filter': where})
+        elif 'TEMP B-TREE' in detail and 'ORDER BY' in detail:
+            flags.append({'flag': 'sort', 'table': last_table, 'detail': detail, 'sort_key': sort_key})
+    return {'plan': details, 'execution_ms': None, 'flags': flags}
+
+
+EXPLAINERS = {
+    'postgresql': explain_postgres,
+    'sqlite': explain_sqlite,
+}
+
+
+def filter_columns(text, table, columns):
+    """
+    Columns of ``table`` a plan filter (or WHERE clause) compares
+    Returns:
+        tuple: (equality columns, range columns) as field names, in order
+    Notes:
+        - A bare boolean column (``is_featured AND ...``) counts as equality.
+        - Full text matches (@@), IS NULL and <> are not btree index keys.
+    """
+    equal, ranges = [], []
+    if not text:
+        return equal, ranges
+    text = _unqualify(text, table)
+    for column, operator in COMPARISON_RE.findall(text):
+        if column not in columns:
+            continue
+        target = ranges if operator in RANGE_OPERATORS else equal if operator == '=' else None
+        if target is not None and columns[column] not in equal + ranges:
+            target.append(columns[column])
+    for column, field in columns.items():
+        if field in equal + ranges:
+            continue
+        if re.search(rf'(?:^|\(|\bAND\s+)"?{re.escape(column)}"?\s*(?:\)|\bAND\b|$)', text):
+            equal.append(field)
+    return equal, ranges
+
+
+def sort_fields(keys, table, columns, pk):
+    """
+    Sort key of a plan node as index fields ('-created_at'); None when a key
+    is an expression (date_trunc(...)) that a plain index cannot serve
+    """
+    fields = []
+    for key in keys or ():
+        match = SORT_KEY_RE.match(_unqualify(key, table).strip())
+        if not match or match.group(1) not in columns:
+            return None
+        field = columns[match.group(1)]
+        descending = (match.group(2) or '').upper() == 'DESC'
+        fields.append(f'-{field}' if descending else field)
+    # The id tiebreaker is cheap to sort once the leading keys come from the index
+    while fields and fields[-1].lstrip('-') == pk:
+        fields.pop()
+    return fields
+
+
+def index_fields(equal, ranges, sort):
+    """
+    Composite index for one statement: equality columns first, then the sort
+    key, or the first range column when the rows are not sorted
+    """
+    fields = list(equal)
+    if sort:
+        fields += [field for field in sort if field.lstrip('-') not in equal]
+    elif ranges:
+        fields.append(ranges[0])
+    return fields
+
+
+def existing_indexes(model):
+    """
+    (columns, orders) of the indexes in the database and in Meta.indexes
+    """
+    found = []
+    with connection.cursor() as cursor:
+        for info in connection.introspection.get_constraints(cursor, model._meta.db_table).values():
+            if info['index'] and info['columns'] and info.get('type') in (None, 'btree', 'idx'):
+                found.append((info['columns'], info.get('orders') or ['ASC'] * len(info['columns'])))
+    for index in model._meta.indexes:
+        if index.fields:
+            found.append(_columns_orders(model, index.fields))
+    return found
+
+
+def _columns_orders(model, fields):
+    columns = [model._meta.get_field(field.lstrip('-')).column for field in fields]
+    orders = ['DESC' if field.startswith('-') else 'ASC' for field in fields]
+    return columns, orders
+
+
+def is_covered(model, fields, indexes, equality=0):
+    """
+    An existing index covers the proposal when the proposed columns are its
+    prefix, in the same or the fully reversed direction (a backward scan).
+    The first ``equality`` columns are compared with = and may come in any order.
+    """
+    columns, orders = _columns_orders(model, fields)
+    reversed_orders = ['ASC' if order == 'DESC' else 'DESC' for order in orders]
+    for existing_columns, existing_orders in indexes:
+        prefix = existing_columns[:len(columns)]
+        if set(prefix[:equality]) != set(columns[:equality]) or prefix[equality:] != columns[equality:]:
+            continue
+        # Directions only matter after the equality columns
+        prefix_orders = [order or 'ASC' for order in existing_orders[equality:len(columns)]]
+        if prefix_orders in (orders[equality:], reversed_orders[equality:]):
+            return True
+    return False
+
+
+def meta_index(fields, name):
+    return f'models.Index(fields={fields!r}, name={name!r})'
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every public route against a seeded database (see seed_dataset), '
+        'EXPLAIN each captured SELECT and flag sequential scans, sorts and large row '
+        'counts. Proposes composite indexes from the filter and sort keys of the '
+        'flagged plans, prints the Meta.indexes entries to add and can write them '
+        'as a migration with --generate-migration.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--row-threshold', type=int, default=1000, help='Flag plan nodes with at least this many rows')
+        parser.add_argument('--detail-samples', type=int, default=3, help='Distinct detail pages to request')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--generate-migration', action='store_true', help='Write a migration adding the proposed indexes')
+        parser.add_argument('--output', default='', help='Write the full JSON report (with plans) to this file')
+
+    def handle(self, *args, **options):
+        explain = EXPLAINERS.get(connection.vendor)
+        if explain is None:
+            raise CommandError(f'EXPLAIN parsing is not implemented for {connection.vendor}')
+        if Article.objects.count() < MIN_SEEDED_ARTICLES:
+            self.stderr.write(
+                f'Fewer than {MIN_SEEDED_ARTICLES} articles: plans on a small table are not '
+                'representative, run manage.py seed_dataset first'
+            )
+
+        statements = self.capture(build_routes(random.Random(options['seed']), options['detail_samples']))
+
+        report = []
+        with connection.cursor() as cursor:
+            for sql, entry in statements.items():
+                result = explain(cursor, sql, entry['params'], options['row_threshold'])
+                report.append({
+                    'sql': sql,
+                    'routes': sorted(entry['routes']),
+                    'execution_ms': result['execution_ms'],
+                    'flags': result['flags'],
+                    'plan': result['plan'],
+                })
+
+        proposals = self.propose(report)
+        summary = {
+            'vendor': connection.vendor,
+            'statements': len(report),
+            'flagged': [
+                {key: item[key] for key in ('sql', 'routes', 'execution_ms', 'flags')}
+                for item in report if item['flags']
+            ],
+            'proposed_indexes': proposals,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(dict(summary, statements=report), fh, indent=2, default=str)
+        self.stdout.write(json.dumps(summary, indent=2, default=str))
+
+        missing = [proposal for proposal in proposals if not proposal['exists']]
+        if options['generate_migration'] and missing:
+            for path in self.write_migrations(missing):
+                self.stdout.write(self.style.SUCCESS(f'Wrote {path}'))
+        if missing:
+            # Without the Meta entry the next makemigrations would emit RemoveIndex
+            self.stdout.write('Add to Meta.indexes:')
+            for proposal in missing:
+                self.stdout.write(f"  {proposal['app_label']}.{proposal['object_name']}: {proposal['meta_index']}")
+
+    def capture(self, routes):
+        """
+        Request each route and collect every distinct SELECT with the routes that ran it
+        """
+        statements = OrderedDict()
+        current = {}
+
+        def wrapper(execute, sql, params, many, context):
+            if not many and sql.lstrip().upper().startswith('SELECT'):
+                entry = statements.setdefault(sql, {'params': params, 'routes': set()})
+                entry['routes'].add(current['route'])
+            return execute(sql, params, many, context)
+
+        client = Client()
+        with connection.execute_wrapper(wrapper):
+            for name, path, headers in routes:
+                current['route'] = name
+                response = client.get(path, headers=headers)
+                if response.streaming:
+                    for _ in response.streaming_content:
+                        pass
+        return statements
+
+    def propose(self, report):
+        """
+        Indexes for the flagged statements, derived from the filter and sort
+        keys of each statement's plan. One proposal per distinct column list.
+        """
+        models_by_table = {model._meta.db_table: model for model in apps.get_models()}
+        by_statement = OrderedDict()
+        for number, item in enumerate(report):
+            for flag in item['flags']:
+                if flag['flag'] in ('seq_scan', 'sort') and flag.get('table') in models_by_table:
+                    entry = by_statement.setdefault((number, flag['table']), {'filter': None, 'sort_key': None})
+                    entry['filter'] = entry['filter'] or flag.get('filter')
+                    entry['sort_key'] = entry['sort_key'] or flag.get('sort_key')
+
+        proposals, seen, indexes = [], set(), {}
+        for (_, table), entry in by_statement.items():
+            model = models_by_table[table]
+            columns = {field.column: field.name for field in model._meta.concrete_fields}
+            equal, ranges = filter_columns(entry['filter'], table, columns)
+            sort = sort_fields(entry['sort_key'], table, columns, model._meta.pk.name)
+            fields = index_fields(equal, ranges, sort)
+            if not fields or (table, tuple(fields)) in seen:
+                continue
+            seen.add((table, tuple(fields)))
+            if table not in indexes:
+                indexes[table] = existing_indexes(model)
+            index = models.Index(fields=fields)
+            index.set_name_with_model(model)
+            proposals.append({
+                'app_label': model._meta.app_label,
+                'model': model._meta.model_name,
+                'object_name': model._meta.object_name,
+                'fields': fields,
+                'name': index.name,
+                'exists': is_covered(model, fields, indexes[table], len(equal)),
+                'meta_index': meta_index(fields, index.name),
+            })
+        return proposals
+
+    def write_migrations(self, proposals):
+        """
+        One migration per app adding the missing indexes, as makemigrations would write it
+        """
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        by_app = OrderedDict()
+        for proposal in proposals:
+            by_app.setdefault(proposal['app_label'], []).append(proposal)
+
+        paths = []
+        for app_label, items in by_app.items():
+            leaves = loader.graph.leaf_nodes(app_label)
+            number = max((int(name.split('_')[0]) for _, name in leaves if name[:4].isdigit()), default=0) + 1
+            migration = migrations.Migration(f'{number:04d}_query_plan_indexes', app_label)
+            migration.dependencies = leaves
+            migration.operations = [
+                migrations.AddIndex(
+                    model_name=item['model'],
+                    index=models.Index(fields=item['fields'], name=item['name']),
+                )
+                for item in items
+            ]
+            writer = MigrationWriter(migration)
+            with open(writer.path, 'w', encoding='utf-8') as fh:
+                fh.write(writer.as_string())
+            paths.append(writer.path)
+        return paths
@@ -0,0 +1,94 @@
+import copy
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.utils import load_backend
+
+from ieeesbui.db import stats
+
+
+def _summary(samples):
+    samples = sorted(samples)
+    return {
+        'mean_ms': round(statistics.mean(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[max(0, int(len(samples) * 0.95) - 1)], 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure per-request database latency with a new connection per request '
+        'against the configured connection mode (persistent, pool or pgbouncer).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per mode')
+        parser.add_argument('--queries', type=int, default=3, help='Queries per simulated request')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        fresh = self._run(self._fresh_request(alias, options['queries']), options['requests'])
+        configured = self._run(self._configured_request(alias, options['queries']), options['requests'])
+        report = {
+            'requests': options['requests'],
+            'queries_per_request': options['queries'],
+            'engine': connections[alias].settings_dict['ENGINE'],
+            'conn_max_age': connections[alias].settings_dict['CONN_MAX_AGE'],
+            'pool': 'pool' in connections[alias].settings_dict.get('OPTIONS', {}),
+            'new_connection_per_request': fresh,
+            'configured': configured,
+            'saved_per_request_ms': round(fresh['latency']['mean_ms'] - configured['latency']['mean_ms'], 3),
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def _fresh_request(self, alias, queries):
+        # Same settings without persistence or pooling: Django's default behaviour
+        settings_dict = copy.deepcopy(connections.settings[alias])
+        settings_dict['CONN_MAX_AGE'] = 0
+        settings_dict.get('OPTIONS', {}).pop('pool', None)
+        backend = load_backend(settings_dict['ENGINE'])
+
+        def request():
+            connection = backend.DatabaseWrapper(settings_dict, alias)
+            try:
+                with connection.cursor() as cursor:
+                    for _ in range(queries):
+                        cursor.execute('SELECT 1')
+            finally:
+                connection.close()
+        return request
+
+    def _configured_request(self, alias, queries):
+        connection = connections[alias]
+
+        def request():
+            # close_old_connections() runs on these signals, as in a real request
+            request_started.send(sender=self.__class__)
+            try:
+                with connection.cursor() as cursor:
+                    for _ in range(queries):
+                        cursor.execute('SELECT 1')
+            finally:
+                request_finished.send(sender=self.__class__)
+        return request
+
+    def _run(self, request, count):
+        before = stats.totals()
+        samples = []
+        for _ in range(count):
+            started = time.perf_counter()
+            request()
+            samples.append((time.perf_counter() - started) * 1000)
+        after = stats.totals()
+        opened = after['opened'] - before['opened']
+        return {
+            'latency': _summary(samples),
+            'connections_opened': opened,
+            'connect_ms_per_request': round((after['connect_time'] - before['connect_time']) * 1000 / count, 3),
+        }
@@ -0,0 +1,158 @@
+import json
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from article.models import Article, Category
+from event.models import Event
+
+AJAX_HEADERS = {'X-Requested-With': 'XMLHttpRequest'}
+
+
+def _percentile(samples, percent):
+    index = max(0, int(round(len(samples) * percent / 100.0)) - 1)
+    return samples[min(index, len(samples) - 1)]
+
+
+def build_routes(rng, detail_samples):
+    """
+    Routes to drive, as (name, path, headers). Paths are reversed from the URL
+    names. Detail pages use a sample of the slugs and ids in the database so
+    caches see realistic key spread.
+    """
+    articles, events = reverse('articles'), reverse('event_list')
+    routes = [
+        ('homepage', reverse('homepage'), {}),
+        ('about', reverse('show_about'), {}),
+        ('articles', articles, {}),
+        ('articles:page', f'{articles}?page=2', {}),
+        ('articles:search', f'{articles}?search=robot', {}),
+        ('articles:sort', f'{articles}?sort=popular', {}),
+        ('articles:ajax', f'{articles}?page=2', AJAX_HEADERS),
+        ('articles:ajax-search', f'{articles}?search=neural+network&sort=relevance', AJAX_HEADERS),
+        ('articles:cursor', f'{articles}?pagination=cursor', AJAX_HEADERS),
+        ('events', events, {}),
+        ('events:page', f'{events}?page=3', {}),
+        ('divisions', reverse('divisions:divisions_page'), {}),
+    ]
+
+    category_ids = list(Category.objects.values_list('id', flat=True)[:20])
+    if category_ids:
+        picked = ','.join(str(pk) for pk in rng.sample(category_ids, min(2, len(category_ids))))
+        routes.append(('articles:filter', f'{articles}?category={picked}', {}))
+        routes.append(('articles:ajax-filter', f'{articles}?category={picked}&sort=recent', AJAX_HEADERS))
+
+    slugs = list(Article.objects.filter(status='published').order_by('?').values_list('slug', flat=True)[:detail_samples])
+    routes += [('article_detail', reverse('article_detail', args=[slug]), {}) for slug in slugs]
+
+    event_ids = list(Event.objects.order_by('?').values_list('id', flat=True)[:detail_samples])
+    routes += [('event_detail', reverse('event_detail', args=[pk]), {}) for pk in event_ids]
+    return routes
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive every public route concurrently and report p50/p95/p99 latency and '
+        'throughput per route as JSON. Runs in-process with the test client, or '
+        'against a running server with --base-url.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Requests per route')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--warmup', type=int, default=1, help='Unmeasured requests per route first')
+        parser.add_argument('--detail-samples', type=int, default=20, help='Distinct detail pages to hit')
+        parser.add_argument('--base-url', default='', help='e.g. http://127.0.0.1:8000 (default: in-process)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default='', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        routes = build_routes(rng, options['detail_samples'])
+        self.base_url = options['base_url'].rstrip('/')
+        self.local = threading.local()
+
+        # Route name -> list of jobs; detail routes share their name
+        jobs = []
+        for _ in range(options['requests']):
+            jobs.extend(routes)
+        rng.shuffle(jobs)
+
+        for route in routes:
+            for _ in range(options['warmup']):
+                self._request(route)
+
+        results = {}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            for name, elapsed, status in executor.map(self._timed, jobs):
+                entry = results.setdefault(name, {'samples': [], 'statuses': Counter()})
+                entry['samples'].append(elapsed)
+                entry['statuses'][status] += 1
+        wall = time.perf_counter() - started
+
+        report = {
+            'target': self.base_url or 'in-process',
+            'concurrency': options['concurrency'],
+            'requests_per_route': options['requests'],
+            'seed': options['seed'],
+            'total_requests': len(jobs),
+            'wall_seconds': round(wall, 3),
+            'throughput_rps': round(len(jobs) / wall, 2) if wall else None,
+            'routes': {name: self._summary(entry, wall) for name, entry in sorted(results.items())},
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                fh.write(output)
+        self.stdout.write(output)
+
+    def _request(self, route):
+        _, path, headers = route
+        if self.base_url:
+            import requests
+
+            session = getattr(self.local, 'session', None)
+            if session is None:
+                session = self.local.session = requests.Session()
+            response = session.get(self.base_url + path, headers=headers)
+            return response.status_code
+
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = Client()
+        response = client.get(path, headers=headers)
+        # Consume streaming bodies so their render time is measured too
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+    def _timed(self, route):
+        started = time.perf_counter()
+        try:
+            status = self._request(route)
+        except Exception as exc:
+            status = type(exc).__name__
+        return route[0], (time.perf_counter() - started) * 1000, status
+
+    def _summary(self, entry, wall):
+        samples = sorted(entry['samples'])
+        errors = sum(count for status, count in entry['statuses'].items() if not isinstance(status, int) or status >= 500)
+        return {
+            'requests': len(samples),
+            'errors': errors,
+            'statuses': {str(status): count for status, count in entry['statuses'].items()},
+            'mean_ms': round(statistics.mean(samples), 3),
+            'p50_ms': round(_percentile(samples, 50), 3),
+            'p95_ms': round(_percentile(samples, 95), 3),
+            'p99_ms': round(_percentile(samples, 99), 3),
+            'throughput_rps': round(len(samples) / wall, 2) if wall else None,
+        }
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from main import images
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate responsive WebP/AVIF/JPEG derivatives for article, event, '
+        'project and leader images and for literal sources used in templates. '
+        'Files are written into the static tree; run collectstatic (and deploy) '
+        'afterwards so they are served. Images added since the last run are '
+        'picked up by running it again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate images that already have derivatives')
+        parser.add_argument('--url', action='append', default=[], help='Extra image source to process (repeatable)')
+        parser.add_argument('--skip-templates', action='store_true', help='Do not scan templates for sources')
+
+    def handle(self, *args, **options):
+        sources = list(images.model_sources())
+        if not options['skip_templates']:
+            sources.extend(images.template_sources())
+        sources.extend(options['url'])
+
+        done = failed = 0
+        for source in dict.fromkeys(sources):
+            try:
+                record = images.generate(source, force=options['force'])
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f'{source}: {exc}')
+                continue
+            done += 1
+            self.stdout.write(f'{source}: {record.width}x{record.height}, {len(record.variants)} variants')
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {done} images, {failed} failed'))
@@ -0,0 +1,146 @@
+import json
+import sys
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from article.models import Article, Category
+from divisions.models import Division
+from event.models import Event
+
+# Record types in dependency order; import_content relies on this order
+RECORD_TYPES = ('category', 'author', 'article', 'event', 'division')
+
+
+def category_records():
+    for category in Category.objects.order_by('id').iterator():
+        yield {'type': 'category', 'slug': category.slug, 'name': category.name, 'description': category.description}
+
+
+def author_records():
+    authors = User.objects.filter(articles__isnull=False).distinct().order_by('id')
+    for user in authors.iterator():
+        yield {
+            'type': 'author',
+            'username': user.username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'email': user.email,
+        }
+
+
+def article_records(chunk_size):
+    articles = (
+        Article.objects.select_related('author')
+        .only(
+            'slug', 'title', 'author__username', 'image', 'excerpt', 'content', 'status',
+            'is_featured', 'view_count', 'created_at',
+        )
+        .prefetch_related(Prefetch('categories', queryset=Category.objects.only('slug')))
+        .order_by('id')
+    )
+    for article in articles.iterator(chunk_size=chunk_size):
+        yield {
+            'type': 'article',
+            'slug': article.slug,
+            'title': article.title,
+            'author': article.author.username,
+            'image': article.image,
+            'excerpt': article.excerpt,
+            'content': article.content,
+            'status': article.status,
+            'is_featured': article.is_featured,
+            'view_count': article.view_count,
+            'created_at': article.created_at,
+            'categories': [category.slug for category in article.categories.all()],
+        }
+
+
+def event_records(chunk_size):
+    events = Event.objects.only('title', 'description', 'image_url', 'date', 'time', 'location').order_by('id')
+    for event in events.iterator(chunk_size=chunk_size):
+        yield {
+            'type': 'event',
+            'title': event.title,
+            'description': event.description,
+            'image_url': event.image_url,
+            'date': event.date,
+            'time': event.time,
+            'location': event.location,
+        }
+
+
+def division_records(chunk_size):
+    divisions = Division.objects.prefetch_related('activities', 'projects', 'leaders').order_by('id')
+    for division in divisions.iterator(chunk_size=chunk_size):
+        yield {
+            'type': 'division',
+            'id_name': division.id_name,
+            'name': division.name,
+            'icon_class': division.icon_class,
+            'color': division.color,
+            'description': division.description,
+            'activities': [{'description': activity.description} for activity in division.activities.all()],
+            'projects': [
+                {'title': project.title, 'description': project.description, 'image': project.image.name or None}
+                for project in division.projects.all()
+            ],
+            'leaders': [
+                {'name': leader.name, 'position': leader.position, 'image': leader.image.name or None}
+                for leader in division.leaders.all()
+            ],
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        'Export categories, authors, articles, events and divisions (with activities, '
+        'projects and leaders) as JSONL, one record per line, streamed in constant '
+        'memory. The output can be loaded with import_content.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-', help='File to write (default: stdout)')
+        parser.add_argument('--types', nargs='+', choices=RECORD_TYPES, default=list(RECORD_TYPES))
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows fetched per query')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        sources = {
+            'category': category_records,
+            'author': author_records,
+            'article': lambda: article_records(chunk_size),
+            'event': lambda: event_records(chunk_size),
+            'division': lambda: division_records(chunk_size),
+        }
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+        out = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8')
+        counts = {}
+        started = time.perf_counter()
+        try:
+            for record_type in RECORD_TYPES:
+                if record_type not in options['types']:
+                    continue
+                counts[record_type] = 0
+                for record in sources[record_type]():
+                    out.write(encoder.encode(record) + '\n')
+                    counts[record_type] += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        # Report on stderr so it never ends up in a JSONL stream written to stdout
+        self.stderr.write(self.style.SUCCESS(
+            'Exported {} records ({}) in {:.2f}s, {:.0f} rows/sec'.format(
+                total,
+                ', '.join(f'{count} {name}' for name, count in counts.items()),
+                elapsed,
+                total / elapsed if elapsed else 0,
+            )
+        ))
@@ -0,0 +1,118 @@
+import json
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from article.models import Article
+from article.views import SITE_FREEZE_ENVIRON
+from event.models import Event
+
+MANIFEST_NAME = '.freeze-manifest.json'
+
+STATIC_PAGES = ('homepage', 'show_about', 'divisions:divisions_page', 'event_list', 'articles')
+
+
+def public_paths():
+    """
+    Every public URL without a query string: the listing landing pages and
+    each published article and event detail page
+    """
+    for name in STATIC_PAGES:
+        yield reverse(name)
+    for slug in Article.objects.filter(status='published').order_by('id').values_list('slug', flat=True).iterator():
+        yield reverse('article_detail', args=[slug])
+    for pk in Event.objects.order_by('id').values_list('id', flat=True).iterator():
+        yield reverse('event_detail', args=[pk])
+
+
+def output_file(path):
+    """
+    '/' -> index.html, '/about' -> about.html, '/event3/' -> event3/index.html
+    """
+    relative = path.strip('/')
+    if not relative:
+        return 'index.html'
+    return f'{relative}/index.html' if path.endswith('/') else f'{relative}.html'
+
+
+class Command(BaseCommand):
+    help = (
+        'Export every public page to static HTML for CDN serving. Pages are only '
+        're-rendered when their ETag changed since the previous export; pages that '
+        'no longer exist are removed. Search, filters, pagination and AJAX requests '
+        '(anything with a query string or X-Requested-With) still need the app. '
+        'Serving the output is not part of this deployment: vercel.json routes every '
+        'request to the app, so upload the directory to a static host or CDN in front of it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(Path(settings.BASE_DIR) / 'frozen'))
+        parser.add_argument('--force', action='store_true', help='Re-render every page')
+        parser.add_argument('--copy-static', action='store_true', help='Copy STATIC_ROOT into <output>/static')
+        parser.add_argument(
+            '--allow-unhashed',
+            action='store_true',
+            help='Export even if collectstatic has not produced a manifest of hashed assets',
+        )
+
+    def handle(self, *args, **options):
+        if not getattr(staticfiles_storage, 'hashed_files', None) and not options['allow_unhashed']:
+            raise CommandError(
+                'No hashed static files manifest found: run collectstatic first '
+                '(or pass --allow-unhashed).'
+            )
+
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        manifest_path = output / MANIFEST_NAME
+        previous = {} if options['force'] or not manifest_path.exists() else json.loads(manifest_path.read_text())
+
+        # Marks the requests as an export, so article detail pages do not count a view
+        client = Client(**{SITE_FREEZE_ENVIRON: True})
+        manifest = {}
+        counts = {'rendered': 0, 'unchanged': 0, 'skipped': 0, 'removed': 0}
+
+        for path in public_paths():
+            entry = previous.get(path)
+            target = output / output_file(path)
+            headers = {}
+            if entry and entry.get('etag') and target.exists():
+                headers['If-None-Match'] = entry['etag']
+
+            response = client.get(path, headers=headers)
+            if response.status_code == 304:
+                manifest[path] = entry
+                counts['unchanged'] += 1
+                continue
+            if response.status_code != 200:
+                self.stderr.write(f'{path}: HTTP {response.status_code}, not exported')
+                counts['skipped'] += 1
+                continue
+
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(body)
+            manifest[path] = {'file': output_file(path), 'etag': response.get('ETag', '')}
+            counts['rendered'] += 1
+
+        for path, entry in previous.items():
+            if path not in manifest:
+                stale = output / entry['file']
+                if stale.exists():
+                    stale.unlink()
+                counts['removed'] += 1
+
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+        if options['copy_static']:
+            shutil.copytree(settings.STATIC_ROOT, output / 'static', dirs_exist_ok=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Frozen site in {}: {rendered} rendered, {unchanged} unchanged, '
+            '{skipped} skipped, {removed} removed'.format(output, **counts)
+        ))
@@ -0,0 +1,281 @@
+import json
+import sys
+import time
+from collections import OrderedDict
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+from django.utils.text import slugify
+
+from article import search, similarity
+from article.models import RENDER_ARTIFACT_FIELDS, Article, Category
+from article.rendering import render_artifacts
+from article.signals import invalidate_article_caches
+from divisions.models import Activity, Division, Leader, Project
+from divisions.views import invalidate_divisions_page
+from event.models import Event
+from main.views import invalidate_homepage
+
+from .export_content import RECORD_TYPES
+
+ARTICLE_FIELDS = ('title', 'author_id', 'image', 'excerpt', 'content', 'status', 'is_featured', 'view_count')
+EVENT_FIELDS = ('description', 'image_url', 'location')
+DIVISION_FIELDS = ('name', 'icon_class', 'color', 'description')
+
+
+class Command(BaseCommand):
+    help = (
+        'Import a JSONL file written by export_content. Records are read one line at a '
+        'time and written with bulk_create/bulk_update per batch. Articles are matched '
+        'by slug, categories by slug, authors by username, divisions by id_name and '
+        'events by (title, date, time), so running the same import twice updates rows '
+        'instead of duplicating them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='JSONL file to read, or - for stdin')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--skip-indexes',
+            action='store_true',
+            help='Do not rebuild the related-articles index afterwards',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.pending = OrderedDict((record_type, OrderedDict()) for record_type in RECORD_TYPES)
+        self.counts = {record_type: {'created': 0, 'updated': 0} for record_type in RECORD_TYPES}
+        self.categories = dict(Category.objects.values_list('slug', 'id'))
+        self.authors = {}
+        self.flushers = {
+            'category': self.flush_categories,
+            'author': self.flush_authors,
+            'article': self.flush_articles,
+            'event': self.flush_events,
+            'division': self.flush_divisions,
+        }
+
+        source = sys.stdin if options['input'] == '-' else open(options['input'], encoding='utf-8')
+        started = time.perf_counter()
+        try:
+            for line_number, line in enumerate(source, 1):
+                if line.strip():
+                    self.add(line_number, line)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        for record_type in RECORD_TYPES:
+            self.flush(record_type)
+        elapsed = time.perf_counter() - started
+
+        if self.counts['article']['created'] or self.counts['article']['updated']:
+            if not options['skip_indexes']:
+                similarity.rebuild()
+            invalidate_article_caches()
+        if self.counts['event']['created'] or self.counts['event']['updated']:
+            invalidate_homepage()
+        if self.counts['division']['created'] or self.counts['division']['updated']:
+            invalidate_divisions_page()
+
+        total = sum(count['created'] + count['updated'] for count in self.counts.values())
+        for record_type, count in self.counts.items():
+            if count['created'] or count['updated']:
+                self.stdout.write(f"{record_type}: {count['created']} created, {count['updated']} updated")
+        self.stdout.write(self.style.SUCCESS(
+            'Imported {} records in {:.2f}s, {:.0f} rows/sec'.format(total, elapsed, total / elapsed if elapsed else 0)
+        ))
+
+    def add(self, line_number, line):
+        try:
+            record = json.loads(line)
+            record_type = record['type']
+            key = self.natural_key(record)
+        except (ValueError, KeyError, TypeError) as exc:
+            raise CommandError(f'Line {line_number}: invalid record ({exc})')
+        if record_type not in self.pending:
+            raise CommandError(f'Line {line_number}: unknown record type "{record_type}"')
+        # A later record with the same key replaces the earlier one
+        self.pending[record_type][key] = record
+        if len(self.pending[record_type]) >= self.batch_size:
+            self.flush(record_type)
+
+    def natural_key(self, record):
+        record_type = record['type']
+        if record_type == 'category':
+            record['slug'] = record.get('slug') or slugify(record['name'])
+            return record['slug']
+        if record_type == 'author':
+            return record['username']
+        if record_type == 'article':
+            record['slug'] = record.get('slug') or slugify(record['title'])
+            return record['slug']
+        if record_type == 'event':
+            return (record['title'], record['date'], record['time'])
+        if record_type == 'division':
+            return record['id_name']
+        return None
+
+    def flush(self, record_type):
+        """
+        Write the pending batch of a type, after the pending batches it may refer to
+        """
+        for earlier in RECORD_TYPES[:RECORD_TYPES.index(record_type)]:
+            if self.pending[earlier]:
+                self.flush(earlier)
+        records = list(self.pending[record_type].values())
+        if not records:
+            return
+        self.pending[record_type].clear()
+        with transaction.atomic():
+            created, updated = self.flushers[record_type](records)
+        self.counts[record_type]['created'] += created
+        self.counts[record_type]['updated'] += updated
+
+    def flush_categories(self, records):
+        existing = {c.slug: c for c in Category.objects.filter(slug__in=[r['slug'] for r in records])}
+        new, changed = [], []
+        for record in records:
+            category = existing.get(record['slug']) or Category(slug=record['slug'])
+            category.name = record['name']
+            category.description = record.get('description', '')
+            (changed if category.pk else new).append(category)
+        Category.objects.bulk_create(new)
+        Category.objects.bulk_update(changed, ['name', 'description'])
+        self.categories.update(Category.objects.filter(slug__in=[r['slug'] for r in records]).values_list('slug', 'id'))
+        return len(new), len(changed)
+
+    def flush_authors(self, records):
+        # Existing accounts are only referenced, never modified
+        usernames = [record['username'] for record in records]
+        existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        new = [
+            User(
+                username=record['username'],
+                first_name=record.get('first_name', ''),
+                last_name=record.get('last_name', ''),
+                email=record.get('email', ''),
+                password=make_password(None),
+            )
+            for record in records
+            if record['username'] not in existing
+        ]
+        User.objects.bulk_create(new)
+        self.authors.update(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        return len(new), 0
+
+    def author_id(self, username):
+        if username not in self.authors:
+            author_id = User.objects.filter(username=username).values_list('id', flat=True).first()
+            if author_id is None:
+                raise CommandError(f'Unknown author "{username}": export authors before their articles')
+            self.authors[username] = author_id
+        return self.authors[username]
+
+    def flush_articles(self, records):
+        slugs = [record['slug'] for record in records]
+        existing = dict(Article.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+        now = timezone.now()
+        new, changed, pairs, created_at = [], [], [], {}
+        for record in records:
+            article = Article(
+                pk=existing.get(record['slug']),
+                slug=record['slug'],
+                title=record['title'],
+                author_id=self.author_id(record['author']),
+                image=record.get('image'),
+                excerpt=record.get('excerpt', ''),
+                content=record.get('content', ''),
+                status=record.get('status', 'draft'),
+                is_featured=record.get('is_featured', False),
+                view_count=record.get('view_count', 0),
+                updated_at=now,
+                # bulk_create/bulk_update skip Article.save(), so the render artifacts are built here
+                **render_artifacts(record.get('content', ''), record.get('excerpt', '')),
+            )
+            (changed if article.pk else new).append(article)
+            pairs.append((article, record))
+            if record.get('created_at'):
+                created_at[article.slug] = parse_datetime(record['created_at'])
+
+        Article.objects.bulk_create(new)
+        if new and new[0].pk is None:
+            # Backends that cannot return ids from a bulk insert
+            ids = dict(Article.objects.filter(slug__in=[a.slug for a in new]).values_list('slug', 'id'))
+            for article in new:
+                article.pk = ids[article.slug]
+        Article.objects.bulk_update(changed, ARTICLE_FIELDS + RENDER_ARTIFACT_FIELDS + ('updated_at',))
+
+        # created_at is auto_now_add, which bulk_create overwrites, so it is restored afterwards
+        dated = [article for article, _ in pairs if article.slug in created_at]
+        for article in dated:
+            article.created_at = created_at[article.slug]
+        Article.objects.bulk_update(dated, ['created_at'])
+
+        # The exported category list replaces the current one
+        through = Article.categories.through
+        through.objects.filter(article_id__in=[article.pk for article in changed]).delete()
+        rows = []
+        for article, record in pairs:
+            for slug in record.get('categories', ()):
+                if slug not in self.categories:
+                    raise CommandError(f'Unknown category "{slug}" in article "{record["slug"]}"')
+                rows.append(through(article_id=article.pk, category_id=self.categories[slug]))
+        through.objects.bulk_create(rows, ignore_conflicts=True)
+
+        articles = [article for article, _ in pairs]
+        search.update_index_for(Article, [a.pk for a in articles])
+        return len(new), len(changed)
+
+    def flush_events(self, records):
+        titles = {record['title'] for record in records}
+        existing = {
+            (event.title, event.date, event.time): event
+            for event in Event.objects.filter(title__in=titles)
+        }
+        now = timezone.now()
+        new, changed = [], []
+        for record in records:
+            day, start = parse_date(record['date']), parse_time(record['time'])
+            event = existing.get((record['title'], day, start)) or Event(title=record['title'], date=day, time=start)
+            for field in EVENT_FIELDS:
+                setattr(event, field, record.get(field, ''))
+            event.updated_at = now
+            (changed if event.pk else new).append(event)
+        Event.objects.bulk_create(new)
+        Event.objects.bulk_update(changed, EVENT_FIELDS + ('updated_at',))
+        return len(new), len(changed)
+
+    def flush_divisions(self, records):
+        existing = {d.id_name: d for d in Division.objects.filter(id_name__in=[r['id_name'] for r in records])}
+        new, changed = [], []
+        for record in records:
+            division = existing.get(record['id_name']) or Division(id_name=record['id_name'])
+            for field in DIVISION_FIELDS:
+                setattr(division, field, record.get(field, ''))
+            (changed if division.pk else new).append(division)
+        Division.objects.bulk_create(new)
+        Division.objects.bulk_update(changed, DIVISION_FIELDS)
+
+        divisions = {d.id_name: d for d in Division.objects.filter(id_name__in=[r['id_name'] for r in records])}
+        # Activities, projects and leaders have no natural key: the exported lists replace them
+        for model in (Activity, Project, Leader):
+            model.objects.filter(division__in=divisions.values()).delete()
+        Activity.objects.bulk_create([
+            Activity(division=divisions[record['id_name']], description=item['description'])
+            for record in records for item in record.get('activities', ())
+        ])
+        Project.objects.bulk_create([
+            Project(division=divisions[record['id_name']], title=item['title'],
+                    description=item.get('description', ''), image=item.get('image'))
+            for record in records for item in record.get('projects', ())
+        ])
+        Leader.objects.bulk_create([
+            Leader(division=divisions[record['id_name']], name=item['name'],
+                   position=item.get('position', ''), image=item.get('image'))
+            for record in records for item in record.get('leaders', ())
+        ])
+        return len(new), len(changed)
@@ -0,0 +1,203 @@
+import random
+from datetime import time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from article import search, similarity
+from article.models import Article, Category
+from article.rendering import render_artifacts
+from divisions.models import Activity, Division, Leader, Project
+from event.models import Event
+
+SEED_PREFIX = 'seed'
+
+WORDS = (
+    'robotics sensor circuit signal power embedded drone vision network antenna '
+    'satellite battery energy grid machine learning neural data cloud edge '
+    'security protocol wireless spectrum quantum photonics semiconductor chip '
+    'workshop competition seminar student branch volunteer mentoring research '
+    'paper conference journal award project prototype hackathon innovation'
+).split()
+
+CATEGORY_NAMES = (
+    'Technology', 'Research', 'Competition', 'Workshop', 'Community', 'Career',
+    'Robotics', 'Power & Energy', 'Signal Processing', 'Computer Society',
+)
+
+DIVISION_COLORS = ('blue', 'green', 'purple', 'orange', 'red', 'teal')
+
+IMAGE_URL = 'https://i.imgur.com/placeholder.jpg'
+
+
+def _sentence(rng, length):
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def _paragraphs(rng, count, length):
+    return ''.join(f'<p>{_sentence(rng, length).capitalize()}.</p>' for _ in range(count))
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic dataset for load testing: articles with categories and authors, '
+        'events spanning several years, and divisions with activities, projects and leaders. '
+        f'Seeded rows are marked with the "{SEED_PREFIX}" prefix and can be removed with --clear.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=10000)
+        parser.add_argument('--events', type=int, default=2000)
+        parser.add_argument('--divisions', type=int, default=6)
+        parser.add_argument('--projects-per-division', type=int, default=8)
+        parser.add_argument('--leaders-per-division', type=int, default=5)
+        parser.add_argument('--authors', type=int, default=25)
+        parser.add_argument('--years', type=int, default=6, help='Span of article and event dates')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--clear', action='store_true', help='Remove previously seeded rows first')
+        parser.add_argument(
+            '--skip-indexes',
+            action='store_true',
+            help='Do not rebuild the search and related-articles indexes afterwards',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        now = timezone.now()
+        span = timedelta(days=365 * options['years'])
+
+        if options['clear']:
+            self.clear()
+
+        with transaction.atomic():
+            authors = self.seed_authors(options['authors'])
+            categories = self.seed_categories()
+            articles = self.seed_articles(rng, options['articles'], authors, categories, now, span)
+            events = self.seed_events(rng, options['events'], now, span)
+            divisions = self.seed_divisions(
+                rng, options['divisions'], options['projects_per_division'], options['leaders_per_division']
+            )
+
+        if not options['skip_indexes'] and articles:
+            # bulk_create bypasses Article.save(), so the indexes are built in one pass
+            search.rebuild_index(Article)
+            similarity.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {articles} articles, {events} events and {divisions} divisions'
+        ))
+
+    def clear(self):
+        with transaction.atomic():
+            Article.objects.filter(slug__startswith=f'{SEED_PREFIX}-').delete()
+            Event.objects.filter(title__startswith=f'[{SEED_PREFIX}]').delete()
+            Division.objects.filter(id_name__startswith=f'{SEED_PREFIX}-').delete()
+            Category.objects.filter(slug__startswith=f'{SEED_PREFIX}-').delete()
+            User.objects.filter(username__startswith=f'{SEED_PREFIX}-').delete()
+
+    def seed_authors(self, count):
+        existing = set(User.objects.filter(username__startswith=f'{SEED_PREFIX}-').values_list('username', flat=True))
+        User.objects.bulk_create([
+            User(username=f'{SEED_PREFIX}-author-{i}', first_name='Author', last_name=str(i))
+            for i in range(count)
+            if f'{SEED_PREFIX}-author-{i}' not in existing
+        ])
+        return list(User.objects.filter(username__startswith=f'{SEED_PREFIX}-author-'))
+
+    def seed_categories(self):
+        for name in CATEGORY_NAMES:
+            slug = f'{SEED_PREFIX}-{name.lower().replace(" & ", "-").replace(" ", "-")}'
+            Category.objects.get_or_create(slug=slug, defaults={'name': name})
+        return list(Category.objects.filter(slug__startswith=f'{SEED_PREFIX}-'))
+
+    def seed_articles(self, rng, count, authors, categories, now, span):
+        if not count:
+            return 0
+        offset = Article.objects.filter(slug__startswith=f'{SEED_PREFIX}-').count()
+        through = Article.categories.through
+        created = 0
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for i in range(start, min(start + self.batch_size, count)):
+                excerpt = _sentence(rng, 25)
+                content = _paragraphs(rng, rng.randint(3, 12), 60)
+                batch.append(Article(
+                    title=_sentence(rng, rng.randint(4, 9)).title(),
+                    slug=f'{SEED_PREFIX}-article-{offset + i}',
+                    author=rng.choice(authors),
+                    image=IMAGE_URL,
+                    excerpt=excerpt,
+                    content=content,
+                    status='published' if rng.random() < 0.9 else 'draft',
+                    is_featured=rng.random() < 0.01,
+                    view_count=int(rng.paretovariate(1.2) * 10),
+                    **render_artifacts(content, excerpt),
+                ))
+            batch = Article.objects.bulk_create(batch)
+
+            # created_at is auto_now_add, so spread the dates with a bulk update
+            for article in batch:
+                article.created_at = now - span * rng.random()
+            Article.objects.bulk_update(batch, ['created_at'])
+
+            through.objects.bulk_create([
+                through(article_id=article.id, category_id=category.id)
+                for article in batch
+                for category in rng.sample(categories, rng.randint(1, 3))
+            ])
+            created += len(batch)
+        return created
+
+    def seed_events(self, rng, count, now, span):
+        today = timezone.localdate(now)
+        events = []
+        for i in range(count):
+            # Mostly past events with a tail of upcoming ones
+            if rng.random() < 0.95:
+                day = today - timedelta(days=int(span.days * rng.random()))
+            else:
+                day = today + timedelta(days=rng.randint(0, 180))
+            events.append(Event(
+                title=f'[{SEED_PREFIX}] {_sentence(rng, 4).title()}',
+                description=_paragraphs(rng, 2, 40),
+                image_url=IMAGE_URL,
+                date=day,
+                time=time(rng.randint(8, 19), rng.choice((0, 30))),
+                location=f'Room {rng.randint(100, 599)}',
+            ))
+        Event.objects.bulk_create(events, batch_size=self.batch_size)
+        return len(events)
+
+    def seed_divisions(self, rng, count, projects_per_division, leaders_per_division):
+        divisions = []
+        for i in range(count):
+            division, _ = Division.objects.get_or_create(
+                id_name=f'{SEED_PREFIX}-division-{i}',
+                defaults={
+                    'name': f'{_sentence(rng, 2).title()} Division',
+                    'icon_class': 'fas fa-microchip',
+                    'color': DIVISION_COLORS[i % len(DIVISION_COLORS)],
+                    'description': _sentence(rng, 30),
+                },
+            )
+            divisions.append(division)
+        Activity.objects.bulk_create([
+            Activity(division=division, description=_sentence(rng, 8))
+            for division in divisions
+            for _ in range(4)
+        ])
+        Project.objects.bulk_create([
+            Project(division=division, title=_sentence(rng, 3).title(), description=_sentence(rng, 40))
+            for division in divisions
+            for _ in range(projects_per_division)
+        ])
+        Leader.objects.bulk_create([
+            Leader(division=division, name=f'Leader {division.pk}-{i}', position=rng.choice(('Head', 'Vice Head', 'Staff')))
+            for division in divisions
+            for i in range(leaders_per_division)
+        ])
+        return len(divisions)
@@ -0,0 +1,97 @@
+import json
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+
+from ieeesbui.storage import STATIC_TAG_RE
+
+TEMPLATE_REF_RE = re.compile(r'{%\s*(?:extends|include)\s+["\']([^"\']+)["\']')
+
+PAGES = {
+    '/': 'homepage.html',
+    '/about': 'about.html',
+    '/article': 'article.html',
+    '/articleDetails/<slug>/': 'articleDetails.html',
+    '/event': 'event_list.html',
+    '/event/<pk>/': 'event_detail.html',
+    '/divisions': 'divisions.html',
+}
+
+
+def _template_static_refs(name, seen=None):
+    """
+    Static references of a template, following {% extends %} and {% include %}
+    """
+    seen = set() if seen is None else seen
+    if name in seen:
+        return set()
+    seen.add(name)
+    try:
+        source = Path(get_template(name).origin.name).read_text(encoding='utf-8')
+    except (TemplateDoesNotExist, OSError):
+        return set()
+    refs = set(STATIC_TAG_RE.findall(source))
+    for child in TEMPLATE_REF_RE.findall(source):
+        refs |= _template_static_refs(child, seen)
+    return refs
+
+
+def _file_sizes(name):
+    try:
+        stored = staticfiles_storage.stored_name(name)
+    except ValueError:
+        stored = name
+    path = Path(settings.STATIC_ROOT) / stored
+    sizes = {'name': stored, 'raw': path.stat().st_size if path.exists() else None}
+    for suffix in ('gz', 'br'):
+        variant = path.with_name(f'{path.name}.{suffix}')
+        sizes[suffix] = variant.stat().st_size if variant.exists() else None
+    return sizes
+
+
+def _wire_bytes(sizes):
+    # What a modern browser downloads: brotli, then gzip, then the raw file
+    for key in ('br', 'gz', 'raw'):
+        if sizes.get(key) is not None:
+            return sizes[key]
+    return 0
+
+
+class Command(BaseCommand):
+    help = 'Report static bytes-over-the-wire per public page after collectstatic'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        report = {'pages': {}, 'static_root': {}}
+        for url, template_name in PAGES.items():
+            files = {ref: _file_sizes(ref) for ref in sorted(_template_static_refs(template_name))}
+            report['pages'][url] = {
+                'template': template_name,
+                'files': files,
+                'raw_bytes': sum(f['raw'] or 0 for f in files.values()),
+                'wire_bytes': sum(_wire_bytes(f) for f in files.values()),
+            }
+
+        root = Path(settings.STATIC_ROOT)
+        all_files = [p for p in root.rglob('*') if p.is_file()] if root.exists() else []
+        report['static_root'] = {
+            'files': len(all_files),
+            'bytes': sum(p.stat().st_size for p in all_files),
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for url, page in report['pages'].items():
+            self.stdout.write(f"{url} ({page['template']}): {page['wire_bytes']} bytes over the wire, {page['raw_bytes']} raw")
+            for ref, sizes in page['files'].items():
+                self.stdout.write(f"    {sizes['name']}: raw={sizes['raw']} gz={sizes['gz']} br={sizes['br']}")
+        self.stdout.write(f"STATIC_ROOT: {report['static_root']['files']} files, {report['static_root']['bytes']} bytes")
@@ -1,3 +1,15 @@
 from django.db import models
 
-# Create your models here.
+
+class ResponsiveImage(models.Model):
+    """
+    Derivatives generated for one source image (see main/images.py)
+    """
+    source = models.CharField(max_length=500, unique=True)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    variants = models.JSONField(default=list, help_text="List of {format, width, url}")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.source
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from article.models import Article
+from event.models import Event
+
+from .views import invalidate_homepage
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_homepage_cache(sender, **kwargs):
+    invalidate_homepage()
@@ -0,0 +1,74 @@
+"""
+Sitemaps for the public pages, articles and events.
+
+Articles and events are split into shards of ``SITEMAP_SHARD_SIZE`` URLs
+(Django paginates a sitemap section with ?p=N and lists every page in
+sitemap.xml), ordered by id so an existing shard only changes when one of
+its own rows does.
+"""
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap
+from django.urls import reverse
+
+from article.models import Article
+from event.models import Event
+
+
+def shard_size():
+    return getattr(settings, 'SITEMAP_SHARD_SIZE', 5000)
+
+
+class StaticPagesSitemap(Sitemap):
+    changefreq = 'weekly'
+
+    def items(self):
+        return ['homepage', 'show_about', 'divisions:divisions_page', 'event_list', 'articles']
+
+    def location(self, item):
+        return reverse(item)
+
+
+class ArticleSitemap(Sitemap):
+    changefreq = 'monthly'
+
+    @property
+    def limit(self):
+        return shard_size()
+
+    def items(self):
+        return Article.objects.filter(status='published').only('slug', 'updated_at').order_by('id')
+
+    def lastmod(self, article):
+        return article.updated_at
+
+
+class EventSitemap(Sitemap):
+    changefreq = 'monthly'
+
+    @property
+    def limit(self):
+        return shard_size()
+
+    def items(self):
+        return Event.objects.only('id', 'updated_at').order_by('id')
+
+    def lastmod(self, event):
+        return event.updated_at
+
+
+SITEMAPS = {
+    'pages': StaticPagesSitemap,
+    'articles': ArticleSitemap,
+    'events': EventSitemap,
+}
+
+
+def shard_queryset(section, page):
+    """
+    Rows listed on one page of a sitemap section, used to version the cached shard
+    """
+    if section not in ('articles', 'events'):
+        return None
+    size = shard_size()
+    start = (page - 1) * size
+    return SITEMAPS[section]().items()[start:start + size]
@@ -0,0 +1,101 @@
+"""
+Cached, versioned sitemap and feed responses.
+
+Each artifact (sitemap index, one sitemap shard, one feed) is versioned by
+max(updated_at) and the row count of the rows it lists. The rendered body is
+cached under that version and served with the version as ETag, so:
+
+- a request for an unchanged artifact costs one aggregate query and, if the
+  client already has it, answers 304;
+- an artifact is only rendered again when one of its own rows changed, e.g.
+  editing an old article re-renders its sitemap shard and not the others.
+"""
+from django.conf import settings
+from django.contrib.sitemaps import views as sitemap_views
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+
+from article.models import Article
+from event.models import Event
+from ieeesbui import conditional
+
+from .feeds import EventsAtomFeed, EventsFeed, LatestArticlesAtomFeed, LatestArticlesFeed
+from .sitemaps import SITEMAPS, shard_queryset
+
+CACHE_PREFIX = 'syndication'
+
+
+def _timeout():
+    return getattr(settings, 'SYNDICATION_CACHE_TIMEOUT', 24 * 60 * 60)
+
+
+def serve_artifact(request, name, querysets, render):
+    """
+    Serve a cached artifact, rendering it only when its version changed
+    Args:
+        name (str): artifact name, part of the cache key and ETag
+        querysets (list[QuerySet]): rows the artifact is built from
+        render (callable): render() -> HttpResponse, called on a cache miss
+    """
+    parts, last_modified = conditional.content_version(*querysets)
+    etag = conditional.make_etag(name, request.get_host(), *parts)
+    response = conditional.not_modified(request, etag, last_modified)
+    if response is None:
+        key = '{}:{}'.format(CACHE_PREFIX, etag.strip('"'))
+        cached = cache.get(key)
+        if cached is None:
+            rendered = render()
+            if hasattr(rendered, 'render'):
+                rendered.render()
+            if rendered.status_code != 200:
+                return rendered
+            cached = {'content': rendered.content, 'content_type': rendered['Content-Type']}
+            cache.set(key, cached, timeout=_timeout())
+        response = HttpResponse(cached['content'], content_type=cached['content_type'])
+    return conditional.add_validators(response, etag, last_modified)
+
+
+def _published_articles():
+    return Article.objects.filter(status='published')
+
+
+def sitemap_index(request):
+    return serve_artifact(
+        request,
+        'sitemap-index',
+        [_published_articles(), Event.objects.all()],
+        lambda: sitemap_views.index(request, SITEMAPS, sitemap_url_name='sitemap_section'),
+    )
+
+
+def sitemap_section(request, section):
+    if section not in SITEMAPS:
+        raise Http404('No sitemap section named %r' % section)
+    try:
+        page = int(request.GET.get('p', 1))
+    except ValueError:
+        raise Http404('Invalid sitemap page')
+    if page < 1:
+        raise Http404('Invalid sitemap page')
+    shard = shard_queryset(section, page)
+    return serve_artifact(
+        request,
+        f'sitemap-{section}-{page}',
+        [shard] if shard is not None else [],
+        lambda: sitemap_views.sitemap(request, SITEMAPS, section=section),
+    )
+
+
+FEEDS = {
+    'articles.rss': (LatestArticlesFeed, _published_articles),
+    'articles.atom': (LatestArticlesAtomFeed, _published_articles),
+    'events.rss': (EventsFeed, Event.objects.all),
+    'events.atom': (EventsAtomFeed, Event.objects.all),
+}
+
+
+def feed(request, name):
+    if name not in FEEDS:
+        raise Http404('No feed named %r' % name)
+    feed_class, rows = FEEDS[name]
+    return serve_artifact(request, f'feed-{name}', [rows()], lambda: feed_class()(request))
@@ -0,0 +1,73 @@
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.html import format_html, format_html_join
+
+from main import images
+
+register = template.Library()
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+def _with_urls(variants):
+    """
+    Static URLs of the derivatives, or None when one is missing from the
+    collected files (generated after the last deploy)
+    """
+    try:
+        return [dict(variant, url=staticfiles_storage.url(variant['path'])) for variant in variants]
+    except ValueError:
+        return None
+
+
+def _srcset(variants, fmt):
+    return ', '.join(f"{v['url']} {v['width']}w" for v in variants if v['format'] == fmt)
+
+
+@register.simple_tag(takes_context=True)
+def responsive_image(context, src, alt='', sizes='100vw', loading='lazy', **attrs):
+    """
+    Render a <picture> with AVIF/WebP sources and a JPEG fallback for ``src``.
+
+    Falls back to a plain lazy-loaded <img> when no derivatives have been
+    generated and deployed yet (run ``manage.py build_image_derivatives``
+    before collectstatic). Extra keyword
+    arguments become attributes of the <img>, e.g. ``class="w-full"``.
+    The derivative data comes from the ``image_derivatives`` context variable
+    (images.lookup_many() for the whole page) when the view provides it.
+    """
+    extra = format_html_join('', ' {}="{}"', sorted(attrs.items()))
+    prefetched = context.get('image_derivatives')
+    if prefetched is not None and src in prefetched:
+        data = prefetched[src]
+    else:
+        data = images.lookup(src) if src else None
+    variants = _with_urls(data['variants']) if data else None
+    if not variants:
+        return format_html(
+            '<img src="{}" alt="{}" loading="{}" decoding="async"{}>',
+            src, alt, loading, extra,
+        )
+
+    sources = format_html_join(
+        '',
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (MIME_TYPES[fmt], _srcset(variants, fmt), sizes)
+            for fmt in ('avif', 'webp')
+            if any(v['format'] == fmt for v in variants)
+        ),
+    )
+    fallback = [v for v in variants if v['format'] == 'jpeg'] or variants
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" loading="{}" decoding="async"{}></picture>',
+        sources,
+        fallback[-1]['url'],
+        _srcset(variants, fallback[-1]['format']),
+        sizes,
+        data['width'],
+        data['height'],
+        alt,
+        loading,
+        extra,
+    )
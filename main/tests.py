@@ -1,3 +1,282 @@
-from django.test import TestCase
+import io
+import json
+import os
+import random
+import tempfile
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from article.models import Article, Category
+from divisions.models import Activity, Division, Leader, Project
+from event.models import Event
+
+from ieeesbui.storage import resolve_css_url, template_static_references
+
+from . import images
+from .management.commands import audit_query_plans as audit
+from .management.commands.benchmark_routes import build_routes
+from .models import ResponsiveImage
+from .views import HOMEPAGE_VERSION_KEY, homepage_cache_timeout
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class StaticManifestTests(SimpleTestCase):
+    """
+    The manifest is strict, so every {% static %} name has to be in the
+    committed staticfiles.json or the page fails to render
+    """
+
+    def test_template_references_are_in_committed_manifest(self):
+        manifest = json.loads((settings.STATIC_ROOT / 'staticfiles.json').read_text(encoding='utf-8'))
+        missing = sorted(template_static_references() - set(manifest['paths']))
+        self.assertEqual(missing, [], 'run manage.py collectstatic and commit staticfiles/')
+
+    def test_css_urls_resolve_against_the_stylesheet(self):
+        self.assertEqual(resolve_css_url('../fonts/a.woff2?v=2#x', 'css/site.css'), 'fonts/a.woff2')
+        self.assertEqual(resolve_css_url(settings.STATIC_URL + 'fonts/a.otf'), 'fonts/a.otf')
+        self.assertIsNone(resolve_css_url('data:font/woff2;base64,AAAA', 'css/site.css'))
+        self.assertIsNone(resolve_css_url('https://example.com/a.woff2', 'css/site.css'))
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class HomepageCacheTests(TestCase):
+    """
+    The cached homepage must not outlive the day: an event stops being
+    upcoming at local midnight without any save that would invalidate it
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for title, day, start in (
+            ('Workshop Hari Ini', date(2026, 3, 10), time(9, 0)),
+            ('Seminar Besok', date(2026, 3, 11), time(13, 0)),
+        ):
+            Event.objects.create(
+                title=title, description='-', image_url='https://example.com/e.jpg',
+                date=day, time=start, location='Depok',
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def at(self, day, hour, minute=0):
+        moment = timezone.make_aware(datetime.combine(day, time(hour, minute)))
+        return mock.patch('django.utils.timezone.now', return_value=moment)
+
+    def test_cache_expires_at_midnight(self):
+        with self.at(date(2026, 3, 10), 23, 0):
+            events = list(Event.objects.filter(date__gte=date(2026, 3, 10)))
+            self.assertEqual(homepage_cache_timeout(timezone.now(), events), 60 * 60 + 1)
+
+    def test_date_rollover_drops_past_events(self):
+        with self.at(date(2026, 3, 10), 23, 0):
+            response = self.client.get(reverse('homepage'))
+        self.assertContains(response, 'Workshop Hari Ini')
+        self.assertContains(response, 'Seminar Besok')
+
+        # Same day: served from the cache without touching the database
+        with self.at(date(2026, 3, 10), 23, 30), self.assertNumQueries(0):
+            response = self.client.get(reverse('homepage'))
+        self.assertContains(response, 'Workshop Hari Ini')
+
+        # After midnight the cache key (and timeout) roll over with the date
+        with self.at(date(2026, 3, 11), 0, 5):
+            response = self.client.get(reverse('homepage'))
+        self.assertNotContains(response, 'Workshop Hari Ini')
+        self.assertContains(response, 'Seminar Besok')
+
+
+class HomepageVersionTests(TestCase):
+    """
+    On the default database cache an invalidated homepage must stay invalid,
+    even after the version key was evicted or expired
+    """
+
+    def test_evicted_version_does_not_bring_back_the_old_page(self):
+        cache.clear()
+        event = Event.objects.create(
+            title='Seminar Lama', description='-', image_url='https://example.com/e.jpg',
+            date=timezone.localdate() + timedelta(days=1), time=time(10, 0), location='Depok',
+        )
+        self.assertContains(self.client.get(reverse('homepage')), 'Seminar Lama')
+        event.title = 'Seminar Baru'
+        event.save()
+        cache.delete(HOMEPAGE_VERSION_KEY)
+        response = self.client.get(reverse('homepage'))
+        self.assertContains(response, 'Seminar Baru')
+        self.assertNotContains(response, 'Seminar Lama')
+
+
+class ResponsiveImageLookupTests(TestCase):
+    """
+    A page of cards reads the derivative data of all its images in one query,
+    on the default database cache and with nothing cached yet
+    """
+    template = Template(
+        '{% load responsive_images %}{% for src in sources %}{% responsive_image src alt="card" %}{% endfor %}'
+    )
+
+    def render(self, count):
+        sources = [f'https://example.com/card-{i}.jpg' for i in range(count)]
+        # Records from before the static tree move have no 'path' and count as not generated
+        ResponsiveImage.objects.bulk_create([
+            ResponsiveImage(source=source, width=800, height=600, variants=[{'format': 'webp', 'width': 400}])
+            for source in sources[::2]
+        ], ignore_conflicts=True)
+        cache.clear()
+        with self.assertNumQueries(1):
+            derivatives = images.lookup_many(sources)
+            html = self.template.render(Context({'sources': sources, 'image_derivatives': derivatives}))
+        self.assertEqual(html.count('<img '), count)
+        self.assertEqual(set(derivatives), set(sources))
+        self.assertFalse(any(derivatives.values()))
+
+    def test_query_count_does_not_grow_with_the_number_of_cards(self):
+        self.render(25)
+        self.render(50)
+
+    @override_settings(CACHES=LOCAL_CACHE)
+    def test_tag_falls_back_to_a_cached_lookup_without_page_data(self):
+        cache.clear()
+        context = {'sources': ['https://example.com/single.jpg']}
+        html = self.template.render(Context(context))
+        self.assertIn('src="https://example.com/single.jpg"', html)
+        with self.assertNumQueries(0):
+            self.template.render(Context(context))
+
+
+@override_settings(CACHES=LOCAL_CACHE, ARTICLE_RELATED_UPDATE_ON_SAVE=False)
+class ContentImportTests(TestCase):
+    """
+    Importing an export again, any number of times, leaves the tables as they were
+    """
+    MODELS = (User, Category, Article, Article.categories.through, Event, Division, Activity, Project, Leader)
+
+    def setUp(self):
+        categories = [Category.objects.create(name=f'Kategori {i}', slug=f'kategori-{i}') for i in range(3)]
+        for i in range(4):
+            author, _ = User.objects.get_or_create(username=f'penulis-{i % 2}')
+            article = Article.objects.create(
+                title=f'Artikel {i}', author=author, excerpt='x', content=f'## Bagian {i}\n\nIsi',
+                status='published' if i % 2 else 'draft', view_count=i,
+            )
+            article.categories.set(categories[:i % 3 + 1])
+        for i in range(3):
+            Event.objects.create(
+                title=f'Acara {i}', description='-', image_url='https://example.com/a.jpg',
+                date=date(2026, 3, 1 + i), time=time(9, 0), location='Depok',
+            )
+        division = Division.objects.create(id_name='tech', name='Tech', icon_class='fa', color='#000', description='-')
+        Activity.objects.create(division=division, description='Kelas')
+        Project.objects.create(division=division, title='Proyek', description='-')
+        Leader.objects.create(division=division, name='Ketua', position='Ketua')
+
+        handle, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def snapshot(self):
+        counts = {model._meta.label: model.objects.count() for model in self.MODELS}
+        pairs = set(Article.categories.through.objects.values_list('article__slug', 'category__slug'))
+        return counts, pairs
+
+    def export(self):
+        call_command('export_content', output=self.path, stderr=io.StringIO())
+        with open(self.path, encoding='utf-8') as exported:
+            return exported.read()
+
+    def test_importing_twice_changes_nothing(self):
+        before = self.snapshot()
+        exported = self.export()
+        for _ in range(2):
+            call_command('import_content', self.path, stdout=io.StringIO())
+            self.assertEqual(self.snapshot(), before)
+        self.assertEqual(self.export(), exported)
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class BenchmarkRoutesTests(TestCase):
+    def test_detail_routes_resolve_to_their_views(self):
+        Article.objects.create(
+            title='Artikel', author=User.objects.create(username='writer'), excerpt='x', content='x', status='published',
+        )
+        Event.objects.create(
+            title='Seminar', description='-', image_url='https://example.com/e.jpg',
+            date=date(2026, 3, 1), time=time(10, 0), location='Depok',
+        )
+        routes = build_routes(random.Random(0), detail_samples=5)
+        details = [(name, path) for name, path, _ in routes if name.endswith('_detail')]
+        self.assertEqual({name for name, _ in details}, {'article_detail', 'event_detail'})
+        for name, path in details:
+            with self.subTest(path=path):
+                self.assertEqual(resolve(path).url_name, name)
+                self.assertEqual(self.client.get(path).status_code, 200)
+
+
+class AuditQueryPlanTests(SimpleTestCase):
+    """
+    Index proposals come from the filter and sort keys of the flagged plans
+    """
+    ARTICLE_COLUMNS = {field.column: field.name for field in Article._meta.concrete_fields}
+    EVENT_COLUMNS = {field.column: field.name for field in Event._meta.concrete_fields}
+
+    def propose(self, table, columns, filter_text, sort_key):
+        equal, ranges = audit.filter_columns(filter_text, table, columns)
+        return audit.index_fields(equal, ranges, audit.sort_fields(sort_key, table, columns, 'id'))
+
+    def test_postgres_filter_and_sort_keys(self):
+        self.assertEqual(
+            self.propose(
+                'article_article', self.ARTICLE_COLUMNS,
+                "(is_featured AND ((status)::text = 'published'::text))",
+                ['article_article.created_at DESC', 'article_article.id DESC'],
+            ),
+            ['status', 'is_featured', '-created_at'],
+        )
+        self.assertEqual(
+            self.propose(
+                'event_event', self.EVENT_COLUMNS,
+                "((date IS NOT NULL) AND (date < '2026-10-17'::date))",
+                ['event_event.date DESC', 'event_event."time" DESC'],
+            ),
+            ['-date', '-time'],
+        )
+        self.assertEqual(
+            self.propose('event_event', self.EVENT_COLUMNS, "(date < '2026-10-17'::date)", None), ['date'],
+        )
+
+    def test_full_text_and_expression_keys_are_skipped(self):
+        self.assertEqual(
+            audit.filter_columns("(search_vector @@ 'robot'::tsquery)", 'article_article', self.ARTICLE_COLUMNS),
+            ([], []),
+        )
+        self.assertIsNone(audit.sort_fields(
+            ["(date_trunc('month'::text, (date)::timestamp with time zone)) DESC"],
+            'event_event', self.EVENT_COLUMNS, 'id',
+        ))
+
+    def test_sql_where_clause_for_sqlite(self):
+        self.assertEqual(
+            audit.filter_columns(
+                '"article_article"."status" = %s AND "article_category"."id" = %s',
+                'article_article', self.ARTICLE_COLUMNS,
+            ),
+            (['status'], []),
+        )
+
+    def test_existing_index_in_another_equality_order_covers(self):
+        indexes = [(['is_featured', 'status', 'created_at'], ['ASC', 'ASC', 'DESC'])]
+        self.assertTrue(audit.is_covered(Article, ['status', 'is_featured', '-created_at'], indexes, 2))
+        # Backward scan of the same index
+        self.assertTrue(audit.is_covered(Article, ['status', 'is_featured', 'created_at'], indexes, 2))
+        self.assertFalse(audit.is_covered(Article, ['status', '-created_at'], indexes, 1))
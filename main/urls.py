@@ -1,7 +1,10 @@
 # Tambahkan di urls.py utama
 from django.urls import path
-from . import views
+from . import syndication, views
 
 urlpatterns = [
     path('', views.homepage, name='homepage'),
+    path('sitemap.xml', syndication.sitemap_index, name='sitemap_index'),
+    path('sitemap-<slug:section>.xml', syndication.sitemap_section, name='sitemap_section'),
+    path('feeds/<str:name>', syndication.feed, name='feed'),
 ]
\ No newline at end of file
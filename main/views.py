@@ -1,14 +1,71 @@
 # Tambahkan di views.py di aplikasi utama
-from django.shortcuts import render
+import hashlib
+import time as clock
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
 from event.models import Event
 from article.models import Article
 from django.utils import timezone
+from ieeesbui import conditional
+
+HOMEPAGE_CACHE_PREFIX = 'main:homepage'
+HOMEPAGE_VERSION_KEY = f'{HOMEPAGE_CACHE_PREFIX}:version'
+
+
+def invalidate_homepage():
+    """
+    Drop every cached homepage by bumping the cache version
+    """
+    # A new time-based value with no expiry: incr() on the database cache is a
+    # get+set that would give the key the default timeout, and a version that
+    # expired and restarted from a constant could hit a stale cached page
+    cache.set(HOMEPAGE_VERSION_KEY, clock.time_ns(), timeout=None)
+
+
+def homepage_cache_timeout(now, events):
+    """
+    Seconds until the cached homepage may show the wrong events: the next
+    local midnight (an event stops being upcoming when the date rolls over)
+    or the start of the next displayed event, whichever comes first.
+    """
+    tomorrow = timezone.localdate(now) + timedelta(days=1)
+    expires = timezone.make_aware(datetime.combine(tomorrow, time.min))
+    for event in events:
+        starts = timezone.make_aware(datetime.combine(event.date, event.time))
+        if now < starts < expires:
+            expires = starts
+    max_timeout = getattr(settings, 'HOMEPAGE_CACHE_MAX_TIMEOUT', 6 * 60 * 60)
+    return max(1, min(int((expires - now).total_seconds()) + 1, max_timeout))
+
 
 def homepage(request):
-    today = timezone.now().date()
-    events = Event.objects.filter(date__gte=today).order_by('date', 'time')[:3]
-    articles = Article.objects.filter(status='published').order_by('-created_at')[:3]
-    return render(request, 'homepage.html', {
-        'events': events,
-        'articles': articles,
-    })
\ No newline at end of file
+    now = timezone.now()
+    today = timezone.localdate(now)
+    version = cache.get_or_set(HOMEPAGE_VERSION_KEY, clock.time_ns, timeout=None)
+    key = f'{HOMEPAGE_CACHE_PREFIX}:{version}:{today.isoformat()}'
+
+    content = cache.get(key)
+    if content is None:
+        events = list(Event.objects.filter(date__gte=today).order_by('date', 'time')[:3])
+        articles = list(Article.objects.filter(status='published').for_cards().order_by('-created_at')[:3])
+        # Served by the (status, -trending_score) index; rollup_trending drops this cache
+        trending_articles = list(
+            Article.objects.filter(status='published', trending_score__gt=0).for_cards().order_by('-trending_score')[:3]
+        )
+        content = render_to_string('homepage.html', {
+            'events': events,
+            'articles': articles,
+            'trending_articles': trending_articles,
+        }, request=request)
+        cache.set(key, content, timeout=homepage_cache_timeout(now, events))
+
+    # The rendered page is already cached, so the ETag is simply its digest
+    etag = conditional.make_etag('homepage', hashlib.md5(content.encode()).hexdigest())
+    response = conditional.not_modified(request, etag)
+    if response is None:
+        response = HttpResponse(content)
+    return conditional.add_validators(response, etag)
@@ -10,6 +10,7 @@ const currentState = {
   category: [],
   page: 1,
   view_all: false,
+  nextCursor: null,
 }
 
 // Initialize when DOM is loaded
@@ -393,35 +394,39 @@ function fetchArticles() {
   // Add AJAX parameter
   params.set("ajax", "true")
 
+  // Filters changed, so any cursor from a previous listing is stale
+  currentState.nextCursor = null
+
   // Fetch articles
   fetch(`${window.location.pathname}?${params.toString()}`, {
     headers: {
       "X-Requested-With": "XMLHttpRequest",
     },
   })
-    .then((response) => response.json())
-    .then((data) => {
-      // Update articles container
-      updateArticlesContainer(data.articles_html)
-
-      // Update active filters
-      updateActiveFilters(data.active_filters_html)
+    .then((response) => {
+      // view_all=true is streamed as NDJSON so cards appear while the archive is sent
+      const contentType = response.headers.get("Content-Type") || ""
+      if (contentType.startsWith("application/x-ndjson")) {
+        return renderArticleStream(response)
+      }
+      return response.json().then((data) => {
+        // Update articles container
+        updateArticlesContainer(data.articles_html)
 
-      // Update pagination
-      updatePagination(data.pagination_html)
+        // Update active filters
+        updateActiveFilters(data.active_filters_html)
 
-      // Update featured article section visibility
-      updateFeaturedArticleVisibility(data.has_search_or_filter)
+        // Update pagination
+        updatePagination(data.pagination_html)
 
-      // Update URL without reloading page
-      updateUrl()
+        // Update the article count next to each category
+        updateCategoryCounts(data.category_counts)
 
-      // Re-initialize animation observer for new content
-      initAnimationObserver()
+        // Update featured article section visibility
+        updateFeaturedArticleVisibility(data.has_search_or_filter)
 
-      // Reattach event listeners to new content
-      window.attachFilterBadgeListeners()
-      window.attachPaginationListeners()
+        finishArticlesUpdate()
+      })
     })
     .catch((error) => {
       console.error("Error fetching articles:", error);
@@ -451,6 +456,106 @@ function fetchArticles() {
     
 }
 
+/**
+ * Common work after the article list has been replaced
+ */
+function finishArticlesUpdate() {
+  // Update URL without reloading page
+  updateUrl()
+
+  // Re-initialize animation observer for new content
+  initAnimationObserver()
+
+  // Reattach event listeners to new content
+  window.attachFilterBadgeListeners()
+  window.attachPaginationListeners()
+}
+
+/**
+ * Read an NDJSON article stream (view_all=true).
+ * Lines are {"type": "meta"}, then one {"type": "articles"} per chunk of
+ * cards, then {"type": "end"}.
+ */
+async function renderArticleStream(response) {
+  const articlesContainer = document.getElementById("articlesContainer")
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ""
+  let firstChunk = true
+
+  const handleLine = (line) => {
+    if (!line.trim()) return
+    const message = JSON.parse(line)
+    if (message.type === "meta") {
+      updateActiveFilters(message.active_filters_html)
+      updatePagination(message.pagination_html)
+      updateFeaturedArticleVisibility(message.has_search_or_filter)
+    } else if (message.type === "articles") {
+      if (firstChunk) {
+        articlesContainer.innerHTML = ""
+        firstChunk = false
+      }
+      articlesContainer.insertAdjacentHTML("beforeend", message.articles_html)
+      initAnimationObserver()
+    }
+  }
+
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    const lines = buffer.split("\n")
+    buffer = lines.pop()
+    lines.forEach(handleLine)
+  }
+  handleLine(buffer + decoder.decode())
+
+  finishArticlesUpdate()
+}
+
+/**
+ * Load articles with keyset (cursor) pagination.
+ * The first call replaces the list, later calls append the next page using
+ * the cursor returned by the server. No total count is requested.
+ * Resolves to true while more articles are available.
+ */
+function loadMoreArticles() {
+  const params = new URLSearchParams()
+
+  if (currentState.search) params.set("search", currentState.search)
+  if (currentState.sort) params.set("sort", currentState.sort)
+  if (currentState.category.length > 0) params.set("category", currentState.category.join(","))
+  params.set("pagination", "cursor")
+  if (currentState.nextCursor) params.set("cursor", currentState.nextCursor)
+  params.set("ajax", "true")
+
+  const isFirstPage = !currentState.nextCursor
+
+  return fetch(`${window.location.pathname}?${params.toString()}`, {
+    headers: {
+      "X-Requested-With": "XMLHttpRequest",
+    },
+  })
+    .then((response) => response.json())
+    .then((data) => {
+      const articlesContainer = document.getElementById("articlesContainer")
+      if (isFirstPage) {
+        articlesContainer.innerHTML = data.articles_html
+        updatePagination("")
+      } else {
+        articlesContainer.insertAdjacentHTML("beforeend", data.articles_html)
+      }
+
+      // Offset mode is used for sorts without cursor support
+      currentState.nextCursor = data.pagination_mode === "cursor" ? data.next_cursor : null
+
+      initAnimationObserver()
+      return Boolean(currentState.nextCursor)
+    })
+}
+
+window.loadMoreArticles = loadMoreArticles
+
 // Modify the updateFeaturedArticleVisibility function to hide the featured article when a search query is active
 function updateFeaturedArticleVisibility(hasSearchOrFilter) {
   const featuredSection = document.getElementById("featuredArticleSection")
@@ -503,6 +608,16 @@ function updatePagination(html) {
   }
 }
 
+/**
+ * Update the number of matching articles shown next to each category
+ */
+function updateCategoryCounts(counts) {
+  if (!counts) return
+  document.querySelectorAll("[data-category-count]").forEach((element) => {
+    element.textContent = `(${counts[element.dataset.categoryCount] || 0})`
+  })
+}
+
 // Update the updateUrl function to include the view_all parameter
 
 